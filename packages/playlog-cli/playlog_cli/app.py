@@ -1,27 +1,23 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+import sys
+from datetime import date, datetime
 from pathlib import Path
 
 import typer
-from playlog import PlaylogConfig, __version__ as core_version
-from playlog.extractors import djay, rekordbox, serato
-from playlog.writers import render_per_night
+from playlog import __version__ as core_version
 
-DEFAULT_OUT_DIR = Path.home() / "Desktop" / "PlayLog Archives"
+from .runner import DEFAULT_OUT_DIR, log_record, plan_run, run_apps, scan_apps
 
-app = typer.Typer(help="PlayLog CLI")
+DATE_FORMATS = ["%Y-%m-%d"]
+
+# rich によるヘルプ整形は読み込みだけで 100 ms 以上かかるので、click 標準の表示にする
+app = typer.Typer(help="PlayLog CLI", rich_markup_mode=None)
 
 
 def _emit(event: str, **details: object) -> None:
-    payload = {
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "component": "cli",
-        "event": event,
-        "details": details,
-    }
-    typer.echo(json.dumps(payload, ensure_ascii=False))
+    typer.echo(json.dumps(log_record(event, details), ensure_ascii=False))
 
 
 @app.command()
@@ -45,7 +41,7 @@ def run(
     formats: str = typer.Option(
         "json,txt,csv",
         "--formats",
-        help="Comma-separated output formats.",
+        help="Comma-separated output formats (json, txt, csv, sqlite, ndjson).",
     ),
     tz: str = typer.Option(
         "UTC",
@@ -67,51 +63,168 @@ def run(
         "--timeline-estimate",
         help="Estimate Serato played_at when timestamps are missing.",
     ),
+    raw_retention: str = typer.Option(
+        "full",
+        "--raw-retention",
+        help="Keep source raw payloads: none, lazy, full.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        min=0,
+        help="Worker processes for parsing source files (0 = all cores).",
+    ),
+    json_style: str = typer.Option(
+        "pretty",
+        "--json-style",
+        help="session.json layout: pretty (indented) or compact (single line).",
+    ),
+    session_gap: int = typer.Option(
+        60,
+        "--session-gap",
+        min=1,
+        help="Split sessions when no track plays for this many minutes.",
+    ),
+    columnar_events: bool = typer.Option(
+        False,
+        "--columnar-events",
+        help="Hold each session's events in a column-oriented batch to save memory.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every source file again instead of using the parse cache.",
+    ),
+    writer_threads: int = typer.Option(
+        2,
+        "--writer-threads",
+        min=0,
+        help="Threads writing output files while extraction continues (0 = main thread).",
+    ),
+    since: datetime | None = typer.Option(
+        None,
+        "--since",
+        formats=DATE_FORMATS,
+        help="Only process nights on or after this date (YYYY-MM-DD).",
+    ),
+    until: datetime | None = typer.Option(
+        None,
+        "--until",
+        formats=DATE_FORMATS,
+        help="Only process nights on or before this date (YYYY-MM-DD).",
+    ),
 ) -> None:
     """Run extraction for the selected apps."""
 
-    format_set = {item.strip() for item in formats.split(",") if item.strip()}
-    requested_apps = [item.strip() for item in apps.split(",") if item.strip()] or [
-        "djay",
-        "rekordbox",
-        "serato",
-    ]
-
-    config_kwargs: dict[str, object] = {
-        "out_dir": out,
-        "timezone": tz,
-        "timeline_estimate": timeline_estimate,
-        "serato_mode": serato_mode,
-        "serato_root": serato_root,
-    }
-    if format_set:
-        config_kwargs["formats"] = format_set
-    config = PlaylogConfig(**config_kwargs)
-
-    extractors = {
-        "djay": lambda: djay.extract(config),
-        "rekordbox": lambda: rekordbox.extract(config),
-        "serato": lambda: serato.extract(config),
-    }
-
-    for app_name in requested_apps:
-        extractor = extractors.get(app_name)
-        if extractor is None:
-            _emit("app-skipped", app=app_name, reason="unsupported")
-            continue
-        _emit("app-start", app=app_name)
-        sessions = extractor()
-        for session, events in sessions:
-            render_per_night(session, events, config, formats=format_set or None)
-            _emit(
-                "session-written",
-                app=app_name,
-                session_id=session.session_id,
-                night_date=session.night_date.isoformat(),
-                formats=sorted(format_set or config.formats),
-                tracks=len(events),
-            )
-    _emit("run-complete", apps=requested_apps)
+    plan = plan_run(
+        {
+            "apps": apps,
+            "out": out,
+            "formats": formats,
+            "tz": tz,
+            "serato_mode": serato_mode,
+            "serato_root": serato_root,
+            "timeline_estimate": timeline_estimate,
+            "raw_retention": raw_retention,
+            "jobs": jobs,
+            "json_style": json_style,
+            "session_gap": session_gap,
+            "columnar_events": columnar_events,
+            "writer_threads": writer_threads,
+            "no_cache": no_cache,
+            "since": _night(since),
+            "until": _night(until),
+        }
+    )
+    run_apps(plan, _emit)
+
+
+@app.command()
+def scan(
+    apps: str = typer.Option(
+        "djay,rekordbox,serato",
+        "--apps",
+        help="Comma-separated list of apps to scan.",
+    ),
+    out: Path = typer.Option(
+        DEFAULT_OUT_DIR,
+        "--out",
+        help="Output directory whose parse cache supplies exact counts.",
+    ),
+    tz: str = typer.Option(
+        "UTC",
+        "--tz",
+        help="IANA timezone name (e.g. Asia/Tokyo).",
+    ),
+    serato_mode: str = typer.Option(
+        "auto",
+        "--serato-mode",
+        help="Serato extraction mode: auto, crate, logs.",
+    ),
+    serato_root: Path | None = typer.Option(
+        None,
+        "--serato-root",
+        help="Override the Serato `_Serato_` directory.",
+    ),
+    timeline_estimate: bool = typer.Option(
+        False,
+        "--timeline-estimate",
+        help="Match the parse cache of runs using --timeline-estimate.",
+    ),
+    raw_retention: str = typer.Option(
+        "full",
+        "--raw-retention",
+        help="Match the parse cache of runs using this --raw-retention.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Estimate every file from its name and headers, ignoring the parse cache.",
+    ),
+    since: datetime | None = typer.Option(
+        None,
+        "--since",
+        formats=DATE_FORMATS,
+        help="Only count nights on or after this date (YYYY-MM-DD).",
+    ),
+    until: datetime | None = typer.Option(
+        None,
+        "--until",
+        formats=DATE_FORMATS,
+        help="Only count nights on or before this date (YYYY-MM-DD).",
+    ),
+) -> None:
+    """List the sources, nights and tracks found for each app without extracting."""
+
+    plan = plan_run(
+        {
+            "apps": apps,
+            "out": out,
+            "tz": tz,
+            "serato_mode": serato_mode,
+            "serato_root": serato_root,
+            "timeline_estimate": timeline_estimate,
+            "raw_retention": raw_retention,
+            "no_cache": no_cache,
+            "since": _night(since),
+            "until": _night(until),
+        }
+    )
+    scan_apps(plan, _emit)
+
+
+@app.command()
+def serve() -> None:
+    """Answer line-delimited JSON-RPC requests on stdin until EOF or shutdown."""
+
+    from .serve import Server
+
+    # for 文での読み込みは先読みするので、1 行ずつ readline で読む
+    Server(sys.stdout).serve(iter(sys.stdin.readline, ""))
+
+
+def _night(value: datetime | None) -> date | None:
+    return None if value is None else value.date()
 
 
 def main() -> None:
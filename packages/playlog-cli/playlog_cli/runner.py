@@ -0,0 +1,189 @@
+"""Archive runs and scans shared by the ``run`` / ``scan`` commands and ``serve``.
+
+Only the standard library is imported at module level; pydantic, the
+extractors and the writers load on the first run (or ``warm_up``) so that
+``version`` and ``--help`` stay fast.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from playlog import PlaylogConfig
+
+T = TypeVar("T")
+
+DEFAULT_OUT_DIR = Path.home() / "Desktop" / "PlayLog Archives"
+DEFAULT_APPS = ("djay", "rekordbox", "serato")
+
+# run のオプション名 → PlaylogConfig のフィールド名
+CONFIG_OPTIONS = {
+    "out": "out_dir",
+    "tz": "timezone",
+    "serato_mode": "serato_mode",
+    "serato_root": "serato_root",
+    "timeline_estimate": "timeline_estimate",
+    "raw_retention": "raw_retention",
+    "jobs": "jobs",
+    "json_style": "json_style",
+    "session_gap": "session_gap_minutes",
+    "columnar_events": "columnar_events",
+    "writer_threads": "writer_threads",
+    "since": "since",
+    "until": "until",
+}
+RUN_OPTIONS = frozenset({*CONFIG_OPTIONS, "apps", "formats", "no_cache"})
+
+Emit = Callable[..., None]
+
+
+class RunPlan(NamedTuple):
+    config: PlaylogConfig
+    apps: list[str]
+    formats: set[str]
+
+
+def log_record(event: str, details: Mapping[str, object]) -> dict[str, object]:
+    """Return the NDJSON log record emitted for ``event``."""
+
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "component": "cli",
+        "event": event,
+        "details": dict(details),
+    }
+
+
+def split_items(value: str | Sequence[str]) -> list[str]:
+    items = value.split(",") if isinstance(value, str) else value
+    return [item.strip() for item in items if item.strip()]
+
+
+def plan_run(options: Mapping[str, object]) -> RunPlan:
+    """Build the config for ``run`` from option values keyed by option name.
+
+    Options left out fall back to the ``PlaylogConfig`` defaults. Unknown
+    names and invalid values raise ``ValueError``.
+    """
+
+    from playlog import PlaylogConfig
+
+    unknown = sorted(set(options) - RUN_OPTIONS)
+    if unknown:
+        msg = f"unknown run options: {', '.join(unknown)}"
+        raise ValueError(msg)
+
+    format_set = set(split_items(_items(options, "formats")))
+    requested_apps = split_items(_items(options, "apps")) or list(DEFAULT_APPS)
+
+    config_kwargs: dict[str, object] = {
+        field: options[name] for name, field in CONFIG_OPTIONS.items() if name in options
+    }
+    config_kwargs.setdefault("out_dir", DEFAULT_OUT_DIR)
+    if "no_cache" in options:
+        config_kwargs["parse_cache"] = not options["no_cache"]
+    if format_set:
+        config_kwargs["formats"] = format_set
+    return RunPlan(PlaylogConfig.model_validate(config_kwargs), requested_apps, format_set)
+
+
+def _items(options: Mapping[str, object], name: str) -> str | Sequence[str]:
+    value = options.get(name, "")
+    if isinstance(value, str) or (
+        isinstance(value, list) and all(isinstance(item, str) for item in value)
+    ):
+        return value
+    msg = f"{name} must be a comma-separated string or a list of strings"
+    raise ValueError(msg)
+
+
+def warm_up() -> None:
+    """Import the extraction pipeline ahead of the first run."""
+
+    from playlog.extractors import djay, rekordbox, serato  # noqa: F401
+    from playlog.output import OutputStage  # noqa: F401
+
+
+def run_apps(plan: RunPlan, emit: Emit, cancel: threading.Event | None = None) -> bool:
+    """Extract and render every requested app, reporting progress to ``emit``.
+
+    Setting ``cancel`` stops pulling sessions from the extractors; sessions
+    already handed to the writers are still written and reported. Returns
+    ``False`` when the run was cancelled.
+    """
+
+    from playlog.extractors import djay, rekordbox, serato
+    from playlog.output import OutputStage
+
+    config = plan.config
+    extractors = {
+        "djay": lambda: djay.iter_sessions(config),
+        "rekordbox": lambda: rekordbox.extract(config),
+        "serato": lambda: serato.iter_sessions(config),
+    }
+    stopped = threading.Event() if cancel is None else cancel
+    formats = sorted(plan.formats or config.formats)
+
+    with OutputStage(config, formats=plan.formats or None) as stage:
+        for app_name in plan.apps:
+            if stopped.is_set():
+                break
+            extractor = extractors.get(app_name)
+            if extractor is None:
+                emit("app-skipped", app=app_name, reason="unsupported")
+                continue
+            emit("app-start", app=app_name)
+            for written in stage.run(_until(stopped, extractor())):
+                session = written.session
+                emit(
+                    "session-written",
+                    app=app_name,
+                    session_id=session.session_id,
+                    night_date=session.night_date.isoformat(),
+                    formats=formats,
+                    tracks=written.tracks,
+                    files={
+                        output.path.name: "written" if output.written else "skipped"
+                        for output in written.files
+                    },
+                )
+
+    if stopped.is_set():
+        emit("run-cancelled", apps=plan.apps)
+        return False
+    emit("run-complete", apps=plan.apps)
+    return True
+
+
+def scan_apps(plan: RunPlan, emit: Emit) -> list[dict[str, object]]:
+    """Report the sources, nights and tracks found for each app without extracting."""
+
+    from playlog.extractors import djay, serato
+
+    config = plan.config
+    scanners = {
+        "djay": lambda: djay.scan(config),
+        "serato": lambda: serato.scan(config),
+    }
+    results = []
+    for app_name in plan.apps:
+        scanner = scanners.get(app_name)
+        if scanner is None:
+            emit("app-skipped", app=app_name, reason="unsupported")
+            continue
+        details = scanner().details()
+        emit("app-scanned", **details)
+        results.append(details)
+    emit("scan-complete", apps=plan.apps)
+    return results
+
+
+def _until(stopped: threading.Event, items: Iterable[T]) -> Iterator[T]:
+    for item in items:
+        yield item
+        if stopped.is_set():
+            return
@@ -0,0 +1,236 @@
+"""Line-delimited JSON-RPC 2.0 over stdio for the desktop GUI.
+
+Spawning the CLI for every action pays interpreter start-up (and the
+PyInstaller unpack) each time. ``playlog serve`` stays alive instead, so
+imports, ``ZoneInfo`` objects and parse cache bookkeeping stay warm between
+requests. Each request and response is one JSON object per line.
+
+Methods:
+
+- ``version``: installed component versions.
+- ``scan``: per-app summaries of the sources found (``playlog scan``),
+  answered right away. Takes the same params as ``run``.
+- ``run``: start an archive run in the background and return its job id.
+  Params are the ``run`` option names (``apps``, ``out``, ``formats``,
+  ``tz``, ``session_gap``, ``no_cache`` ...); omitted options use the
+  defaults. Only one run executes at a time.
+- ``progress``: state and counters of a job (the latest if ``job`` is
+  omitted).
+- ``cancel``: stop a job after the sessions already being written.
+- ``shutdown``: cancel the running job, wait for it and exit.
+
+While a job runs, every ``run`` log record is sent as a ``progress``
+notification whose params are the record plus ``job``.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from typing import TextIO
+
+from playlog import __version__ as core_version
+
+from .runner import RunPlan, log_record, plan_run, run_apps, scan_apps, warm_up
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# -32000 番台はサーバ定義のエラー
+SERVER_BUSY = -32000
+UNKNOWN_JOB = -32001
+
+Params = Mapping[str, object]
+
+
+class RpcError(Exception):
+    """Error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Job:
+    """One background ``run`` and the counters ``progress`` reports."""
+
+    def __init__(self, job_id: int, plan: RunPlan) -> None:
+        self.id = job_id
+        self.plan = plan
+        self.cancel = threading.Event()
+        self.state = "running"
+        self.app: str | None = None
+        self.sessions = 0
+        self.tracks = 0
+        self.error: str | None = None
+        self.thread: threading.Thread | None = None
+
+    def observe(self, event: str, details: Mapping[str, object]) -> None:
+        if event == "app-start":
+            self.app = str(details["app"])
+        elif event == "session-written":
+            self.sessions += 1
+            tracks = details["tracks"]
+            self.tracks += tracks if isinstance(tracks, int) else 0
+        elif event == "run-complete":
+            self.state = "done"
+        elif event == "run-cancelled":
+            self.state = "cancelled"
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "job": self.id,
+            "state": self.state,
+            "apps": self.plan.apps,
+            "app": self.app,
+            "sessions": self.sessions,
+            "tracks": self.tracks,
+            "error": self.error,
+        }
+
+
+class Server:
+    """Read requests from a line iterator and write responses to ``output``.
+
+    Requests are answered on the reading thread; runs execute on a worker
+    thread so ``progress`` and ``cancel`` are answered while they work.
+    Writes to ``output`` are serialized, one message per line.
+    """
+
+    def __init__(self, output: TextIO) -> None:
+        self.output = output
+        self.jobs: dict[int, Job] = {}
+        self._write_lock = threading.Lock()
+        self._closing = False
+        self._methods: dict[str, Callable[[Params], object]] = {
+            "version": self.version,
+            "scan": self.scan,
+            "run": self.run,
+            "progress": self.progress,
+            "cancel": self.cancel,
+            "shutdown": self.shutdown,
+        }
+
+    def serve(self, lines: Iterable[str]) -> None:
+        """Answer requests until EOF or ``shutdown``, then finish the running job."""
+
+        warm_up()
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                response = self.handle(line)
+                if response is not None:
+                    self.send(response)
+                if self._closing:
+                    break
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for job in self.jobs.values():
+            job.cancel.set()
+            if job.thread is not None:
+                job.thread.join()
+
+    def handle(self, line: str) -> dict[str, object] | None:
+        """Return the response to one request line (``None`` for notifications)."""
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _error(None, PARSE_ERROR, "parse error")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "invalid request")
+
+        request_id = request.get("id")
+        params = request.get("params", {})
+        try:
+            method = self._methods.get(request["method"])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"method not found: {request['method']}")
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            result = method(params)
+        except RpcError as exc:
+            response = _error(request_id, exc.code, exc.message)
+        except Exception as exc:
+            response = _error(request_id, INTERNAL_ERROR, str(exc))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+    def send(self, message: Mapping[str, object]) -> None:
+        line = json.dumps(message, ensure_ascii=False)
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def notify(self, method: str, params: Mapping[str, object]) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def version(self, params: Params) -> object:
+        return {"playlog-core": core_version}
+
+    def scan(self, params: Params) -> object:
+        return {"apps": scan_apps(self._plan(params), _discard)}
+
+    def run(self, params: Params) -> object:
+        if any(job.state == "running" for job in self.jobs.values()):
+            raise RpcError(SERVER_BUSY, "a run is already in progress")
+        job = Job(len(self.jobs) + 1, self._plan(params))
+        self.jobs[job.id] = job
+        job.thread = threading.Thread(
+            target=self._work, args=(job,), name=f"playlog-run-{job.id}", daemon=True
+        )
+        job.thread.start()
+        return {"job": job.id}
+
+    def progress(self, params: Params) -> object:
+        return self._job(params).snapshot()
+
+    def cancel(self, params: Params) -> object:
+        job = self._job(params)
+        job.cancel.set()
+        return job.snapshot()
+
+    def shutdown(self, params: Params) -> object:
+        self._closing = True
+        return None
+
+    def _plan(self, params: Params) -> RunPlan:
+        try:
+            return plan_run(params)
+        except ValueError as exc:
+            raise RpcError(INVALID_PARAMS, str(exc)) from exc
+
+    def _job(self, params: Params) -> Job:
+        job_id = params.get("job", len(self.jobs))
+        job = self.jobs.get(job_id) if isinstance(job_id, int) else None
+        if job is None:
+            raise RpcError(UNKNOWN_JOB, f"unknown job: {job_id}")
+        return job
+
+    def _work(self, job: Job) -> None:
+        def emit(event: str, **details: object) -> None:
+            job.observe(event, details)
+            self.notify("progress", {"job": job.id, **log_record(event, details)})
+
+        # 最後の通知を受けたクライアントが progress で同じ状態を見られるよう、状態は通知前に更新する
+        try:
+            run_apps(job.plan, emit, job.cancel)
+        except Exception as exc:
+            job.state = "failed"
+            job.error = str(exc)
+            emit("run-failed", apps=job.plan.apps, error=str(exc))
+
+
+def _discard(event: str, **details: object) -> None:
+    pass
+
+
+def _error(request_id: object, code: int, message: str) -> dict[str, object]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
@@ -10,7 +10,7 @@ FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures" / "serato" / "_Sera
 runner = CliRunner()
 
 
-def test_run_command_generates_serato_outputs(tmp_path: Path) -> None:
+def _run_serato(out: Path, *options: str) -> list[dict[str, object]]:
     result = runner.invoke(
         app,
         [
@@ -22,16 +22,27 @@ def test_run_command_generates_serato_outputs(tmp_path: Path) -> None:
             "--serato-root",
             str(FIXTURES),
             "--out",
-            str(tmp_path),
+            str(out),
             "--formats",
             "json",
             "--tz",
             "UTC",
             "--timeline-estimate",
+            *options,
         ],
     )
     assert result.exit_code == 0, result.stdout
-    assert '"event": "session-written"' in result.stdout
+    return [
+        payload["details"]
+        for payload in map(json.loads, result.stdout.splitlines())
+        if payload["event"] == "session-written"
+    ]
+
+
+def test_run_command_generates_serato_outputs(tmp_path: Path) -> None:
+    written = _run_serato(tmp_path)
+    assert written
+    assert all(details["files"] == {"session.json": "written"} for details in written)
 
     session_path = (
         tmp_path
@@ -44,3 +55,16 @@ def test_run_command_generates_serato_outputs(tmp_path: Path) -> None:
     assert data["session"]["timeline_mode"] == "estimated"
     assert len(data["events"]) == 2
     assert all(event["played_at"] for event in data["events"])
+
+
+def test_run_command_reports_skipped_outputs(tmp_path: Path) -> None:
+    _run_serato(tmp_path)
+    rerun = _run_serato(tmp_path)
+    assert rerun
+    assert all(details["files"] == {"session.json": "skipped"} for details in rerun)
+
+
+def test_run_command_limits_nights_with_since_until(tmp_path: Path) -> None:
+    written = _run_serato(tmp_path, "--since", "2025-05-02", "--until", "2025-05-31")
+    assert [details["night_date"] for details in written] == ["2025-05-05"]
+    assert not (tmp_path / "serato" / "2025-05-01").exists()
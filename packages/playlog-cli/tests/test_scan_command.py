@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from playlog_cli.app import app
+from typer.testing import CliRunner
+
+FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures" / "serato" / "_Serato_"
+runner = CliRunner()
+
+
+def test_scan_command_reports_apps_without_writing_outputs(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "scan",
+            "--apps",
+            "serato,rekordbox",
+            "--serato-root",
+            str(FIXTURES),
+            "--out",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 0, result.stdout
+
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["event"] for record in records] == [
+        "app-scanned",
+        "app-skipped",
+        "scan-complete",
+    ]
+    details = records[0]["details"]
+    assert details["app"] == "serato"
+    assert details["found"] is True
+    assert details["mode"] == "crate"
+    assert (details["files"], details["nights"], details["tracks"]) == (2, 2, 4)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from playlog_cli.runner import plan_run, run_apps
+from playlog_cli.serve import INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, Server
+
+FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures" / "serato" / "_Serato_"
+
+
+def _serato_params(out: Path) -> dict[str, object]:
+    return {
+        "apps": "serato",
+        "serato_mode": "crate",
+        "serato_root": str(FIXTURES),
+        "out": str(out),
+        "formats": ["json"],
+        "timeline_estimate": True,
+    }
+
+
+def _request(server: Server, method: str, **params: object) -> dict[str, object]:
+    line = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+    response = server.handle(line)
+    assert response is not None
+    return response
+
+
+def test_serve_reports_errors() -> None:
+    server = Server(io.StringIO())
+
+    assert server.handle("not json") == {
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {"code": PARSE_ERROR, "message": "parse error"},
+    }
+    assert _request(server, "missing")["error"]["code"] == METHOD_NOT_FOUND  # type: ignore[index]
+    assert _request(server, "run", colour="red")["error"] == {  # type: ignore[index]
+        "code": INVALID_PARAMS,
+        "message": "unknown run options: colour",
+    }
+    # id の無い通知には応答しない
+    assert server.handle('{"jsonrpc": "2.0", "method": "version"}') is None
+
+
+def test_serve_runs_in_background_and_reports_progress(tmp_path: Path) -> None:
+    output = io.StringIO()
+    server = Server(output)
+
+    response = _request(server, "run", **_serato_params(tmp_path))
+    job = server.jobs[response["result"]["job"]]  # type: ignore[index]
+    assert job.thread is not None
+    job.thread.join(timeout=30)
+
+    progress = _request(server, "progress")["result"]
+    assert progress == {
+        "job": 1,
+        "state": "done",
+        "apps": ["serato"],
+        "app": "serato",
+        "sessions": 2,
+        "tracks": 4,
+        "error": None,
+    }
+    notifications = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert {item["method"] for item in notifications} == {"progress"}
+    assert [item["params"]["event"] for item in notifications] == [
+        "app-start",
+        "session-written",
+        "session-written",
+        "run-complete",
+    ]
+    assert (tmp_path / "serato" / "2025-05-01").is_dir()
+
+
+def test_serve_scan_answers_immediately(tmp_path: Path) -> None:
+    output = io.StringIO()
+    server = Server(output)
+
+    response = _request(server, "scan", **_serato_params(tmp_path))
+    [details] = response["result"]["apps"]  # type: ignore[index]
+    assert details["mode"] == "crate"
+    assert (details["files"], details["nights"], details["tracks"]) == (2, 2, 4)
+    assert output.getvalue() == ""
+    assert server.jobs == {}
+
+
+def test_cancel_stops_pulling_sessions(tmp_path: Path) -> None:
+    plan = plan_run({**_serato_params(tmp_path), "writer_threads": 0})
+    cancel = threading.Event()
+    events: list[str] = []
+
+    def emit(event: str, **details: object) -> None:
+        events.append(event)
+        if event == "session-written":
+            cancel.set()
+
+    assert run_apps(plan, emit, cancel) is False
+    assert events == ["app-start", "session-written", "run-cancelled"]
+
+
+def test_serve_command_speaks_json_rpc_over_stdio(tmp_path: Path) -> None:
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "version"},
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+    ]
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "playlog_cli", "serve"],
+        input="".join(json.dumps(request) + "\n" for request in requests),
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert [json.loads(line) for line in result.stdout.splitlines()] == [
+        {"jsonrpc": "2.0", "id": 1, "result": {"playlog-core": "0.1.0"}},
+        {"jsonrpc": "2.0", "id": 2, "result": None},
+    ]
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from playlog_cli.app import app
 from typer.testing import CliRunner
 
@@ -8,3 +11,22 @@ def test_version_command_outputs_core_version() -> None:
     result = runner.invoke(app, ["version"])
     assert result.exit_code == 0
     assert "playlog-core" in result.stdout
+
+
+def test_version_command_does_not_load_pipeline() -> None:
+    # 起動時間を保つため、version では pydantic・抽出器・ライターを読み込まない
+    code = (
+        "import sys\n"
+        "from playlog_cli.app import main\n"
+        "sys.argv = ['playlog', 'version']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(*sorted(name for name in sys.modules if name.startswith(\n"
+        "    ('pydantic', 'playlog.models', 'playlog.extractors.', 'playlog.writers', 'rich'))))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    assert result.stdout.splitlines()[-1] == ""
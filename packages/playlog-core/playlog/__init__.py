@@ -1,27 +1,75 @@
-"""Core utilities for PlayLog extraction pipeline."""
+"""Core utilities for PlayLog extraction pipeline.
+
+Names are resolved on first access so ``import playlog`` (e.g. for
+``__version__``) does not pull in pydantic or the extractors.
+"""
 from __future__ import annotations
 
-from . import extractors
-from .models import (
-    NightSession,
-    PlayEvent,
-    PlaylogConfig,
-    SessionPaths,
-    floor_by_cutoff,
-    get_timezone,
-    sanitize_path_component,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import extractors
+    from .models import (
+        EventBatch,
+        EventLike,
+        EventRow,
+        EventSequence,
+        LazyRaw,
+        NightBucketer,
+        NightSession,
+        PlayEvent,
+        PlaylogConfig,
+        RawMappingView,
+        SessionPaths,
+        TimestampParser,
+        build_events,
+        build_play_events,
+        floor_by_cutoff,
+        floor_by_cutoff_batch,
+        get_timezone,
+        sanitize_path_component,
+    )
 
 __all__ = [
     "__version__",
+    "EventBatch",
+    "EventLike",
+    "EventRow",
+    "EventSequence",
+    "LazyRaw",
+    "NightBucketer",
     "NightSession",
     "PlayEvent",
     "PlaylogConfig",
+    "RawMappingView",
     "SessionPaths",
+    "TimestampParser",
+    "build_events",
+    "build_play_events",
     "floor_by_cutoff",
+    "floor_by_cutoff_batch",
     "get_timezone",
     "sanitize_path_component",
     "extractors",
 ]
 
 __version__ = "0.1.0"
+
+_SUBMODULES = frozenset({"extractors"})
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+    if name in __all__:
+        value = getattr(import_module(".models", __name__), name)
+        # 2 回目以降は通常の属性として引けるようにする
+        globals()[name] = value
+        return value
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,309 @@
+"""Persistent cache of normalized sessions, one entry per source file.
+
+Historical crates, plists and logs never change, so re-parsing them on every
+run is wasted work. Each entry holds the sessions built from one file (before
+gap/cutoff segmentation) as plain JSON rows. The entry name is a digest
+of the file's path, size and ``mtime_ns`` plus the config fields that affect
+parsing, so checking for a hit is a single ``stat``; entries of edited files
+are simply never looked up again and age out through size-based eviction.
+
+Each entry starts with a line holding the ``CacheSummary`` (the night date
+and track count of each session after segmentation) so ``playlog scan`` can
+report a cached file without loading its events.
+
+The cache lives in ``out_dir``, which is often a synced folder, so entries are
+data only: values JSON has no type for (datetimes with their zone, dates,
+bytes, ...) are written as one-key objects such as ``{"$date": "2025-05-02"}``
+and nothing in an entry can run code when it is read.
+"""
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import plistlib
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, NamedTuple, TypeVar, cast
+from zoneinfo import ZoneInfo
+
+from .models import EVENT_FIELDS, NightSession, PlaylogConfig, restore_events
+from .sessions import SessionEvents, segment_nights
+
+T = TypeVar("T")
+
+CACHE_DIRNAME = "cache"
+CACHE_VERSION = 6
+CACHE_SUFFIX = ".json"
+# キャッシュ内容に影響する設定。変わると別のエントリになる
+CACHE_CONFIG_FIELDS = ("timezone", "cutoff", "timeline_estimate", "raw_retention")
+
+CachedSession = tuple[dict[str, object], list[tuple[object, ...]]]
+CacheKey = tuple[Path, str, int, bool]
+# JSONDecodeError / ValidationError は ValueError、未知のタイムゾーンは KeyError
+_LOAD_ERRORS = (KeyError, IndexError, TypeError, ValueError)
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+class CacheSummary(NamedTuple):
+    """Night date and track count of each cached session once segmented."""
+
+    nights: tuple[date, ...]
+    tracks: tuple[int, ...]
+
+
+class ParseCache:
+    """Entries under ``<out_dir>/.playlog/cache`` kept below ``max_bytes``.
+
+    Hits refresh the entry's mtime, so eviction drops the least recently used
+    entries first.
+    """
+
+    def __init__(self, directory: Path, config: PlaylogConfig, max_bytes: int) -> None:
+        self.directory = directory
+        self.config = config
+        self.max_bytes = max_bytes
+        self._used: int | None = None
+        settings = [str(CACHE_VERSION)]
+        settings += [str(getattr(config, name)) for name in CACHE_CONFIG_FIELDS]
+        self._salt = "\0".join(settings)
+
+    @classmethod
+    def for_config(cls, config: PlaylogConfig) -> ParseCache | None:
+        """Return the cache for ``config``, shared by runs in the same process.
+
+        A long-lived process (``playlog serve``) thus counts the cache size
+        once instead of on every run.
+        """
+
+        if not config.parse_cache:
+            return None
+        cache = cls(config.state_dir / CACHE_DIRNAME, config, config.parse_cache_max_mb << 20)
+        key = (cache.directory, cache._salt, cache.max_bytes, config.columnar_events)
+        return _CACHES.setdefault(key, cache)
+
+    def entry_for(self, kind: str, source: Path, stat: os.stat_result | None = None) -> Path:
+        if stat is None:
+            stat = source.stat()
+        key = f"{self._salt}\0{kind}\0{source.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode("utf-8"), usedforsecurity=False).hexdigest()
+        return self.directory / f"{digest}{CACHE_SUFFIX}"
+
+    def load(self, entry: Path) -> list[SessionEvents] | None:
+        try:
+            data = entry.read_bytes()
+            os.utime(entry)
+        except OSError:
+            return None
+        try:
+            # 先頭行の要約は読み飛ばす
+            _, body = data.split(b"\n", 1)
+            cached = cast(list[CachedSession], _loads(body))
+            return [
+                (
+                    NightSession.model_validate(session),
+                    restore_events(events, columnar=self.config.columnar_events),
+                )
+                for session, events in cached
+            ]
+        except _LOAD_ERRORS:
+            # 壊れた・古い形式のエントリは解析し直す
+            return None
+
+    def summary(self, entry: Path) -> CacheSummary | None:
+        """Return the summary at the head of ``entry`` without loading its events."""
+
+        try:
+            with entry.open("rb") as fp:
+                nights, tracks = cast(list[list[Any]], _loads(fp.readline()))
+            summary = CacheSummary(tuple(nights), tuple(int(count) for count in tracks))
+        except (OSError, *_LOAD_ERRORS):
+            return None
+        return summary if len(summary.nights) == len(summary.tracks) else None
+
+    def store(self, entry: Path, sessions: Sequence[SessionEvents]) -> None:
+        cached: list[CachedSession] = [
+            (
+                session.model_dump(),
+                [tuple(getattr(event, name) for name in EVENT_FIELDS) for event in events],
+            )
+            for session, events in sessions
+        ]
+        # run と同じく区切った後の夜を記録する（夜の区切りは session_gap に依らない）
+        segments = [
+            segment
+            for session, events in sessions
+            for segment in segment_nights(session, events, self.config)
+        ]
+        summary = (
+            tuple(night for night, _ in segments),
+            tuple(tracks for _, tracks in segments),
+        )
+        try:
+            data = _dumps(summary) + b"\n" + _dumps(cached)
+        except (TypeError, ValueError):
+            # JSON に書けない値を含むファイルはキャッシュしない
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, entry)
+        if self._used is None:
+            self._used = sum(path.stat().st_size for path in self._entries())
+        else:
+            self._used += len(data)
+        if self._used > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        used = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if used <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            used -= size
+        self._used = used
+
+    def _entries(self) -> Iterator[Path]:
+        # 古い形式 (*.pickle) のエントリも数えて、最近使われていない順に消す
+        if not self.directory.is_dir():
+            return
+        for path in self.directory.iterdir():
+            if path.suffix != ".tmp":
+                yield path
+
+
+def _dumps(value: object) -> bytes:
+    return json.dumps(_to_json(value), separators=(",", ":")).encode("ascii")
+
+
+def _loads(data: bytes) -> object:
+    return json.loads(data, object_hook=_from_json_object)
+
+
+def _to_json(value: object) -> object:
+    """``value`` with every non-JSON type replaced by a one-key tagged object."""
+
+    # 大半を占める文字列・数値は関数を呼ばずにそのまま渡す
+    if isinstance(value, (list, tuple)):
+        return [item if type(item) in _JSON_SCALARS else _to_json(item) for item in value]
+    if isinstance(value, datetime):
+        zone = None if value.tzinfo is None else _zone(value.tzinfo)
+        return {"$datetime": [value.replace(tzinfo=None).isoformat(), zone, value.fold]}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, (dict, Mapping)):
+        # 文字列キーだけで、タグと読み違えない dict はそのまま書く
+        if set(map(type, value)) <= {str} and not (
+            len(value) == 1 and next(iter(value)).startswith("$")
+        ):
+            return {
+                key: item if type(item) in _JSON_SCALARS else _to_json(item)
+                for key, item in value.items()
+            }
+        return {"$dict": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, plistlib.UID):
+        return {"$uid": value.data}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+
+
+@functools.cache
+def _zone(tz: tzinfo) -> str | float:
+    # ZoneInfo は名前で、固定オフセットは秒数で持つ（壁時計の引き算が変わらないように）
+    if isinstance(tz, ZoneInfo) and tz.key is not None:
+        return tz.key
+    if isinstance(tz, timezone):
+        return tz.utcoffset(None).total_seconds()
+    raise TypeError(f"Time zone {tz!r} is not cacheable")
+
+
+def _datetime_from_json(value: list[Any]) -> datetime:
+    wall, zone, fold = value
+    parsed = datetime.fromisoformat(wall)
+    tz: tzinfo | None
+    if zone is None:
+        tz = None
+    elif isinstance(zone, str):
+        tz = ZoneInfo(zone)
+    else:
+        tz = timezone(timedelta(seconds=zone)) if zone else timezone.utc
+    return parsed.replace(tzinfo=tz, fold=fold)
+
+
+_FROM_JSON: dict[str, Callable[[Any], object]] = {
+    "$datetime": _datetime_from_json,
+    "$date": date.fromisoformat,
+    "$bytes": base64.b64decode,
+    "$uid": plistlib.UID,
+    "$dict": dict,
+}
+
+
+def _from_json_object(obj: dict[str, Any]) -> object:
+    if len(obj) == 1:
+        [(tag, value)] = obj.items()
+        decode = _FROM_JSON.get(tag)
+        if decode is not None:
+            return decode(value)
+    return obj
+
+
+_CACHES: dict[CacheKey, ParseCache] = {}
+
+
+def iter_cached_sessions(
+    kind: str,
+    paths: Sequence[Path],
+    parse: Callable[[Sequence[Path]], Iterable[T]],
+    build: Callable[[Path, T], SessionEvents | None],
+    config: PlaylogConfig,
+) -> Iterator[SessionEvents]:
+    """Yield the sessions of ``paths`` in order, parsing only files not cached.
+
+    ``parse`` maps the uncached paths to intermediate payloads (typically via
+    ``ordered_map``) and ``build`` turns one payload into its session.
+    """
+
+    cache = ParseCache.for_config(config)
+    if cache is None:
+        for path, payload in zip(paths, parse(paths), strict=True):
+            session = build(path, payload)
+            if session is not None:
+                yield session
+        return
+
+    entries = [cache.entry_for(kind, path) for path in paths]
+    hits = [entry.exists() for entry in entries]
+    misses = [path for path, hit in zip(paths, hits, strict=True) if not hit]
+    parsed = iter(parse(misses))
+    for path, entry, hit in zip(paths, entries, hits, strict=True):
+        if hit:
+            cached = cache.load(entry)
+            if cached is not None:
+                yield from cached
+                continue
+            # 読めなかったエントリはこの場で解析し直す
+            [payload] = parse([path])
+        else:
+            payload = next(parsed)
+        session = build(path, payload)
+        sessions = [session] if session is not None else []
+        cache.store(entry, sessions)
+        yield from sessions
@@ -0,0 +1,164 @@
+"""Byte-offset checkpoints for incrementally ingested append-only logs."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+
+CHECKPOINT_VERSION = 2
+# 末尾検証に使うバイト数。同じ inode のまま書き換えられたファイルを検出する
+DIGEST_WINDOW = 64
+
+LogRow = tuple[str, str]
+
+
+@dataclass(slots=True)
+class LogCheckpoint:
+    """Resume point for a log file plus the rows already parsed from it.
+
+    ``rows`` holds ``(played_at, line)`` for every complete line up to
+    ``offset`` so a resumed run can rebuild the whole session while only
+    parsing the newly appended tail. ``rows_size`` is the length of the
+    stored rows file that holds ``rows``; the next save appends after it.
+    """
+
+    inode: int
+    size: int
+    offset: int
+    tail_digest: str
+    timezone: str
+    current_date: date
+    last_played_at: datetime | None
+    rows: list[LogRow] = field(default_factory=list)
+    rows_size: int = 0
+
+    def to_json(self) -> dict[str, object]:
+        """Header stored next to the rows file (the rows themselves are left out)."""
+
+        return {
+            "version": CHECKPOINT_VERSION,
+            "inode": self.inode,
+            "size": self.size,
+            "offset": self.offset,
+            "tail_digest": self.tail_digest,
+            "timezone": self.timezone,
+            "current_date": self.current_date.isoformat(),
+            "last_played_at": (
+                self.last_played_at.isoformat() if self.last_played_at else None
+            ),
+            "rows": len(self.rows),
+            "rows_size": self.rows_size,
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, object], rows: list[LogRow]) -> LogCheckpoint | None:
+        if payload.get("version") != CHECKPOINT_VERSION:
+            return None
+        try:
+            last_played_at = payload["last_played_at"]
+            if payload["rows"] != len(rows):
+                return None
+            return cls(
+                inode=int(str(payload["inode"])),
+                size=int(str(payload["size"])),
+                offset=int(str(payload["offset"])),
+                tail_digest=str(payload["tail_digest"]),
+                timezone=str(payload["timezone"]),
+                current_date=date.fromisoformat(str(payload["current_date"])),
+                last_played_at=(
+                    datetime.fromisoformat(str(last_played_at)) if last_played_at else None
+                ),
+                rows=rows,
+                rows_size=int(str(payload["rows_size"])),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def is_resumable(self, path: Path, stat: os.stat_result, timezone: str) -> bool:
+        """Return True when ``path`` only grew since this checkpoint was taken."""
+
+        if self.timezone != timezone or not self.rows:
+            return False
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            return False
+        return tail_digest(path, self.offset) == self.tail_digest
+
+
+def tail_digest(path: Path, offset: int) -> str:
+    """Digest of the bytes just before ``offset``."""
+
+    start = max(offset - DIGEST_WINDOW, 0)
+    with path.open("rb") as fp:
+        fp.seek(start)
+        window = fp.read(offset - start)
+    return hashlib.sha1(window, usedforsecurity=False).hexdigest()
+
+
+class CheckpointStore:
+    """Checkpoints stored one per source under ``directory``.
+
+    Each source has a small JSON header and an NDJSON rows file. Saving a
+    checkpoint resumed from an earlier one appends only the new rows; the
+    header, replaced last, records how much of the rows file is valid.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _paths_for(self, source: Path) -> tuple[Path, Path]:
+        key = hashlib.sha1(str(source.resolve()).encode("utf-8"), usedforsecurity=False)
+        stem = self.directory / key.hexdigest()
+        return stem.with_suffix(".json"), stem.with_suffix(".rows")
+
+    def load(self, source: Path) -> LogCheckpoint | None:
+        header_path, rows_path = self._paths_for(source)
+        try:
+            payload = json.loads(header_path.read_text(encoding="utf-8"))
+            if not isinstance(payload, dict):
+                return None
+            rows_size = int(payload["rows_size"])
+            with rows_path.open("rb") as fp:
+                data = fp.read(rows_size)
+            if len(data) != rows_size:
+                return None
+            rows = [_decode_row(line) for line in data.splitlines()]
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+        return LogCheckpoint.from_json(payload, rows)
+
+    def save(
+        self,
+        source: Path,
+        checkpoint: LogCheckpoint,
+        previous: LogCheckpoint | None = None,
+    ) -> None:
+        """Store ``checkpoint``; pass the checkpoint it resumed from to append to it."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        header_path, rows_path = self._paths_for(source)
+        if previous is None:
+            # 書き直す間に古いヘッダが新しい行ファイルを指さないよう先に消す
+            header_path.unlink(missing_ok=True)
+            kept, mode = 0, "wb"
+        else:
+            kept, mode = len(previous.rows), "r+b"
+        with rows_path.open(mode) as fp:
+            fp.seek(0 if previous is None else previous.rows_size)
+            fp.truncate()
+            fp.writelines(_encode_row(row) for row in checkpoint.rows[kept:])
+            checkpoint.rows_size = fp.tell()
+        tmp_path = header_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(checkpoint.to_json()), encoding="utf-8")
+        os.replace(tmp_path, header_path)
+
+
+def _encode_row(row: LogRow) -> bytes:
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _decode_row(line: bytes) -> LogRow:
+    played_at, text = json.loads(line)
+    return str(played_at), str(text)
@@ -0,0 +1,216 @@
+"""Source discovery shared by the extractors and ``playlog scan``.
+
+Listing uses ``os.scandir`` so each directory is read once and file sizes
+and mtimes come from the directory entries. ``NightWindow`` drops files
+whose name or mtime rules out the ``--since``/``--until`` nights before they
+are opened. Per-file scan estimates prefer the parse cache summary, then
+fall back to the date in the file name (or its mtime) and a cheap
+header-level track count; no ``PlayEvent`` is built.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from .cache import ParseCache
+from .models import PlaylogConfig, floor_by_cutoff, get_timezone
+from .sessions import SessionEvents
+
+# ファイル名の日付はセッション開始日なので、前後 1 日の夜を含み得るとみなす
+NAME_DATE_SLACK = timedelta(days=1)
+
+
+@dataclass(frozen=True, slots=True)
+class SourceFile:
+    """One discovered source file; ``kind`` matches its parse cache kind."""
+
+    kind: str
+    path: Path
+    stat: os.stat_result
+
+
+@dataclass(frozen=True, slots=True)
+class SourceEstimate:
+    source: SourceFile
+    nights: tuple[date, ...]
+    tracks: int | None
+    cached: bool
+
+
+@dataclass(slots=True)
+class AppScan:
+    """Discovery result for one app."""
+
+    app: str
+    root: Path | None
+    mode: str | None = None
+    sources: list[SourceEstimate] = field(default_factory=list)
+
+    @property
+    def nights(self) -> list[date]:
+        return sorted({night for estimate in self.sources for night in estimate.nights})
+
+    def details(self) -> dict[str, object]:
+        """Summary reported by ``playlog scan``."""
+
+        nights = self.nights
+        return {
+            "app": self.app,
+            "found": self.root is not None,
+            "root": None if self.root is None else str(self.root),
+            "mode": self.mode,
+            "files": len(self.sources),
+            "cached": sum(estimate.cached for estimate in self.sources),
+            "nights": len(nights),
+            "first_night": nights[0].isoformat() if nights else None,
+            "last_night": nights[-1].isoformat() if nights else None,
+            "tracks": sum(estimate.tracks or 0 for estimate in self.sources),
+            "uncounted": sum(estimate.tracks is None for estimate in self.sources),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class NightWindow:
+    """Inclusive night-date range of ``PlaylogConfig.since``/``until``."""
+
+    since: date | None
+    until: date | None
+    tz: ZoneInfo
+    cutoff: time
+
+    @classmethod
+    def for_config(cls, config: PlaylogConfig) -> NightWindow | None:
+        if config.since is None and config.until is None:
+            return None
+        return cls(config.since, config.until, get_timezone(config.timezone), config.cutoff)
+
+    def __contains__(self, night: date) -> bool:
+        if self.since is not None and night < self.since:
+            return False
+        return self.until is None or night <= self.until
+
+    def may_contain(self, source: SourceFile, name_date: date | None) -> bool:
+        """Return whether ``source`` can hold a session of a night in the window.
+
+        A file is last written after its last play, so its nights never come
+        after the night of its mtime; a date in its name bounds them to
+        ``NAME_DATE_SLACK`` around it. Files that pass still need their
+        sessions filtered with ``filter_sessions``.
+        """
+
+        modified = datetime.fromtimestamp(source.stat.st_mtime, self.tz)
+        latest = floor_by_cutoff(modified, self.cutoff, self.tz)
+        earliest = None
+        if name_date is not None:
+            latest = min(latest, name_date + NAME_DATE_SLACK)
+            earliest = name_date - NAME_DATE_SLACK
+        if self.since is not None and latest < self.since:
+            return False
+        return self.until is None or earliest is None or earliest <= self.until
+
+    def select(
+        self,
+        sources: Iterable[SourceFile],
+        name_date: Callable[[Path], date | None],
+    ) -> list[SourceFile]:
+        return [source for source in sources if self.may_contain(source, name_date(source.path))]
+
+
+def date_in_name(name: str, *patterns: re.Pattern[str]) -> date | None:
+    """Return the first ``(year, month, day)`` match of ``patterns`` in ``name``."""
+
+    for pattern in patterns:
+        match = pattern.search(name)
+        if match is None:
+            continue
+        year, month, day = (int(part) for part in match.groups())
+        try:
+            return date(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
+def filter_sessions(
+    sessions: Iterable[SessionEvents],
+    window: NightWindow | None,
+) -> Iterator[SessionEvents]:
+    """Yield the (already segmented) sessions whose night is in ``window``."""
+
+    if window is None:
+        yield from sessions
+        return
+    for session, events in sessions:
+        if session.night_date in window:
+            yield session, events
+
+
+def list_sources(kind: str, directory: Path, suffixes: Iterable[str]) -> list[SourceFile]:
+    """Return the regular files in ``directory`` ending in ``suffixes``.
+
+    Files are grouped by suffix and sorted by name within each group, as
+    ``sorted(directory.glob("*<suffix>"))`` per suffix would, including
+    dotfiles.
+    """
+
+    try:
+        with os.scandir(directory) as entries:
+            files = [entry for entry in entries if entry.is_file()]
+    except OSError:
+        return []
+    found: list[SourceFile] = []
+    for suffix in suffixes:
+        matching = sorted(
+            (entry for entry in files if entry.name.endswith(suffix)),
+            key=lambda entry: entry.name,
+        )
+        found.extend(SourceFile(kind, Path(entry.path), entry.stat()) for entry in matching)
+    return found
+
+
+def estimate_sources(
+    sources: Iterable[SourceFile],
+    config: PlaylogConfig,
+    tz: ZoneInfo,
+    anchor: Callable[[Path, ZoneInfo], datetime],
+    count_tracks: Callable[[Path], int] | None = None,
+) -> list[SourceEstimate]:
+    """Estimate the nights and track count of each source without parsing it.
+
+    ``anchor`` is the extractor's fallback session time for a file (from its
+    name or mtime). ``count_tracks`` counts tracks from file headers; files
+    it cannot count, or apps without one, report ``tracks=None``. Nights
+    outside ``since``/``until`` and their tracks are left out, so a file
+    with no night in the window reports ``tracks=0``.
+    """
+
+    cache = ParseCache.for_config(config)
+    window = NightWindow.for_config(config)
+    estimates = []
+    for source in sources:
+        counts: list[tuple[date, int | None]]
+        summary = None
+        if cache is not None:
+            summary = cache.summary(cache.entry_for(source.kind, source.path, source.stat))
+        if summary is not None:
+            counts = list(zip(summary.nights, summary.tracks, strict=True))
+        else:
+            tracks = None
+            if count_tracks is not None:
+                try:
+                    tracks = count_tracks(source.path)
+                except (OSError, ValueError):
+                    tracks = None
+            counts = [(floor_by_cutoff(anchor(source.path, tz), config.cutoff, tz), tracks)]
+        if window is not None:
+            counts = [(night, tracks) for night, tracks in counts if night in window]
+        nights = tuple(night for night, _ in counts)
+        known = [tracks for _, tracks in counts if tracks is not None]
+        total = sum(known) if len(known) == len(counts) else None
+        estimates.append(SourceEstimate(source, nights, total, summary is not None))
+    return estimates
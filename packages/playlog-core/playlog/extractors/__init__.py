@@ -1,6 +1,17 @@
-"""Extractor modules for PlayLog."""
+"""Extractor modules for PlayLog (imported on first access)."""
 from __future__ import annotations
 
-from . import djay, rekordbox, serato
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from . import djay, rekordbox, serato
 
 __all__ = ["djay", "rekordbox", "serato"]
+
+
+def __getattr__(name: str) -> object:
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
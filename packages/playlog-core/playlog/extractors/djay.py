@@ -1,22 +1,40 @@
 """Extractor for Algoriddim djay Set history (.plist) files."""
 from __future__ import annotations
 
-import plistlib
 import re
 import sys
-from collections.abc import Iterable, Iterator, Sequence
+from collections.abc import Collection, Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from functools import partial
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+from ..cache import iter_cached_sessions
+from ..discovery import (
+    AppScan,
+    NightWindow,
+    SourceFile,
+    date_in_name,
+    estimate_sources,
+    filter_sessions,
+    list_sources,
+)
 from ..models import (
+    EventSequence,
+    LazyRaw,
     NightSession,
-    PlayEvent,
     PlaylogConfig,
+    RawMappingView,
+    RawRetention,
+    TimestampParser,
+    build_events,
     floor_by_cutoff,
     get_timezone,
 )
+from ..parallel import ordered_map
+from ..plists import PlistDict, read_matching_dicts
+from ..sessions import segment_sessions
 
 DEFAULT_MAC_SETS = Path.home() / "Music" / "djay" / "History" / "Sets"
 DEFAULT_WIN_SETS = Path.home() / "Music" / "djay" / "History" / "Sets"
@@ -60,8 +78,8 @@ DATETIME_FORMATS = [
 ]
 
 
-PlistDict = dict[str, object]
-TRACK_HINT_KEYS = set(
+TITLE_KEY_SET = frozenset(TITLE_KEYS)
+TRACK_HINT_KEYS = frozenset(
     ARTIST_KEYS
     + START_KEYS
     + END_KEYS
@@ -87,7 +105,74 @@ class EventPayload:
     source_path: str | None
     source_track_id: str | None
     played_at: datetime | None
-    raw: PlistDict
+    raw: PlistDict | LazyRaw | None
+
+
+@dataclass(slots=True)
+class SetPayload:
+    """Session-level fields and track payloads parsed from one .plist file."""
+
+    session_id: str
+    session_label: str
+    app_version: str | None
+    session_start: datetime | None
+    session_end: datetime | None
+    events: list[EventPayload]
+
+
+@dataclass(frozen=True, slots=True)
+class TrackShape:
+    """Probe keys actually present in one track-dict key layout, in probe order."""
+
+    title: tuple[str, ...]
+    artist: tuple[str, ...]
+    album: tuple[str, ...]
+    start: tuple[str, ...]
+    duration: tuple[str, ...]
+    deck: tuple[str, ...]
+    bpm: tuple[str, ...]
+    key: tuple[str, ...]
+    source_path: tuple[str, ...]
+    track_id: tuple[str, ...]
+
+    @classmethod
+    def from_keys(cls, keys: Collection[str]) -> TrackShape:
+        def present(probe: list[str]) -> tuple[str, ...]:
+            return tuple(key for key in probe if key in keys)
+
+        return cls(
+            title=present(TITLE_KEYS),
+            artist=present(ARTIST_KEYS),
+            album=present(ALBUM_KEYS),
+            start=present(START_KEYS),
+            duration=present(DURATION_KEYS),
+            deck=present(DECK_KEYS),
+            bpm=present(BPM_KEYS),
+            key=present(KEY_KEYS),
+            source_path=present(SOURCE_PATH_KEYS),
+            track_id=present(TRACK_ID_KEYS),
+        )
+
+
+class TrackShapeResolver:
+    """Per-file cache of track key layouts and the timestamp format in use.
+
+    Tracks from one Set nearly always share a layout, so the key probing in
+    ``TrackShape.from_keys`` runs once per distinct layout instead of per track.
+    """
+
+    __slots__ = ("_shapes", "timestamps")
+
+    def __init__(self) -> None:
+        self._shapes: dict[tuple[str, ...], TrackShape] = {}
+        self.timestamps = TimestampParser(DATETIME_FORMATS)
+
+    def shape_for(self, track: PlistDict) -> TrackShape:
+        layout = tuple(track)
+        shape = self._shapes.get(layout)
+        if shape is None:
+            shape = self._shapes[layout] = TrackShape.from_keys(track.keys())
+        return shape
 
 
 def default_roots() -> list[Path]:
@@ -101,56 +186,129 @@ def default_roots() -> list[Path]:
     return [DEFAULT_MAC_SETS]
 
 
-def discover_plists(roots: Sequence[Path] | None = None) -> list[Path]:
-    """Discover djay Set .plist files from known roots."""
+def discover_plists(
+    roots: Sequence[Path] | None = None,
+    window: NightWindow | None = None,
+) -> list[Path]:
+    """Discover djay Set .plist files from known roots.
+
+    With ``window``, Sets whose name or mtime rules out every night in it
+    are left out.
+    """
+
+    return [source.path for source in discover_sources(roots, window)]
+
+
+def discover_sources(
+    roots: Sequence[Path] | None = None,
+    window: NightWindow | None = None,
+) -> list[SourceFile]:
+    """``discover_plists`` with the ``stat`` of each file from ``os.scandir``."""
 
     candidates = list(roots) if roots is not None else default_roots()
-    found: list[Path] = []
+    found: dict[Path, SourceFile] = {}
     for root in candidates:
         if not root:
             continue
         expanded = root.expanduser()
-        if not expanded.exists():
-            continue
-        if expanded.is_file() and expanded.suffix == ".plist":
-            found.append(expanded)
+        if expanded.suffix == ".plist" and expanded.is_file():
+            found.setdefault(expanded, SourceFile("djay", expanded, expanded.stat()))
             continue
-        found.extend(sorted(expanded.glob("*.plist")))
-    return sorted({path for path in found})
+        for source in list_sources("djay", expanded, [".plist"]):
+            found.setdefault(source.path, source)
+    sources = [found[path] for path in sorted(found)]
+    return sources if window is None else window.select(sources, _date_in_name)
+
+
+def scan(config: PlaylogConfig, roots: Sequence[Path] | None = None) -> AppScan:
+    """Count Set files and estimate their nights without parsing them.
+
+    Track counts are only known for files in the parse cache.
+    """
+
+    candidates = list(roots) if roots is not None else default_roots()
+    root = next((path.expanduser() for path in candidates if path.expanduser().exists()), None)
+    if root is None:
+        return AppScan("djay", None)
+    tz = get_timezone(config.timezone)
+    sources = discover_sources(candidates, NightWindow.for_config(config))
+    return AppScan("djay", root, None, estimate_sources(sources, config, tz, _fallback_datetime))
 
 
 def extract(
     config: PlaylogConfig,
     roots: Sequence[Path] | None = None,
-) -> list[tuple[NightSession, list[PlayEvent]]]:
+) -> list[tuple[NightSession, EventSequence]]:
     """Extract sessions from all discovered .plist files."""
 
-    sessions: list[tuple[NightSession, list[PlayEvent]]] = []
-    for plist_path in discover_plists(roots):
-        session, events = load_session(plist_path, config)
-        sessions.append((session, events))
-    return sessions
+    return list(iter_sessions(config, roots))
+
+
+def iter_sessions(
+    config: PlaylogConfig,
+    roots: Sequence[Path] | None = None,
+) -> Iterator[tuple[NightSession, EventSequence]]:
+    """Lazily yield sessions from discovered .plist files, split on gaps/cutoffs."""
+
+    window = NightWindow.for_config(config)
+    plist_paths = discover_plists(roots, window)
+    tz = get_timezone(config.timezone)
+    # ワーカーは SetPayload だけを返し、PlayEvent の構築は親プロセスで行う
+    parse = partial(_parse_set, tz=tz, raw_retention=config.raw_retention)
+    sessions = iter_cached_sessions(
+        "djay",
+        plist_paths,
+        lambda paths: ordered_map(parse, paths, config.jobs),
+        partial(_build_session, config=config, tz=tz),
+        config,
+    )
+    yield from filter_sessions(segment_sessions(sessions, config), window)
 
 
 def load_session(
     plist_path: Path,
     config: PlaylogConfig,
-) -> tuple[NightSession, list[PlayEvent]]:
+) -> tuple[NightSession, EventSequence]:
     """Load a single djay .plist file and normalize it."""
 
-    plist_data = _read_plist(plist_path)
     tz = get_timezone(config.timezone)
+    return _build_session(plist_path, _parse_set(plist_path, tz, config.raw_retention), config, tz)
 
-    session_id = _derive_session_id(plist_data, plist_path)
-    session_label = _derive_session_label(plist_data, plist_path)
-    app_version = _get_first_str(plist_data, APP_VERSION_KEYS)
 
-    track_dicts = list(_iter_track_dicts(plist_data))
-    event_payloads = [_build_event_payload(track, tz) for track in track_dicts]
+def _parse_set(
+    plist_path: Path,
+    tz: ZoneInfo,
+    raw_retention: RawRetention = "full",
+) -> SetPayload:
+    # トラックらしいキーを持つ dict とルートのスカラー値だけを実体化する
+    plist_data, tracks = read_matching_dicts(plist_path.expanduser(), _looks_like_track)
+    resolver = TrackShapeResolver()
+    return SetPayload(
+        session_id=_derive_session_id(plist_data, plist_path),
+        session_label=_derive_session_label(plist_data, plist_path),
+        app_version=_get_first_str(plist_data, APP_VERSION_KEYS),
+        session_start=_first_datetime(plist_data, SESSION_START_KEYS, tz),
+        session_end=_first_datetime(plist_data, SESSION_END_KEYS, tz),
+        events=[
+            _build_event_payload(track, tz, raw_retention, resolver)
+            for track in tracks
+        ],
+    )
 
-    session_start = _first_datetime(plist_data, SESSION_START_KEYS, tz)
-    session_end = _first_datetime(plist_data, SESSION_END_KEYS, tz)
-    played_times = [payload.played_at for payload in event_payloads if payload.played_at]
+
+def _build_session(
+    plist_path: Path,
+    payload: SetPayload,
+    config: PlaylogConfig,
+    tz: ZoneInfo,
+) -> tuple[NightSession, EventSequence]:
+    session_id = payload.session_id
+    app_version = payload.app_version
+    event_payloads = payload.events
+
+    session_start = payload.session_start
+    session_end = payload.session_end
+    played_times = [event.played_at for event in event_payloads if event.played_at]
 
     if session_start is None and played_times:
         session_start = min(played_times)
@@ -165,33 +323,37 @@ def load_session(
     night_date = floor_by_cutoff(anchor, cutoff=config.cutoff, tz=tz)
     session_date = (session_start or anchor).date()
 
-    events = [
-        PlayEvent(
-            app="djay",
-            app_version=app_version,
-            session_id=session_id,
-            session_date=session_date,
-            night_date=night_date,
-            played_at=payload.played_at,
-            title=payload.title,
-            artist=payload.artist,
-            album=payload.album,
-            duration_sec=payload.duration_sec,
-            deck=payload.deck,
-            bpm=payload.bpm,
-            key=payload.key,
-            source_path=payload.source_path,
-            source_track_id=payload.source_track_id,
-            raw=payload.raw,
-        )
-        for payload in event_payloads
-    ]
+    events = build_events(
+        (
+            {
+                "app": "djay",
+                "app_version": app_version,
+                "session_id": session_id,
+                "session_date": session_date,
+                "night_date": night_date,
+                "played_at": event.played_at,
+                "title": event.title,
+                "artist": event.artist,
+                "album": event.album,
+                "duration_sec": event.duration_sec,
+                "deck": event.deck,
+                "bpm": event.bpm,
+                "key": event.key,
+                "source_path": event.source_path,
+                "source_track_id": event.source_track_id,
+                "raw": event.raw,
+            }
+            for event in event_payloads
+        ),
+        trusted=True,
+        columnar=config.columnar_events,
+    )
 
     session = NightSession(
         app="djay",
         session_id=session_id,
         night_date=night_date,
-        session_label=session_label,
+        session_label=payload.session_label,
         app_version=app_version,
         session_start=session_start,
         session_end=session_end,
@@ -200,55 +362,46 @@ def load_session(
     return session, events
 
 
-def _read_plist(path: Path) -> PlistDict:
-    with path.expanduser().open("rb") as fp:
-        data: object = plistlib.load(fp)
-        if not isinstance(data, dict):
-            msg = f"djay plist {path} did not contain a top-level dict"
-            raise ValueError(msg)
-        return data
-
-
-def _iter_track_dicts(node: object) -> Iterator[PlistDict]:
-    if isinstance(node, list):
-        for item in node:
-            yield from _iter_track_dicts(item)
-        return
-    if isinstance(node, dict):
-        if _looks_like_track(node):
-            yield node
-            return
-        for key, value in node.items():
-            if key in TRACK_LIST_KEYS:
-                yield from _iter_track_dicts(value)
-            elif isinstance(value, (list, dict)):
-                yield from _iter_track_dicts(value)
-
+def _looks_like_track(keys: Collection[str]) -> bool:
+    return not TITLE_KEY_SET.isdisjoint(keys) and not TRACK_HINT_KEYS.isdisjoint(keys)
 
-def _looks_like_track(node: PlistDict) -> bool:
-    title_present = any(key in node for key in TITLE_KEYS)
-    hint_present = any(key in node for key in TRACK_HINT_KEYS)
-    return title_present and hint_present
 
-
-def _build_event_payload(track: PlistDict, tz: ZoneInfo) -> EventPayload:
-    played_at = _first_datetime(track, START_KEYS, tz)
+def _build_event_payload(
+    track: PlistDict,
+    tz: ZoneInfo,
+    raw_retention: RawRetention = "full",
+    resolver: TrackShapeResolver | None = None,
+) -> EventPayload:
+    if resolver is None:
+        shape = TrackShape.from_keys(track.keys())
+        timestamps = None
+    else:
+        shape = resolver.shape_for(track)
+        timestamps = resolver.timestamps
 
     return EventPayload(
-        title=_get_first_str(track, TITLE_KEYS) or "Unknown Title",
-        artist=_get_first_str(track, ARTIST_KEYS) or "",
-        album=_get_first_str(track, ALBUM_KEYS) or "",
-        duration_sec=_coerce_int(_get_first_value(track, DURATION_KEYS)),
-        deck=_get_first_str(track, DECK_KEYS),
-        bpm=_coerce_float(_get_first_value(track, BPM_KEYS)),
-        key=_get_first_str(track, KEY_KEYS),
-        source_path=_get_first_str(track, SOURCE_PATH_KEYS),
-        source_track_id=_to_str(_get_first_value(track, TRACK_ID_KEYS)),
-        played_at=played_at,
-        raw=dict(track),
+        title=_get_first_str(track, shape.title) or "Unknown Title",
+        artist=_get_first_str(track, shape.artist) or "",
+        album=_get_first_str(track, shape.album) or "",
+        duration_sec=_coerce_int(_get_first_value(track, shape.duration)),
+        deck=_get_first_str(track, shape.deck),
+        bpm=_coerce_float(_get_first_value(track, shape.bpm)),
+        key=_get_first_str(track, shape.key),
+        source_path=_get_first_str(track, shape.source_path),
+        source_track_id=_to_str(_get_first_value(track, shape.track_id)),
+        played_at=_first_datetime(track, shape.start, tz, timestamps),
+        raw=_retain_raw(track, raw_retention),
     )
 
 
+def _retain_raw(track: PlistDict, raw_retention: RawRetention) -> PlistDict | LazyRaw | None:
+    if raw_retention == "full":
+        return dict(track)
+    if raw_retention == "lazy":
+        return RawMappingView(track)
+    return None
+
+
 def _derive_session_id(plist_data: PlistDict, plist_path: Path) -> str:
     return _get_first_str(plist_data, SESSION_ID_KEYS) or plist_path.stem
 
@@ -261,17 +414,22 @@ def _first_datetime(
     container: PlistDict,
     keys: Iterable[str],
     tz: ZoneInfo,
+    timestamps: TimestampParser | None = None,
 ) -> datetime | None:
     for key in keys:
         if key not in container:
             continue
-        dt_value = _coerce_datetime(container[key], tz)
+        dt_value = _coerce_datetime(container[key], tz, timestamps)
         if dt_value:
             return dt_value
     return None
 
 
-def _coerce_datetime(value: object, tz: ZoneInfo) -> datetime | None:
+def _coerce_datetime(
+    value: object,
+    tz: ZoneInfo,
+    timestamps: TimestampParser | None = None,
+) -> datetime | None:
     if value is None:
         return None
     if isinstance(value, datetime):
@@ -285,12 +443,7 @@ def _coerce_datetime(value: object, tz: ZoneInfo) -> datetime | None:
             normalized = value.replace("Z", "+00:00")
             return datetime.fromisoformat(normalized)
         except ValueError:
-            for fmt in DATETIME_FORMATS:
-                try:
-                    naive = datetime.strptime(value, fmt)
-                    return naive.replace(tzinfo=tz)
-                except ValueError:
-                    continue
+            return (timestamps or TimestampParser(DATETIME_FORMATS)).parse(value, tz)
     return None
 
 
@@ -360,6 +513,10 @@ def _fallback_datetime(plist_path: Path, tz: ZoneInfo) -> datetime:
         return datetime.now(tz)
 
 
+def _date_in_name(path: Path) -> date | None:
+    return date_in_name(path.stem, DATE_DASH_PATTERN, DATE_NUMERIC_PATTERN)
+
+
 def _parse_date_hint(name: str, tz: ZoneInfo) -> datetime | None:
     match = DATE_DASH_PATTERN.search(name)
     if match:
@@ -1,23 +1,47 @@
 """Extractor for Serato DJ crate/history + logs data."""
 from __future__ import annotations
 
+import codecs
 import logging
+import os
 import re
 import sys
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Sequence
 from zoneinfo import ZoneInfo
 
+from ..cache import iter_cached_sessions
+from ..checkpoints import CheckpointStore, LogCheckpoint, LogRow, tail_digest
+from ..discovery import (
+    AppScan,
+    NightWindow,
+    SourceFile,
+    date_in_name,
+    estimate_sources,
+    filter_sessions,
+    list_sources,
+)
+from ..linescan import iter_candidate_lines, iter_lines_containing, mapped_file
 from ..models import (
+    EventSequence,
+    LazyRaw,
     NightSession,
-    PlayEvent,
     PlaylogConfig,
+    RawRetention,
+    TimestampParser,
+    build_events,
     floor_by_cutoff,
+    floor_by_cutoff_batch,
     get_timezone,
+    played_at_range,
     sanitize_path_component,
 )
+from ..parallel import ordered_map
+from ..sessions import segment_sessions
+from ..tlv import ChunkReader, tag_code
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,8 +52,57 @@ MODE_AUTO = "auto"
 MODE_CRATE = "crate"
 MODE_LOGS = "logs"
 
+LOG_CHECKPOINT_DIR = "serato-logs"
+
 DATE_IN_NAME = re.compile(r"(20\d{2})[-_](0[1-9]|1[0-2])[-_](0[1-9]|[12]\d|3[01])")
 LOG_SESSION_START = re.compile(r"Session Start @ (?P<dt>.+)")
+OTRK = tag_code("otrk")
+VRSN = tag_code("vrsn")
+TYPED_TAGS = frozenset(
+    {"ttxt", "aART", "albm", "deck", "bpmf", "dura", "key", "path", "pidx", "pdat"},
+)
+
+CODEC_UTF8 = "utf-8"
+CODEC_UTF16_BE = "utf-16-be"
+CODEC_UTF16_LE = "utf-16-le"
+# 数値/日時タグは ASCII 文字列なので失敗しない latin-1 で一発デコードする
+CODEC_ASCII = "latin-1"
+_UTF16_BE_DECODE = codecs.utf_16_be_decode
+_UTF16_LE_DECODE = codecs.utf_16_le_decode
+
+# タグごとのコーデック表。Serato のテキストタグは UTF-16-BE が標準だが、
+# UTF-8 で書かれた crate もあるため実際のコーデックは crate ごとに _crate_codec で決める
+TAG_CODECS: dict[str, str] = {
+    "ttxt": CODEC_UTF16_BE,
+    "tsng": CODEC_UTF16_BE,
+    "aART": CODEC_UTF16_BE,
+    "tart": CODEC_UTF16_BE,
+    "albm": CODEC_UTF16_BE,
+    "talb": CODEC_UTF16_BE,
+    "deck": CODEC_UTF16_BE,
+    "tkey": CODEC_UTF16_BE,
+    "path": CODEC_UTF16_BE,
+    "pfil": CODEC_UTF16_BE,
+    "pidx": CODEC_UTF16_BE,
+    "bpmf": CODEC_ASCII,
+    "tbpm": CODEC_ASCII,
+    "dura": CODEC_ASCII,
+    "tlen": CODEC_ASCII,
+    "pdat": CODEC_ASCII,
+}
+# crate のテキストコーデックごとに、テキストタグの項目を置き換えた表
+CRATE_TAG_CODECS: dict[str, dict[str, str]] = {
+    text_codec: {
+        tag: CODEC_ASCII if codec == CODEC_ASCII else text_codec
+        for tag, codec in TAG_CODECS.items()
+    }
+    for text_codec in (CODEC_UTF8, CODEC_UTF16_BE, CODEC_UTF16_LE)
+}
+CRATE_DATETIME_FORMATS = ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S")
+LOG_START_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S")
+# LOG_LINE の前段フィルタ。bytes のまま C で走査し、候補行だけを decode する
+LOG_LINE_PREFILTER = re.compile(rb"\d\d:\d\d:\d\d\s+(?:Deck|DECK)\s")
+LOG_SESSION_MARKER = b"Session Start @"
 LOG_LINE = re.compile(
     r"(?P<time>\d{2}:\d{2}:\d{2})\s+"
     r"(?P<deck>Deck\s+\w+|DECK\s+\w+)\s+"
@@ -37,6 +110,9 @@ LOG_LINE = re.compile(
 )
 
 
+Buffer = bytes | memoryview
+
+
 class SeratoExtractorError(RuntimeError):
     """Raised when Serato extraction cannot proceed."""
 
@@ -55,7 +131,7 @@ class TrackPayload:
     source_path: str | None
     source_track_id: str | None
     played_at: datetime | None
-    raw: dict[str, str] | None
+    raw: dict[str, str] | LazyRaw | None
 
 
 def extract(
@@ -63,9 +139,20 @@ def extract(
     *,
     root: Path | None = None,
     mode: str | None = None,
-) -> list[tuple[NightSession, list[PlayEvent]]]:
+) -> list[tuple[NightSession, EventSequence]]:
     """Extract Serato sessions from crate or log sources."""
 
+    return list(iter_sessions(config, root=root, mode=mode))
+
+
+def iter_sessions(
+    config: PlaylogConfig,
+    *,
+    root: Path | None = None,
+    mode: str | None = None,
+) -> Iterator[tuple[NightSession, EventSequence]]:
+    """Lazily yield Serato sessions, holding at most one crate/log in memory."""
+
     selected_mode = (mode or config.serato_mode or MODE_AUTO).lower()
     if selected_mode not in {MODE_AUTO, MODE_CRATE, MODE_LOGS}:
         msg = f"serato extractor mode must be one of {MODE_AUTO}/{MODE_CRATE}/{MODE_LOGS}"
@@ -74,33 +161,113 @@ def extract(
     root_path = _resolve_root(root or config.serato_root)
     if root_path is None:
         LOGGER.info("serato-root-not-found", extra={"component": "serato"})
-        return []
+        return iter(())
+
+    sessions = segment_sessions(_iter_selected_sessions(root_path, config, selected_mode), config)
+    return filter_sessions(sessions, NightWindow.for_config(config))
 
+
+def _iter_selected_sessions(
+    root_path: Path,
+    config: PlaylogConfig,
+    selected_mode: str,
+) -> Iterator[tuple[NightSession, EventSequence]]:
     tz = get_timezone(config.timezone)
 
     if selected_mode in {MODE_AUTO, MODE_CRATE}:
+        crate_count = 0
         try:
-            crate_sessions = _extract_from_crates(root_path, config, tz)
-            if crate_sessions or selected_mode == MODE_CRATE:
-                LOGGER.info(
-                    "serato-mode-selected",
-                    extra={"component": "serato", "mode": "crate", "sessions": len(crate_sessions)},
-                )
-                return crate_sessions
+            for session in _iter_crate_sessions(root_path, config, tz):
+                crate_count += 1
+                yield session
         except SeratoExtractorError as exc:
-            if selected_mode == MODE_CRATE:
+            # 既に yield 済みのセッションは取り消せないので logs へは切り替えない
+            if selected_mode == MODE_CRATE or crate_count:
                 raise
             LOGGER.error("serato-crate-failed", exc_info=exc, extra={"component": "serato"})
+        else:
+            # 期間外の crate を飛ばしただけなら logs には切り替えない
+            crates = _history_sources(root_path)
+            skipped = len(_within_window(crates, config)) < len(crates)
+            if crate_count or selected_mode == MODE_CRATE or skipped:
+                LOGGER.info(
+                    "serato-mode-selected",
+                    extra={"component": "serato", "mode": "crate", "sessions": crate_count},
+                )
+                return
 
     if selected_mode in {MODE_AUTO, MODE_LOGS}:
-        log_sessions = _extract_from_logs(root_path, config, tz)
+        log_count = 0
+        for session in _iter_log_sessions(root_path, config, tz):
+            log_count += 1
+            yield session
         LOGGER.info(
             "serato-mode-selected",
-            extra={"component": "serato", "mode": "logs", "sessions": len(log_sessions)},
+            extra={"component": "serato", "mode": "logs", "sessions": log_count},
         )
-        return log_sessions
 
-    return []
+
+def scan(
+    config: PlaylogConfig,
+    *,
+    root: Path | None = None,
+    mode: str | None = None,
+) -> AppScan:
+    """Count crates (or logs) and estimate nights/tracks without parsing them.
+
+    Crate tracks are counted from the top-level ``otrk`` chunk headers and
+    log tracks from the byte-level line prefilter. ``auto`` reports crates
+    when the History directory has any, as extraction would use them first.
+    """
+
+    selected_mode = (mode or config.serato_mode or MODE_AUTO).lower()
+    root_path = _resolve_root(root or config.serato_root)
+    if root_path is None:
+        return AppScan("serato", None)
+
+    tz = get_timezone(config.timezone)
+    if selected_mode in {MODE_AUTO, MODE_CRATE}:
+        crates = _history_sources(root_path)
+        if crates or selected_mode == MODE_CRATE:
+            estimates = estimate_sources(
+                _within_window(crates, config),
+                config,
+                tz,
+                _anchor_from_filename,
+                _count_crate_tracks,
+            )
+            return AppScan("serato", root_path, MODE_CRATE, estimates)
+
+    logs = _within_window(_log_sources(root_path), config)
+    estimates = estimate_sources(logs, config, tz, _anchor_from_filename, _count_log_tracks)
+    return AppScan("serato", root_path, MODE_LOGS, estimates)
+
+
+def _history_sources(root: Path) -> list[SourceFile]:
+    return list_sources("serato-crate", root / "History", [".crate"])
+
+
+def _log_sources(root: Path) -> list[SourceFile]:
+    return list_sources("serato-log", root / "Logs", [".log", ".txt"])
+
+
+def _within_window(sources: list[SourceFile], config: PlaylogConfig) -> list[SourceFile]:
+    window = NightWindow.for_config(config)
+    return sources if window is None else window.select(sources, _date_in_name)
+
+
+def _date_in_name(path: Path) -> date | None:
+    return date_in_name(path.stem, DATE_IN_NAME)
+
+
+def _count_crate_tracks(crate_path: Path) -> int:
+    with ChunkReader.open(crate_path) as reader:
+        return sum(code == OTRK for code, _, _ in reader.iter_chunks())
+
+
+def _count_log_tracks(log_path: Path) -> int:
+    with mapped_file(log_path) as buffer:
+        return sum(1 for _ in iter_candidate_lines(buffer, LOG_LINE_PREFILTER))
 
 
 def default_roots() -> list[Path]:
@@ -126,70 +293,130 @@ def _resolve_root(candidate: Path | None) -> Path | None:
     return None
 
 
-def _extract_from_crates(
+def _iter_crate_sessions(
     root: Path,
     config: PlaylogConfig,
     tz: ZoneInfo,
-) -> list[tuple[NightSession, list[PlayEvent]]]:
+) -> Iterator[tuple[NightSession, EventSequence]]:
     history_dir = root / "History"
     if not history_dir.exists():
         if config.serato_mode == MODE_CRATE:
             msg = "Serato History directory not found"
             raise SeratoExtractorError(msg)
-        return []
+        return
 
-    sessions: list[tuple[NightSession, list[PlayEvent]]] = []
-    for crate_path in sorted(history_dir.glob("*.crate")):
-        payloads = _parse_crate(crate_path, tz)
+    # 範囲外と分かる crate は開かずに飛ばす
+    crate_paths = [source.path for source in _within_window(_history_sources(root), config)]
+    # ワーカーは TrackPayload だけを返し、PlayEvent の構築は親プロセスで行う
+    parse = partial(_parse_crate, tz=tz, raw_retention=config.raw_retention)
+
+    def build(
+        crate_path: Path,
+        payloads: list[TrackPayload],
+    ) -> tuple[NightSession, EventSequence] | None:
         if not payloads:
-            continue
-        session = _build_session_from_payloads(
+            return None
+        return _build_session_from_payloads(
             config=config,
             tz=tz,
             session_label=_session_label_from_path(crate_path),
             payloads=payloads,
             anchor_hint=_anchor_from_filename(crate_path, tz),
         )
-        sessions.append(session)
-    return sessions
-
-
-def _parse_crate(crate_path: Path, tz: ZoneInfo) -> list[TrackPayload]:
-    data = crate_path.read_bytes()
-    offset = 0
-    payloads: list[TrackPayload] = []
-    while offset + 8 <= len(data):
-        tag = data[offset : offset + 4].decode("ascii", errors="ignore")
-        length = int.from_bytes(data[offset + 4 : offset + 8], "big")
-        payload = data[offset + 8 : offset + 8 + length]
-        offset += 8 + length
-        if tag == "otrk":
-            payloads.append(_track_from_chunk(payload, tz))
-    return payloads
-
-
-def _track_from_chunk(chunk: bytes, tz: ZoneInfo) -> TrackPayload:
-    fields: dict[str, bytes] = {}
-    raw: dict[str, str] = {}
-    offset = 0
-    while offset + 8 <= len(chunk):
-        tag = chunk[offset : offset + 4].decode("ascii", errors="ignore")
-        length = int.from_bytes(chunk[offset + 4 : offset + 8], "big")
-        payload = chunk[offset + 8 : offset + 8 + length]
-        offset += 8 + length
-        fields[tag] = payload
-        raw[tag] = _decode_text(payload)
-
-    title = _decode_text(fields.get("ttxt", b"")).strip() or "Unknown Track"
-    artist = _decode_text(fields.get("aART", b"")).strip()
-    album = _decode_text(fields.get("albm", b"")).strip()
-    deck = _decode_text(fields.get("deck", b"")).strip() or None
-    bpm = _decode_float(fields.get("bpmf"))
-    duration = _decode_int(fields.get("dura"))
-    key = _decode_text(fields.get("key", b"")).strip() or None
-    source_path = _decode_text(fields.get("path", b"")).strip() or None
-    track_id = _decode_text(fields.get("pidx", b"")).strip() or None
-    played_at = _decode_datetime(fields.get("pdat"), tz)
+
+    yield from iter_cached_sessions(
+        "serato-crate",
+        crate_paths,
+        lambda paths: ordered_map(parse, paths, config.jobs),
+        build,
+        config,
+    )
+
+
+def _parse_crate(
+    crate_path: Path,
+    tz: ZoneInfo,
+    raw_retention: RawRetention = "full",
+) -> list[TrackPayload]:
+    return list(_iter_crate_tracks(crate_path, tz, raw_retention))
+
+
+def _iter_crate_tracks(
+    crate_path: Path,
+    tz: ZoneInfo,
+    raw_retention: RawRetention = "full",
+) -> Iterator[TrackPayload]:
+    timestamps = TimestampParser(CRATE_DATETIME_FORMATS)
+    with ChunkReader.open(crate_path) as reader:
+        text_codec = _crate_codec(reader)
+        for code, start, end in reader.iter_chunks():
+            if code == OTRK:
+                yield _track_from_chunk(
+                    reader.children(start, end), tz, raw_retention, timestamps, text_codec
+                )
+
+
+def _crate_codec(reader: ChunkReader) -> str:
+    """Return the codec of the crate's text tags.
+
+    Serato writes the ``vrsn`` header in the same encoding as the text tags,
+    so its NUL bytes decide between UTF-16-BE/LE and UTF-8. Without a header,
+    the first text field containing a NUL byte decides. A crate with neither
+    is read as UTF-8.
+    """
+
+    chunks = list(reader.iter_chunks())
+    for code, start, end in chunks:
+        if code == VRSN:
+            return _codec_from_nul(reader.payload(start, end).tobytes()) or CODEC_UTF8
+    for code, start, end in chunks:
+        if code != OTRK:
+            continue
+        for tag, payload in reader.children(start, end).fields().items():
+            if TAG_CODECS.get(tag, CODEC_UTF8) != CODEC_ASCII:
+                codec = _codec_from_nul(payload.tobytes())
+                if codec is not None:
+                    return codec
+    return CODEC_UTF8
+
+
+def _codec_from_nul(value: bytes) -> str | None:
+    # UTF-8/ASCII に NUL は現れない（終端 NUL を除く）ので、NUL の位置の偶奇で
+    # UTF-16 の BE/LE を判定する
+    if len(value) & 1:
+        return None
+    nul = value.find(b"\x00", 0, len(value) - 1)
+    if nul == -1:
+        return None
+    return CODEC_UTF16_LE if nul & 1 else CODEC_UTF16_BE
+
+
+def _track_from_chunk(
+    chunk: ChunkReader,
+    tz: ZoneInfo,
+    raw_retention: RawRetention = "full",
+    timestamps: TimestampParser | None = None,
+    text_codec: str = CODEC_UTF16_BE,
+) -> TrackPayload:
+    # raw を全保持しない場合は型付きフィールドに使うタグだけを実体化する
+    fields = chunk.fields(None if raw_retention == "full" else TYPED_TAGS)
+    # 各フィールドは 1 回だけデコードし、raw と型付きフィールドで共有する
+    codecs = CRATE_TAG_CODECS[text_codec]
+    text = {
+        tag: _decode_text(payload, codecs.get(tag, text_codec))
+        for tag, payload in fields.items()
+    }
+
+    title = text.get("ttxt", "").strip() or "Unknown Track"
+    artist = text.get("aART", "").strip()
+    album = text.get("albm", "").strip()
+    deck = text.get("deck", "").strip() or None
+    bpm = _parse_float(text.get("bpmf"))
+    duration = _parse_int(text.get("dura"), fields.get("dura"))
+    key = text.get("key", "").strip() or None
+    source_path = text.get("path", "").strip() or None
+    track_id = text.get("pidx", "").strip() or None
+    played_at = _parse_datetime(text.get("pdat"), tz, timestamps)
 
     return TrackPayload(
         title=title,
@@ -202,89 +429,131 @@ def _track_from_chunk(chunk: bytes, tz: ZoneInfo) -> TrackPayload:
         source_path=source_path,
         source_track_id=track_id,
         played_at=played_at,
-        raw=raw or None,
+        raw=_retain_raw(chunk, text, raw_retention, text_codec),
     )
 
 
-def _extract_from_logs(
+def _retain_raw(
+    chunk: ChunkReader,
+    text: dict[str, str],
+    raw_retention: RawRetention,
+    text_codec: str = CODEC_UTF16_BE,
+) -> dict[str, str] | LazyRaw | None:
+    if raw_retention == "full":
+        return text or None
+    if raw_retention == "lazy":
+        return TlvRawView(chunk.view.tobytes(), text_codec)
+    return None
+
+
+class TlvRawView(LazyRaw):
+    """Lazy ``raw`` view over a copied ``otrk`` payload.
+
+    Only the track's bytes are retained; tags are located and decoded when the
+    view is read (typically when the event is serialized).
+    """
+
+    __slots__ = ("_chunk", "_codec", "_fields")
+
+    def __init__(self, chunk: bytes, codec: str = CODEC_UTF16_BE) -> None:
+        self._chunk = chunk
+        self._codec = codec
+        self._fields: dict[str, memoryview] | None = None
+
+    def _payloads(self) -> dict[str, memoryview]:
+        if self._fields is None:
+            self._fields = ChunkReader(self._chunk).fields()
+        return self._fields
+
+    def __reduce__(self) -> tuple[type[TlvRawView], tuple[bytes, str]]:
+        return TlvRawView, (self._chunk, self._codec)
+
+    def __getitem__(self, tag: str) -> str:
+        codec = CRATE_TAG_CODECS[self._codec].get(tag, self._codec)
+        return _decode_text(self._payloads()[tag], codec)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._payloads())
+
+    def __len__(self) -> int:
+        return len(self._payloads())
+
+
+def _iter_log_sessions(
     root: Path,
     config: PlaylogConfig,
     tz: ZoneInfo,
-) -> list[tuple[NightSession, list[PlayEvent]]]:
+) -> Iterator[tuple[NightSession, EventSequence]]:
     logs_dir = root / "Logs"
     if not logs_dir.exists():
         if config.serato_mode == MODE_LOGS:
             msg = "Serato Logs directory not found"
             raise SeratoExtractorError(msg)
-        return []
-
-    sessions: list[tuple[NightSession, list[PlayEvent]]] = []
-    for log_path in sorted(logs_dir.glob("*.log")) + sorted(logs_dir.glob("*.txt")):
-        session = _parse_log(log_path, config, tz)
-        if session:
-            sessions.append(session)
-    return sessions
+        return
+
+    log_paths = [source.path for source in _within_window(_log_sources(root), config)]
+    load = partial(_load_log_rows, config=config, tz=tz)
+    yield from iter_cached_sessions(
+        "serato-log",
+        log_paths,
+        lambda paths: ordered_map(load, paths, config.jobs),
+        partial(_build_log_session, config=config, tz=tz),
+        config,
+    )
 
 
 def _parse_log(
     log_path: Path,
     config: PlaylogConfig,
     tz: ZoneInfo,
-) -> tuple[NightSession, list[PlayEvent]] | None:
-    lines = log_path.read_text(encoding="utf-8").splitlines()
-    base_dt = _session_start_from_log(lines, tz) or _anchor_from_filename(log_path, tz)
-    session_label = _session_label_from_path(log_path)
-    session_id = session_label
+) -> tuple[NightSession, EventSequence] | None:
+    return _build_log_session(log_path, _load_log_rows(log_path, config, tz), config, tz)
 
-    events: list[PlayEvent] = []
-    last_dt: datetime | None = None
-    current_date = base_dt.date()
 
-    for line in lines:
-        match = LOG_LINE.match(line.strip())
-        if not match:
-            continue
-        played_time = _parse_time(match.group("time"))
-        played_dt = datetime.combine(current_date, played_time, tzinfo=tz)
-        if last_dt and played_dt < last_dt:
-            played_dt += timedelta(days=1)
-            current_date = played_dt.date()
-        body = match.group("body").strip()
-        artist, title = _split_artist_title(body)
-        deck = match.group("deck").strip()
-        events.append(
-            PlayEvent(
-                app="serato",
-                app_version=None,
-                session_id=session_id,
-                session_date=played_dt.date(),
-                night_date=floor_by_cutoff(played_dt, config.cutoff, tz),
-                played_at=played_dt,
-                title=title,
-                artist=artist,
-                album="",
-                duration_sec=0,
-                deck=deck,
-                bpm=None,
-                key=None,
-                source_path=None,
-                source_track_id=None,
-                raw={"line": line.strip()},
-            ),
-        )
-        last_dt = played_dt
+def _load_log_rows(log_path: Path, config: PlaylogConfig, tz: ZoneInfo) -> list[LogRow]:
+    """Return parsed rows for ``log_path``, resuming from its checkpoint."""
+
+    store = None
+    checkpoint = None
+    stat = log_path.stat()
+    if config.log_checkpoints:
+        store = CheckpointStore(config.state_dir / LOG_CHECKPOINT_DIR)
+        checkpoint = store.load(log_path)
+        if checkpoint is not None and not checkpoint.is_resumable(log_path, stat, tz.key):
+            checkpoint = None
+
+    if checkpoint is not None and checkpoint.offset == stat.st_size:
+        # 前回から追記なし: 末尾の検証だけで本文は読まず、保存済みの行から組み立てる
+        return checkpoint.rows
+    return _scan_log(log_path, tz, checkpoint, store, stat)
 
+
+def _build_log_session(
+    log_path: Path,
+    rows: list[LogRow],
+    config: PlaylogConfig,
+    tz: ZoneInfo,
+) -> tuple[NightSession, EventSequence] | None:
+    session_label = _session_label_from_path(log_path)
+    session_id = session_label
+    played = [_row_datetime(row, tz) for row in rows]
+    nights = floor_by_cutoff_batch(played, config.cutoff, tz)
+    events = build_events(
+        (
+            _log_record(row, played_dt, night_date, session_id, config)
+            for row, played_dt, night_date in zip(rows, played, nights, strict=True)
+        ),
+        trusted=True,
+        columnar=config.columnar_events,
+    )
     if not events:
         return None
 
-    session_start = events[0].played_at
-    session_end = events[-1].played_at
-    night_date = events[0].night_date or floor_by_cutoff(base_dt, config.cutoff, tz)
-
+    session_start, session_end = played_at_range(events)
     session = NightSession(
         app="serato",
         session_id=session_id,
-        night_date=night_date,
+        night_date=nights[0],
         session_label=session_label,
         app_version=None,
         session_start=session_start,
@@ -294,6 +563,134 @@ def _parse_log(
     return session, events
 
 
+def _scan_log(
+    log_path: Path,
+    tz: ZoneInfo,
+    checkpoint: LogCheckpoint | None,
+    store: CheckpointStore | None,
+    stat: os.stat_result,
+) -> list[LogRow]:
+    """Parse log lines after the checkpoint offset (or from the start).
+
+    The file is memory-mapped and only lines that pass the byte-level
+    prefilter are decoded, so memory stays flat regardless of log size.
+    """
+
+    offset = checkpoint.offset if checkpoint else 0
+    with mapped_file(log_path) as buffer:
+        size = len(buffer)
+        # 書き込み途中の最終行はイベント化するがチェックポイントには含めない
+        newline = buffer.rfind(b"\n", offset, size)
+        complete = offset if newline == -1 else newline + 1
+
+        if checkpoint is not None:
+            rows = list(checkpoint.rows)
+            current_date = checkpoint.current_date
+            last_dt = checkpoint.last_played_at
+        else:
+            rows = []
+            marker_lines = iter_lines_containing(buffer, LOG_SESSION_MARKER)
+            base_dt = (
+                _session_start_from_log((line.decode("utf-8") for line in marker_lines), tz)
+                or _anchor_from_filename(log_path, tz)
+            )
+            current_date = base_dt.date()
+            last_dt = None
+
+        current_date, last_dt = _scan_log_lines(
+            iter_candidate_lines(buffer, LOG_LINE_PREFILTER, offset, complete),
+            tz,
+            current_date,
+            last_dt,
+            rows,
+        )
+        if store is not None:
+            store.save(
+                log_path,
+                LogCheckpoint(
+                    inode=stat.st_ino,
+                    size=size,
+                    offset=complete,
+                    tail_digest=tail_digest(log_path, complete),
+                    timezone=tz.key,
+                    current_date=current_date,
+                    last_played_at=last_dt,
+                    rows=rows,
+                ),
+                previous=checkpoint,
+            )
+        if complete < size:
+            _scan_log_lines(
+                iter_candidate_lines(buffer, LOG_LINE_PREFILTER, complete, size),
+                tz,
+                current_date,
+                last_dt,
+                rows,
+            )
+    return rows
+
+
+def _scan_log_lines(
+    lines: Iterable[bytes],
+    tz: ZoneInfo,
+    current_date: date,
+    last_dt: datetime | None,
+    rows: list[LogRow],
+) -> tuple[date, datetime | None]:
+    """Append parsed rows and return the updated day-rollover state."""
+
+    for line in lines:
+        stripped = line.decode("utf-8").strip()
+        match = LOG_LINE.match(stripped)
+        if not match:
+            continue
+        played_time = _parse_time(match.group("time"))
+        played_dt = datetime.combine(current_date, played_time, tzinfo=tz)
+        if last_dt and played_dt < last_dt:
+            played_dt += timedelta(days=1)
+            current_date = played_dt.date()
+        # tz はチェックポイント側で固定しているので naive のローカル時刻で保存する
+        rows.append((played_dt.replace(tzinfo=None).isoformat(), stripped))
+        last_dt = played_dt
+    return current_date, last_dt
+
+
+def _log_record(
+    row: LogRow,
+    played_dt: datetime,
+    night_date: date,
+    session_id: str,
+    config: PlaylogConfig,
+) -> dict[str, object]:
+    line = row[1]
+    # 行は走査時に LOG_LINE で選んでいるので必ず一致する
+    match = LOG_LINE.match(line)
+    deck, body = (match.group("deck"), match.group("body").strip()) if match else ("", line)
+    artist, title = _split_artist_title(body)
+    return {
+        "app": "serato",
+        "app_version": None,
+        "session_id": session_id,
+        "session_date": played_dt.date(),
+        "night_date": night_date,
+        "played_at": played_dt,
+        "title": title,
+        "artist": artist,
+        "album": "",
+        "duration_sec": 0,
+        "deck": deck,
+        "bpm": None,
+        "key": None,
+        "source_path": None,
+        "source_track_id": None,
+        "raw": {"line": line} if config.raw_retention != "none" else None,
+    }
+
+
+def _row_datetime(row: LogRow, tz: ZoneInfo) -> datetime:
+    return datetime.fromisoformat(row[0]).replace(tzinfo=tz)
+
+
 def _build_session_from_payloads(
     *,
     config: PlaylogConfig,
@@ -301,7 +698,7 @@ def _build_session_from_payloads(
     session_label: str,
     payloads: list[TrackPayload],
     anchor_hint: datetime,
-) -> tuple[NightSession, list[PlayEvent]]:
+) -> tuple[NightSession, EventSequence]:
     session_id = sanitize_path_component(session_label)
     timeline_mode = "actual"
 
@@ -315,27 +712,31 @@ def _build_session_from_payloads(
     session_start = min(played_times) if played_times else anchor
     session_end = max(played_times) if played_times else anchor
 
-    events = [
-        PlayEvent(
-            app="serato",
-            app_version=None,
-            session_id=session_id,
-            session_date=(payload.played_at or anchor).date(),
-            night_date=night_date,
-            played_at=payload.played_at,
-            title=payload.title,
-            artist=payload.artist,
-            album=payload.album,
-            duration_sec=payload.duration_sec,
-            deck=payload.deck,
-            bpm=payload.bpm,
-            key=payload.key,
-            source_path=payload.source_path,
-            source_track_id=payload.source_track_id,
-            raw=payload.raw,
-        )
-        for payload in payloads
-    ]
+    events = build_events(
+        (
+            {
+                "app": "serato",
+                "app_version": None,
+                "session_id": session_id,
+                "session_date": (payload.played_at or anchor).date(),
+                "night_date": night_date,
+                "played_at": payload.played_at,
+                "title": payload.title,
+                "artist": payload.artist,
+                "album": payload.album,
+                "duration_sec": payload.duration_sec,
+                "deck": payload.deck,
+                "bpm": payload.bpm,
+                "key": payload.key,
+                "source_path": payload.source_path,
+                "source_track_id": payload.source_track_id,
+                "raw": payload.raw,
+            }
+            for payload in payloads
+        ),
+        trusted=True,
+        columnar=config.columnar_events,
+    )
 
     session = NightSession(
         app="serato",
@@ -359,55 +760,69 @@ def _estimate_timeline(payloads: Sequence[TrackPayload], anchor: datetime) -> No
         current = current + timedelta(seconds=duration)
 
 
-def _decode_text(value: bytes | None) -> str:
+def _decode_text(value: Buffer | None, codec: str = CODEC_UTF8) -> str:
+    """Decode a TLV text payload with the codec chosen for its crate.
+
+    ``codec`` comes from ``CRATE_TAG_CODECS``: the crate's text codec (see
+    ``_crate_codec``) for text tags and latin-1 for numeric/date tags. The
+    payload itself is not inspected to guess an encoding, since CJK-only
+    UTF-16-BE text is often also valid ASCII/UTF-8. Payloads that fail
+    ``codec`` fall back to probing the other codecs.
+    """
+
     if not value:
         return ""
-    for encoding in ("utf-8", "utf-16-be", "utf-16-le", "latin-1"):
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    # UTF-16 は codecs の C 関数を直接呼ぶ
+    try:
+        if codec == CODEC_UTF16_BE:
+            return _UTF16_BE_DECODE(value, "strict", True)[0].strip("\x00")
+        if codec == CODEC_UTF16_LE:
+            return _UTF16_LE_DECODE(value, "strict", True)[0].strip("\x00")
+        return value.decode(codec).strip("\x00")
+    except UnicodeDecodeError:
+        pass
+    for encoding in (CODEC_UTF8, CODEC_UTF16_BE, CODEC_UTF16_LE, CODEC_ASCII):
+        if encoding == codec:
+            continue
         try:
-            text = value.decode(encoding).strip("\x00")
-            return text
+            return value.decode(encoding).strip("\x00")
         except UnicodeDecodeError:
             continue
     return ""
 
 
-def _decode_int(value: bytes | None) -> int:
-    if not value:
+def _parse_int(text: str | None, payload: Buffer | None) -> int:
+    if not text:
         return 0
-    text = _decode_text(value)
     if text.isdigit():
         return int(text)
     try:
         return int(float(text))
     except ValueError:
-        if len(value) in {2, 4}:
-            return int.from_bytes(value, "big", signed=False)
+        if payload is not None and len(payload) in {2, 4}:
+            return int.from_bytes(payload, "big", signed=False)
     return 0
 
 
-def _decode_float(value: bytes | None) -> float | None:
-    if not value:
+def _parse_float(text: str | None) -> float | None:
+    if not text:
         return None
-    text = _decode_text(value)
     try:
         return float(text)
     except ValueError:
         return None
 
 
-def _decode_datetime(value: bytes | None, tz: ZoneInfo) -> datetime | None:
-    if not value:
+def _parse_datetime(
+    text: str | None,
+    tz: ZoneInfo,
+    timestamps: TimestampParser | None = None,
+) -> datetime | None:
+    if not text:
         return None
-    text = _decode_text(value)
-    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S"):
-        try:
-            parsed = datetime.strptime(text, fmt)
-            if parsed.tzinfo is None:
-                return parsed.replace(tzinfo=tz)
-            return parsed
-        except ValueError:
-            continue
-    return None
+    return (timestamps or TimestampParser(CRATE_DATETIME_FORMATS)).parse(text, tz)
 
 
 def _session_label_from_path(path: Path) -> str:
@@ -424,17 +839,15 @@ def _anchor_from_filename(path: Path, tz: ZoneInfo) -> datetime:
     return base
 
 
-def _session_start_from_log(lines: Sequence[str], tz: ZoneInfo) -> datetime | None:
+def _session_start_from_log(lines: Iterable[str], tz: ZoneInfo) -> datetime | None:
+    timestamps = TimestampParser(LOG_START_FORMATS)
     for line in lines:
         match = LOG_SESSION_START.search(line.strip())
         if not match:
             continue
-        dt_text = match.group("dt")
-        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S"):
-            try:
-                return datetime.strptime(dt_text, fmt).replace(tzinfo=tz)
-            except ValueError:
-                continue
+        parsed = timestamps.parse(match.group("dt"), tz)
+        if parsed is not None:
+            return parsed
     return None
 
 
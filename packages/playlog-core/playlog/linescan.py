@@ -0,0 +1,78 @@
+"""Constant-memory line scanning over memory-mapped text logs."""
+from __future__ import annotations
+
+import mmap
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+Buffer = bytes | mmap.mmap
+
+
+@contextmanager
+def mapped_file(path: Path) -> Iterator[Buffer]:
+    """Memory-map ``path`` read-only (empty files yield ``b""``)."""
+
+    with path.open("rb") as fp:
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b""
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def line_bounds(buffer: Buffer, position: int, start: int, end: int) -> tuple[int, int]:
+    """Return ``(line_start, line_end)`` of the line containing ``position``.
+
+    ``line_end`` excludes the newline and is clipped to ``end``.
+    """
+
+    newline = buffer.rfind(b"\n", start, position)
+    line_start = start if newline == -1 else newline + 1
+    line_end = buffer.find(b"\n", position, end)
+    if line_end == -1:
+        line_end = end
+    return line_start, line_end
+
+
+def iter_candidate_lines(
+    buffer: Buffer,
+    prefilter: re.Pattern[bytes],
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[bytes]:
+    """Yield each line in ``[start, end)`` that contains a ``prefilter`` hit.
+
+    The prefilter runs over the whole buffer in C, so lines without a hit never
+    reach Python code; each candidate line is yielded once, without its newline.
+    """
+
+    stop = len(buffer) if end is None else end
+    last_line_start = -1
+    for hit in prefilter.finditer(buffer, start, stop):
+        line_start, line_end = line_bounds(buffer, hit.start(), start, stop)
+        if line_start == last_line_start:
+            continue
+        last_line_start = line_start
+        yield buffer[line_start:line_end]
+
+
+def iter_lines_containing(
+    buffer: Buffer,
+    needle: bytes,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[bytes]:
+    """Yield lines containing the literal ``needle`` using ``find``."""
+
+    stop = len(buffer) if end is None else end
+    position = buffer.find(needle, start, stop)
+    while position != -1:
+        line_start, line_end = line_bounds(buffer, position, start, stop)
+        yield buffer[line_start:line_end]
+        position = buffer.find(needle, line_end, stop)
@@ -1,26 +1,86 @@
 """PlayLog core data models and utilities."""
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
+from collections.abc import Hashable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import cache
+from itertools import chain
+from math import isnan, nan
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Generic, Literal, Protocol, TypeVar, cast, overload
 from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    ValidationInfo,
+    field_validator,
+)
+from pydantic_core import core_schema
 
 PlayApp = Literal["djay", "rekordbox", "serato"]
 TimelineMode = Literal["actual", "estimated"]
-OutputFormat = Literal["json", "txt", "csv"]
+OutputFormat = Literal["json", "txt", "csv", "sqlite", "ndjson"]
+RawRetention = Literal["none", "lazy", "full"]
+JsonStyle = Literal["pretty", "compact"]
 
 RESERVED_FS_CHARS = "\\/:*?\"<>|"
 DEFAULT_CUTOFF = time(hour=8, minute=0)
 DEFAULT_SESSION_GAP_MINUTES = 60
+# 出力はディスク待ちが主なので、抽出と並行して少数のスレッドで書く (0 でメインスレッド)
+DEFAULT_WRITER_THREADS = 2
+DEFAULT_PARSE_CACHE_MAX_MB = 256
+STATE_DIRNAME = ".playlog"
 
 def _default_formats() -> set[OutputFormat]:
     return {"json", "txt", "csv"}
 
 
+class LazyRaw(Mapping[str, Any]):
+    """Read-only ``raw`` payload whose values are decoded from the source on access.
+
+    Instances are stored on ``PlayEvent`` as-is and only materialized into a
+    plain ``dict`` when the event is serialized.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls,
+        source_type: object,
+        handler: GetCoreSchemaHandler,
+    ) -> core_schema.CoreSchema:
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(dict),
+        )
+
+
+class RawMappingView(LazyRaw):
+    """Lazy ``raw`` view over an already-parsed mapping, without copying it."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source: Mapping[str, Any]) -> None:
+        self._source = source
+
+    def __getitem__(self, key: str) -> object:
+        return self._source[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._source)
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+
 class PlayEvent(BaseModel):
     """Normalized play event shared across extractors."""
 
@@ -41,7 +101,7 @@ class PlayEvent(BaseModel):
     key: str | None = None
     source_path: str | None = None
     source_track_id: str | None = None
-    raw: dict[str, Any] | None = None
+    raw: dict[str, Any] | LazyRaw | None = None
 
     @field_validator("played_at")
     @classmethod
@@ -53,6 +113,405 @@ class PlayEvent(BaseModel):
         return value
 
 
+_EVENT_DEFAULTS: dict[str, Any] = {
+    name: None if field.is_required() else field.get_default(call_default_factory=True)
+    for name, field in PlayEvent.model_fields.items()
+}
+# str_strip_whitespace の対象
+_EVENT_STR_FIELDS = (
+    "app_version",
+    "session_id",
+    "title",
+    "artist",
+    "album",
+    "deck",
+    "key",
+    "source_path",
+    "source_track_id",
+)
+_APPS = frozenset(PlayApp.__args__)  # type: ignore[attr-defined]
+_ALL_EVENT_FIELDS = frozenset(PlayEvent.model_fields)
+_object_setattr = object.__setattr__
+_APP_OF = itemgetter("app")
+_TITLE_OF = itemgetter("title")
+_DURATION_OF = itemgetter("duration_sec")
+_BPM_OF = itemgetter("bpm")
+_TEXTS_OF = itemgetter(*_EVENT_STR_FIELDS)
+
+
+def build_play_events(
+    records: Iterable[dict[str, Any]],
+    *,
+    trusted: bool = False,
+) -> list[PlayEvent]:
+    """Build ``PlayEvent`` objects from keyword dicts.
+
+    Untrusted records go through full validation. ``trusted=True`` is for
+    extractor output that is already typed and stripped: one bulk pass checks
+    the whole batch (known keys and apps, non-empty titles, non-negative
+    durations/BPM, no surrounding whitespace) and the events are then built
+    without per-field validation. A batch that fails the check is validated
+    normally, so errors and normalization are exactly those of ``PlayEvent``.
+    """
+
+    batch = list(records)
+    if trusted:
+        merged = [{**_EVENT_DEFAULTS, **record} for record in batch]
+        if _is_clean_batch(merged):
+            # 検証付きの生成と同じく、渡されたキーだけを設定済みとする
+            return [
+                _construct_event(values, record)
+                for values, record in zip(merged, batch, strict=True)
+            ]
+    return [PlayEvent(**record) for record in batch]
+
+
+def _is_clean_batch(batch: list[dict[str, Any]]) -> bool:
+    """Column-wise check that ``batch`` needs no validation or normalization."""
+
+    field_count = len(_EVENT_DEFAULTS)
+    if any(len(values) != field_count for values in batch):
+        return False
+    if not set(map(_APP_OF, batch)) <= _APPS or not all(map(_TITLE_OF, batch)):
+        return False
+    if min(map(_DURATION_OF, batch), default=0) < 0:
+        return False
+    if min([bpm for bpm in map(_BPM_OF, batch) if bpm is not None], default=0) < 0:
+        return False
+    texts = list(filter(None, chain.from_iterable(map(_TEXTS_OF, batch))))
+    try:
+        if list(map(str.strip, texts)) != texts:
+            return False
+    except TypeError:
+        return False
+    for values in batch:
+        # _ensure_timezone と同じ補正
+        played_at = values["played_at"]
+        if played_at is not None and played_at.tzinfo is None:
+            values["played_at"] = played_at.replace(tzinfo=ZoneInfo("UTC"))
+    return True
+
+
+def _construct_event(
+    values: dict[str, Any],
+    fields_set: Iterable[str] = _ALL_EVENT_FIELDS,
+) -> PlayEvent:
+    # model_construct と同じ内部状態を直接設定する（model_construct 自体は
+    # フィールドごとの既定値処理があり、検証付きの生成より遅い）
+    event = object.__new__(PlayEvent)
+    _object_setattr(event, "__dict__", values)
+    # 属性の代入で書き換わるので、イベントごとに別の set を持たせる
+    _object_setattr(event, "__pydantic_fields_set__", set(fields_set))
+    _object_setattr(event, "__pydantic_extra__", None)
+    _object_setattr(event, "__pydantic_private__", None)
+    return event
+
+
+_NO_TIMESTAMP = -(2**63)
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_DATE_FIELDS = ("session_date", "night_date")
+T = TypeVar("T")
+H = TypeVar("H", bound=Hashable)
+
+
+class _DictColumn(Generic[H]):
+    """Dictionary-encoded column: each distinct value is stored once."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, items: Iterable[H]) -> None:
+        index: dict[H, int] = {}
+        self.codes = array("I", [index.setdefault(item, len(index)) for item in items])
+        self.values = list(index)
+
+    def __getitem__(self, position: int) -> H:
+        return self.values[self.codes[position]]
+
+
+class _RowField(Generic[T]):
+    """Typed attribute on ``EventRow`` that reads one cell from its batch."""
+
+    __slots__ = ("name",)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, row: EventRow, owner: type | None = None) -> T:
+        return cast(T, row.batch.cell(self.name, row.index))
+
+
+class EventRow:
+    """Read-only view of one row of an ``EventBatch`` with ``PlayEvent``'s fields."""
+
+    __slots__ = ("batch", "index")
+
+    app: _RowField[PlayApp] = _RowField()
+    app_version: _RowField[str | None] = _RowField()
+    session_id: _RowField[str | None] = _RowField()
+    session_date: _RowField[date | None] = _RowField()
+    night_date: _RowField[date | None] = _RowField()
+    played_at: _RowField[datetime | None] = _RowField()
+    title: _RowField[str] = _RowField()
+    artist: _RowField[str] = _RowField()
+    album: _RowField[str] = _RowField()
+    duration_sec: _RowField[int] = _RowField()
+    deck: _RowField[str | None] = _RowField()
+    bpm: _RowField[float | None] = _RowField()
+    key: _RowField[str | None] = _RowField()
+    source_path: _RowField[str | None] = _RowField()
+    source_track_id: _RowField[str | None] = _RowField()
+    raw: _RowField[dict[str, Any] | LazyRaw | None] = _RowField()
+
+    def __init__(self, batch: EventBatch, index: int) -> None:
+        self.batch = batch
+        self.index = index
+
+    def model_dump(self) -> dict[str, Any]:
+        """Same result as ``PlayEvent.model_dump()`` for this row."""
+
+        payload = self.batch.row_dict(self.index)
+        if isinstance(payload["raw"], LazyRaw):
+            payload["raw"] = dict(payload["raw"])
+        return payload
+
+    def to_event(self) -> PlayEvent:
+        return _construct_event(self.batch.row_dict(self.index))
+
+
+class EventBatch(Sequence[EventRow]):
+    """Column-oriented storage for the events of one session.
+
+    Strings are dictionary-encoded, ``played_at`` is kept as int64 microsecond
+    arrays (wall clock plus UTC, with the tzinfo/fold dictionary-encoded),
+    dates as ordinals and durations/BPM as typed arrays. Rows are exposed as
+    ``EventRow`` views that read like ``PlayEvent``.
+    """
+
+    __slots__ = (
+        "_strings",
+        "_dates",
+        "_played_wall",
+        "_played_utc",
+        "_played_zone",
+        "_missing_played",
+        "_durations",
+        "_bpms",
+        "_raw",
+    )
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        """Build from complete, already-normalized field dicts (``PlayEvent.__dict__``)."""
+
+        self._strings: dict[str, _DictColumn[str | None]] = {
+            name: _DictColumn([row[name] for row in rows]) for name in ("app", *_EVENT_STR_FIELDS)
+        }
+        self._dates = {
+            name: array("i", [day.toordinal() if day else 0 for day in map(itemgetter(name), rows)])
+            for name in _DATE_FIELDS
+        }
+        played: list[datetime | None] = [row["played_at"] for row in rows]
+        # 壁時計と UTC の両方を持つ: 前者で元の値を復元し、後者で範囲・順序を比べる
+        self._played_wall = array(
+            "q",
+            [
+                _NO_TIMESTAMP if dt is None else (dt.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+                for dt in played
+            ],
+        )
+        self._played_utc = array(
+            "q",
+            [_NO_TIMESTAMP if dt is None else (dt - _EPOCH_UTC) // _MICROSECOND for dt in played],
+        )
+        self._played_zone: _DictColumn[tuple[tzinfo | None, int] | None] = _DictColumn(
+            [None if dt is None else (dt.tzinfo, dt.fold) for dt in played]
+        )
+        self._missing_played = played.count(None)
+        self._durations = array("q", map(itemgetter("duration_sec"), rows))
+        self._bpms = array(
+            "d", [nan if bpm is None else bpm for bpm in map(itemgetter("bpm"), rows)]
+        )
+        self._raw: list[Any] = [row["raw"] for row in rows]
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[dict[str, Any]],
+        *,
+        trusted: bool = False,
+    ) -> EventBatch:
+        """Build a batch with the same checks as ``build_play_events``."""
+
+        batch = list(records)
+        if trusted:
+            merged = [{**_EVENT_DEFAULTS, **record} for record in batch]
+            if _is_clean_batch(merged):
+                return cls(merged)
+        return cls.from_events([PlayEvent(**record) for record in batch])
+
+    @classmethod
+    def from_events(cls, events: Iterable[PlayEvent]) -> EventBatch:
+        return cls([event.__dict__ for event in events])
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> EventRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[EventRow]: ...
+
+    def __getitem__(self, index: int | slice) -> EventRow | list[EventRow]:
+        if isinstance(index, slice):
+            return [EventRow(self, position) for position in range(len(self))[index]]
+        position = range(len(self))[index]
+        return EventRow(self, position)
+
+    def __iter__(self) -> Iterator[EventRow]:
+        return (EventRow(self, position) for position in range(len(self)))
+
+    def cell(self, name: str, index: int) -> object:
+        """Return field ``name`` of row ``index`` as ``PlayEvent`` would hold it."""
+
+        column = self._strings.get(name)
+        if column is not None:
+            return column[index]
+        if name == "played_at":
+            return self._played_at(index)
+        if name in self._dates:
+            ordinal = self._dates[name][index]
+            return date.fromordinal(ordinal) if ordinal else None
+        if name == "duration_sec":
+            return self._durations[index]
+        if name == "bpm":
+            bpm = self._bpms[index]
+            return None if isnan(bpm) else bpm
+        if name == "raw":
+            return self._raw[index]
+        raise KeyError(name)
+
+    def row_dict(self, index: int) -> dict[str, Any]:
+        """All fields of row ``index``, as in ``PlayEvent.__dict__``."""
+
+        return {name: self.cell(name, index) for name in _EVENT_DEFAULTS}
+
+    def select(
+        self,
+        indexes: Iterable[int],
+        updates: Mapping[str, object] | None = None,
+    ) -> EventBatch:
+        """New batch of the given rows, with ``updates`` applied to each."""
+
+        overrides = dict(updates or {})
+        return EventBatch([{**self.row_dict(index), **overrides} for index in indexes])
+
+    def to_events(self) -> list[PlayEvent]:
+        return [row.to_event() for row in self]
+
+    def played_at_range(self) -> tuple[datetime | None, datetime | None]:
+        """Earliest and latest ``played_at`` (by instant), ignoring missing values."""
+
+        utc = self._played_utc
+        if self._missing_played == len(utc):
+            return None, None
+        if self._missing_played:
+            present = [value for value in utc if value != _NO_TIMESTAMP]
+            earliest, latest = min(present), max(present)
+        else:
+            earliest, latest = min(utc), max(utc)
+        return self._played_at(utc.index(earliest)), self._played_at(utc.index(latest))
+
+    def _played_at(self, index: int) -> datetime | None:
+        wall = self._played_wall[index]
+        if wall == _NO_TIMESTAMP:
+            return None
+        zone = self._played_zone[index]
+        if zone is None:
+            return None
+        return (_EPOCH + wall * _MICROSECOND).replace(tzinfo=zone[0], fold=zone[1])
+
+
+class EventLike(Protocol):
+    """Read-only event fields shared by ``PlayEvent`` and ``EventRow``."""
+
+    @property
+    def played_at(self) -> datetime | None: ...
+    @property
+    def title(self) -> str: ...
+    @property
+    def artist(self) -> str: ...
+    @property
+    def album(self) -> str: ...
+    @property
+    def duration_sec(self) -> int: ...
+    @property
+    def deck(self) -> str | None: ...
+    @property
+    def bpm(self) -> float | None: ...
+    @property
+    def key(self) -> str | None: ...
+    @property
+    def source_path(self) -> str | None: ...
+    @property
+    def source_track_id(self) -> str | None: ...
+
+    def model_dump(self) -> dict[str, Any]: ...
+
+
+# 抽出器が返し、ライターが受け取るイベント列 (list[PlayEvent] か EventBatch)
+EventSequence = Sequence[EventLike]
+
+
+def build_events(
+    records: Iterable[dict[str, Any]],
+    *,
+    trusted: bool = False,
+    columnar: bool = False,
+) -> list[PlayEvent] | EventBatch:
+    """``build_play_events`` or ``EventBatch.from_records`` depending on ``columnar``."""
+
+    if columnar:
+        return EventBatch.from_records(records, trusted=trusted)
+    return build_play_events(records, trusted=trusted)
+
+
+def played_at_range(events: EventSequence) -> tuple[datetime | None, datetime | None]:
+    """Earliest and latest ``played_at`` of ``events``, ignoring missing values.
+
+    An ``EventBatch`` answers from its timestamp columns without building rows.
+    """
+
+    if isinstance(events, EventBatch):
+        return events.played_at_range()
+    played = [event.played_at for event in events if event.played_at is not None]
+    if not played:
+        return None, None
+    return min(played), max(played)
+
+
+EVENT_FIELDS = tuple(_EVENT_DEFAULTS)
+
+
+def restore_events(
+    rows: Iterable[tuple[Any, ...]],
+    *,
+    columnar: bool = False,
+) -> list[PlayEvent] | EventBatch:
+    """Rebuild events from field tuples (``EVENT_FIELDS`` order) of validated events.
+
+    No check is made, so ``rows`` must come from events that were already
+    built, e.g. entries of the parse cache. The rows do not record which
+    fields were given explicitly, so all of them are marked as set.
+    """
+
+    records = [dict(zip(EVENT_FIELDS, row, strict=True)) for row in rows]
+    if columnar:
+        return EventBatch(records)
+    return [_construct_event(values) for values in records]
+
+
 class NightSession(BaseModel):
     """Nightly session metadata used for per-night outputs."""
 
@@ -86,6 +545,23 @@ class PlaylogConfig(BaseModel):
     redact_paths: bool = False
     serato_root: Path | None = None
     serato_mode: str = "auto"
+    columnar_events: bool = False
+    raw_retention: RawRetention = "full"
+    json_style: JsonStyle = "pretty"
+    log_checkpoints: bool = True
+    jobs: int = Field(default=1, ge=0)
+    writer_threads: int = Field(default=DEFAULT_WRITER_THREADS, ge=0)
+    parse_cache: bool = True
+    parse_cache_max_mb: int = Field(default=DEFAULT_PARSE_CACHE_MAX_MB, ge=1)
+    # 対象とする夜の範囲（両端を含む）。None は制限なし
+    since: date | None = None
+    until: date | None = None
+
+    @property
+    def state_dir(self) -> Path:
+        """Directory for PlayLog's own bookkeeping files inside ``out_dir``."""
+
+        return self.out_dir / STATE_DIRNAME
 
     @field_validator("out_dir")
     @classmethod
@@ -99,6 +575,15 @@ class PlaylogConfig(BaseModel):
             return None
         return value.expanduser().resolve()
 
+    @field_validator("until")
+    @classmethod
+    def _check_night_range(cls, value: date | None, info: ValidationInfo) -> date | None:
+        since = info.data.get("since")
+        if value is not None and since is not None and value < since:
+            msg = "until must not be earlier than since"
+            raise ValueError(msg)
+        return value
+
     @field_validator("serato_mode")
     @classmethod
     def _normalize_serato_mode(cls, value: str) -> str:
@@ -118,6 +603,7 @@ def sanitize_path_component(value: str, replacement: str = "_") -> str:
     return sanitized.strip() or "session"
 
 
+@cache
 def get_timezone(tz_name: str | None) -> ZoneInfo:
     """Return ZoneInfo from a name, defaulting to localtime if unavailable."""
 
@@ -126,6 +612,87 @@ def get_timezone(tz_name: str | None) -> ZoneInfo:
     return ZoneInfo("UTC")
 
 
+# strptime 書式のうち固定幅で fromisoformat に置き換えられるもの:
+# (全体の桁数 (None は末尾に UTC オフセットが続く), 日付区切り, 日付と時刻の区切り)
+FIXED_LAYOUTS: dict[str, tuple[int | None, str, str]] = {
+    "%Y-%m-%dT%H:%M:%S%z": (None, "-", "T"),
+    "%Y-%m-%dT%H:%M:%S": (19, "-", "T"),
+    "%Y-%m-%d %H:%M:%S": (19, "-", " "),
+    "%Y-%m-%d %H:%M": (16, "-", " "),
+    "%Y/%m/%d %H:%M:%S": (19, "/", " "),
+    "%Y/%m/%d %H:%M": (16, "/", " "),
+}
+
+
+class TimestampParser:
+    """``strptime`` over several formats, trying the last successful one first.
+
+    Keep one instance per source (a crate, a log, a plist file) so the learned
+    order follows that source's layout. ``formats`` must be mutually exclusive,
+    which makes the result independent of the order they are tried in. Formats
+    listed in ``FIXED_LAYOUTS`` are parsed with ``datetime.fromisoformat`` when
+    the text has exactly that layout, falling back to ``strptime`` otherwise.
+    """
+
+    __slots__ = ("_formats", "_order")
+
+    def __init__(self, formats: Sequence[str]) -> None:
+        self._formats = tuple(formats)
+        self._order = self._formats
+
+    @property
+    def order(self) -> tuple[str, ...]:
+        return self._order
+
+    def parse(self, text: str, tz: ZoneInfo | None = None) -> datetime | None:
+        """Parse ``text``; naive results get ``tz`` attached when given."""
+
+        for fmt in self._order:
+            parsed = _parse_fixed(text, fmt)
+            if parsed is None:
+                try:
+                    parsed = datetime.strptime(text, fmt)
+                except ValueError:
+                    continue
+            if fmt != self._order[0]:
+                self._order = (fmt, *(item for item in self._formats if item != fmt))
+            if tz is not None and parsed.tzinfo is None:
+                return parsed.replace(tzinfo=tz)
+            return parsed
+        return None
+
+
+def _parse_fixed(text: str, fmt: str) -> datetime | None:
+    layout = FIXED_LAYOUTS.get(fmt)
+    if layout is None:
+        return None
+    width, date_sep, sep = layout
+    size = len(text)
+    if width is None:
+        # %z として strptime が受け付けるオフセット (Z, ±HH:MM, ±HHMM) だけを扱う。
+        # fromisoformat は "+09" のような時だけのオフセットも許してしまう
+        suffix = text[19:]
+        if suffix != "Z" and not (
+            suffix[:1] in {"+", "-"}
+            and (size == 24 or (size == 25 and suffix[3] == ":"))
+        ):
+            return None
+    elif size != width:
+        return None
+    if size < 16 or text[4] != date_sep or text[7] != date_sep or text[10] != sep:
+        return None
+    iso = text if date_sep == "-" else f"{text[:4]}-{text[5:7]}-{text[8:]}"
+    try:
+        parsed = datetime.fromisoformat(iso)
+    except ValueError:
+        return None
+    # fromisoformat は "01:15+09" のような短い時刻にもオフセットを許すので、
+    # オフセットの有無が書式と合わないものは strptime に任せる
+    if (parsed.tzinfo is None) != (width is not None):
+        return None
+    return parsed
+
+
 def floor_by_cutoff(
     dt: datetime,
     cutoff: time = DEFAULT_CUTOFF,
@@ -141,6 +708,100 @@ def floor_by_cutoff(
     return localized.date()
 
 
+# 協定時刻は最大 ±26 時間ずれるので、UTC の日付範囲を左右 2 日広げれば足りる
+_BOUNDARY_MARGIN = timedelta(days=2)
+
+
+class NightBucketer:
+    """Assign night dates to many timestamps for one cutoff and timezone.
+
+    Timestamps already in ``tz`` are floored with wall-clock arithmetic, the
+    same comparison ``floor_by_cutoff`` makes. Others are placed by binary
+    search over the UTC instants of each local cutoff, computed once per
+    covered date; days whose cutoff falls in a DST gap or fold are delegated
+    to ``floor_by_cutoff`` so results always match it.
+    """
+
+    __slots__ = ("cutoff", "tz", "_shift", "_first", "_boundaries", "_nights", "_irregular")
+
+    def __init__(self, cutoff: time = DEFAULT_CUTOFF, tz: ZoneInfo | None = None) -> None:
+        self.cutoff = cutoff
+        self.tz = tz or ZoneInfo("UTC")
+        self._shift = datetime.combine(date.min, cutoff) - datetime.min
+        self._first = 0
+        self._boundaries: list[int] = []
+        self._nights: list[date] = []
+        self._irregular: frozenset[int] = frozenset()
+
+    def night_dates(self, timestamps: Iterable[datetime]) -> list[date]:
+        stamps = list(timestamps)
+        tz, shift = self.tz, self._shift
+        # 同じ tzinfo 同士の比較は壁時計で行われるので、
+        # カットオフ分ずらした日付がそのまま夜の日付になる
+        nights = [(dt - shift).date() for dt in stamps]
+        foreign = [position for position, dt in enumerate(stamps) if dt.tzinfo is not tz]
+        if foreign:
+            others = self._bucket_instants([stamps[position] for position in foreign])
+            for position, night in zip(foreign, others, strict=True):
+                nights[position] = night
+        return nights
+
+    def _bucket_instants(self, stamps: list[datetime]) -> list[date]:
+        try:
+            instants = [(dt - _EPOCH_UTC) // _MICROSECOND for dt in stamps]
+        except TypeError:
+            # naive はシステムのローカル時刻として解釈されるので個別に計算する
+            return [floor_by_cutoff(dt, self.cutoff, self.tz) for dt in stamps]
+        self._cover(min(instants), max(instants))
+
+        boundaries, nights, irregular = self._boundaries, self._nights, self._irregular
+        indexes = [bisect_right(boundaries, instant) for instant in instants]
+        if irregular.isdisjoint(indexes):
+            return [nights[index] for index in indexes]
+        return [
+            floor_by_cutoff(dt, self.cutoff, self.tz) if index in irregular else nights[index]
+            for dt, index in zip(stamps, indexes, strict=True)
+        ]
+
+    def _cover(self, earliest: int, latest: int) -> None:
+        first = (_EPOCH + earliest * _MICROSECOND - _BOUNDARY_MARGIN).toordinal()
+        last = (_EPOCH + latest * _MICROSECOND + _BOUNDARY_MARGIN).toordinal()
+        if self._boundaries and self._first <= first and last < self._first + len(self._boundaries):
+            return
+        if self._boundaries:
+            first = min(first, self._first)
+            last = max(last, self._first + len(self._boundaries) - 1)
+
+        boundaries: list[int] = []
+        irregular: set[int] = set()
+        for position, ordinal in enumerate(range(first, last + 1)):
+            boundary = datetime.combine(date.fromordinal(ordinal), self.cutoff, tzinfo=self.tz)
+            if boundary.utcoffset() != boundary.replace(fold=1).utcoffset():
+                # 境界の両側の区間は壁時計での比較に任せる
+                irregular.update((position, position + 1))
+            boundaries.append((boundary - _EPOCH_UTC) // _MICROSECOND)
+        self._first = first
+        self._boundaries = boundaries
+        # 区間 i は boundaries[i - 1] <= t < boundaries[i]、つまり first + i - 1 日の夜
+        self._nights = [date.fromordinal(first + index - 1) for index in range(len(boundaries) + 1)]
+        self._irregular = frozenset(irregular)
+
+
+@cache
+def _bucketer(cutoff: time, tz: ZoneInfo) -> NightBucketer:
+    return NightBucketer(cutoff, tz)
+
+
+def floor_by_cutoff_batch(
+    timestamps: Iterable[datetime],
+    cutoff: time = DEFAULT_CUTOFF,
+    tz: ZoneInfo | None = None,
+) -> list[date]:
+    """``floor_by_cutoff`` for many timestamps, sharing cached cutoff boundaries."""
+
+    return _bucketer(cutoff, tz or ZoneInfo("UTC")).night_dates(timestamps)
+
+
 @dataclass(frozen=True, slots=True)
 class SessionPaths:
     """Derived filesystem paths for a given session."""
@@ -0,0 +1,94 @@
+"""Render extracted sessions on writer threads while extraction continues."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple
+
+from .models import EventSequence, NightSession, PlaylogConfig
+from .parallel import PREFETCH_FACTOR
+from .sessions import SessionEvents
+from .writers import RenderedFile, SharedOutputs, render_session, session_paths
+
+
+class WrittenSession(NamedTuple):
+    session: NightSession
+    tracks: int
+    files: list[RenderedFile]
+
+
+class OutputStage:
+    """Thread pool that renders ``(session, events)`` pairs from an extractor.
+
+    At most ``threads * PREFETCH_FACTOR`` sessions are in flight: pulling the
+    next session from the extractor waits for the oldest render, which caps
+    the events held in memory. Results come back in submission order and a
+    failed render re-raises on the consuming thread.
+
+    Used as a context manager it keeps one ``SharedOutputs`` (the ``sqlite``
+    transaction and the ``ndjson`` event log) open for every session
+    rendered while inside it.
+    """
+
+    def __init__(
+        self,
+        config: PlaylogConfig,
+        formats: Iterable[str] | None = None,
+        threads: int | None = None,
+    ) -> None:
+        self.config = config
+        self.formats = set(formats) if formats else None
+        self.threads = config.writer_threads if threads is None else threads
+        self.shared: SharedOutputs | None = None
+        self._locks: dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def __enter__(self) -> OutputStage:
+        self.shared = SharedOutputs(self.config, self.formats).__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        shared, self.shared = self.shared, None
+        if shared is not None:
+            shared.__exit__(exc_type, exc, traceback)
+
+    def render(self, session: NightSession, events: EventSequence) -> WrittenSession:
+        # 同じディレクトリに出力するセッション同士は一時ファイルを共有するので直列にする
+        with self._lock_for(session_paths(self.config, session).session_dir):
+            files = render_session(session, events, self.config, self.formats, self.shared)
+        return WrittenSession(session, len(events), files)
+
+    def _lock_for(self, directory: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(directory, threading.Lock())
+
+    def run(self, sessions: Iterable[SessionEvents]) -> Iterator[WrittenSession]:
+        """Render every session and yield the results in input order."""
+
+        if self.threads <= 0:
+            for session, events in sessions:
+                yield self.render(session, events)
+            return
+
+        pool = ThreadPoolExecutor(self.threads, thread_name_prefix="playlog-writer")
+        pending: deque[Future[WrittenSession]] = deque()
+        limit = self.threads * PREFETCH_FACTOR
+        try:
+            for session, events in sessions:
+                pending.append(pool.submit(self.render, session, events))
+                if len(pending) >= limit:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # 失敗や途中終了では、まだ始まっていない書き込みを取り消してから待つ
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,56 @@
+"""Order-preserving fan-out of per-file parsing to a process pool."""
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# ワーカー 1 つあたりこれ未満のファイル数ならプロセス起動のコストが勝つ
+MIN_ITEMS_PER_WORKER = 2
+# 結果を先読みする上限（ワーカー数に対する倍率）。メモリを一定に保つ
+PREFETCH_FACTOR = 2
+
+
+def resolve_jobs(jobs: int, items: int) -> int:
+    """Return the worker count for ``items`` files (``jobs=0`` means all cores)."""
+
+    requested = jobs if jobs > 0 else os.cpu_count() or 1
+    return max(1, min(requested, items // MIN_ITEMS_PER_WORKER))
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Sequence[T],
+    jobs: int = 1,
+) -> Iterator[R]:
+    """Yield ``func(item)`` for each item, in input order.
+
+    With one effective worker everything runs in-process; otherwise ``func``
+    and its results must be picklable and should stay small (plain tuples or
+    slotted dataclasses rather than pydantic models) to keep IPC cheap.
+    """
+
+    workers = resolve_jobs(jobs, len(items))
+    if workers == 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[R]] = deque()
+        remaining = iter(items)
+        for item in remaining:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= workers * PREFETCH_FACTOR:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for item in remaining:
+                pending.append(pool.submit(func, item))
+                break
+            yield result
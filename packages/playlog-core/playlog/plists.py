@@ -0,0 +1,330 @@
+"""Selective property-list readers that only materialize matching dicts.
+
+``plistlib`` builds the whole object graph before callers can look at it. The
+readers here walk binary plists through their offset table (and XML plists
+through ``iterparse``) and only build Python objects for dicts accepted by a
+key predicate, plus the scalar entries of the root dict.
+"""
+from __future__ import annotations
+
+import binascii
+import plistlib
+import re
+import struct
+from collections.abc import Callable, Collection, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from xml.etree.ElementTree import Element, ParseError, iterparse
+
+from .linescan import Buffer, mapped_file
+
+PlistDict = dict[str, object]
+KeyPredicate = Callable[[Collection[str]], bool]
+
+BPLIST_MAGIC = b"bplist00"
+TRAILER = struct.Struct(">6xBBQQQ")
+BPLIST_EPOCH = datetime(2001, 1, 1)
+_REF_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+# マーカーの上位 4 ビット
+_ARRAY = 0xA0
+_DICT = 0xD0
+_CONTAINERS = frozenset({_ARRAY, _DICT})
+_SKIPPED = object()
+# plistlib と同じく、後ろの要素を省いた ISO 8601 の <date> も受け付ける
+_XML_DATE = re.compile(
+    r"(?P<year>\d\d\d\d)(?:-(?P<month>\d\d)(?:-(?P<day>\d\d)"
+    r"(?:T(?P<hour>\d\d)(?::(?P<minute>\d\d)(?::(?P<second>\d\d))?)?)?)?)?Z",
+    re.ASCII,
+)
+_XML_DATE_FIELDS = ("year", "month", "day", "hour", "minute", "second")
+
+
+def read_matching_dicts(
+    path: Path,
+    matches: KeyPredicate,
+) -> tuple[PlistDict, list[PlistDict]]:
+    """Return ``(root scalars, matching dicts)`` from a binary or XML plist.
+
+    Dicts are visited depth-first in document order; a dict accepted by
+    ``matches`` is materialized in full and its children are not searched.
+    A root dict that matches is both the only match and the source of the
+    root scalars. Raises ``ValueError`` when the root object is not a dict.
+    """
+
+    with mapped_file(path) as buffer:
+        if buffer[: len(BPLIST_MAGIC)] == BPLIST_MAGIC:
+            return BinaryPlistReader(buffer).read_matching_dicts(matches)
+    return _read_xml_matching_dicts(path, matches)
+
+
+class BinaryPlistReader:
+    """Random-access reader over a ``bplist00`` buffer."""
+
+    __slots__ = ("_buffer", "_offsets", "_ref_format", "_ref_size", "_top", "_scalars")
+
+    def __init__(self, buffer: Buffer) -> None:
+        if len(buffer) < len(BPLIST_MAGIC) + TRAILER.size:
+            raise plistlib.InvalidFileException()
+        offset_size, ref_size, count, top, table = TRAILER.unpack_from(
+            buffer, len(buffer) - TRAILER.size
+        )
+        if ref_size not in _REF_FORMATS or offset_size not in _REF_FORMATS or top >= count:
+            raise plistlib.InvalidFileException()
+        self._buffer = buffer
+        self._offsets = struct.unpack_from(f">{count}{_REF_FORMATS[offset_size]}", buffer, table)
+        self._ref_size = ref_size
+        self._ref_format = _REF_FORMATS[ref_size]
+        self._top = top
+        # plistlib.dumps は同じ値を 1 オブジェクトに共有するので、キーを含む
+        # スカラー値は参照番号ごとに一度だけデコードする
+        self._scalars: list[object] = [_SKIPPED] * count
+
+    def read_matching_dicts(self, matches: KeyPredicate) -> tuple[PlistDict, list[PlistDict]]:
+        marker, position = self._header(self._top)
+        if marker & 0xF0 != _DICT:
+            msg = "plist root is not a dict"
+            raise ValueError(msg)
+        keys, values = self._dict_refs(marker, position)
+        names = [self._key(ref) for ref in keys]
+        if matches(names):
+            record = self._materialize_dict(self._top)
+            return _root_scalars(record), [record]
+
+        root: PlistDict = {}
+        found: list[PlistDict] = []
+        for name, ref in zip(names, values, strict=True):
+            if self._is_container(ref):
+                found.extend(self._iter_matching(ref, matches))
+            else:
+                root[name] = self._materialize(ref)
+        return root, found
+
+    def _iter_matching(self, ref: int, matches: KeyPredicate) -> Iterator[PlistDict]:
+        marker, position = self._header(ref)
+        kind = marker & 0xF0
+        if kind == _ARRAY:
+            count, start = self._size(marker, position)
+            children = self._refs(start, count)
+        elif kind == _DICT:
+            keys, children = self._dict_refs(marker, position)
+            if matches([self._key(key) for key in keys]):
+                yield self._materialize_dict(ref)
+                return
+        else:
+            return
+        for child in children:
+            if self._is_container(child):
+                yield from self._iter_matching(child, matches)
+
+    def _header(self, ref: int) -> tuple[int, int]:
+        offset = self._offsets[ref]
+        return self._buffer[offset], offset + 1
+
+    def _is_container(self, ref: int) -> bool:
+        return self._buffer[self._offsets[ref]] & 0xF0 in _CONTAINERS
+
+    def _size(self, marker: int, position: int) -> tuple[int, int]:
+        """Return ``(count, payload position)`` for a variable-length object."""
+
+        size = marker & 0x0F
+        if size != 0x0F:
+            return size, position
+        width = 1 << (self._buffer[position] & 0x03)
+        start = position + 1
+        return int.from_bytes(self._buffer[start : start + width], "big"), start + width
+
+    def _refs(self, position: int, count: int) -> tuple[int, ...]:
+        return struct.unpack_from(f">{count}{self._ref_format}", self._buffer, position)
+
+    def _dict_refs(self, marker: int, position: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        count, start = self._size(marker, position)
+        return (
+            self._refs(start, count),
+            self._refs(start + count * self._ref_size, count),
+        )
+
+    def _key(self, ref: int) -> str:
+        name = self._materialize(ref)
+        if not isinstance(name, str):
+            raise plistlib.InvalidFileException()
+        return name
+
+    def _materialize_dict(self, ref: int) -> PlistDict:
+        value = self._materialize(ref)
+        if not isinstance(value, dict):
+            raise plistlib.InvalidFileException()
+        return value
+
+    def _materialize(self, ref: int) -> object:
+        """Decode ``ref`` the same way ``plistlib.loads`` would."""
+
+        value = self._scalars[ref]
+        if value is not _SKIPPED:
+            return value
+        marker, position = self._header(ref)
+        kind = marker & 0xF0
+        if kind == _ARRAY:
+            count, start = self._size(marker, position)
+            return self._materialize_all(self._refs(start, count))
+        if kind == _DICT:
+            keys, values = self._dict_refs(marker, position)
+            return dict(
+                zip(self._materialize_all(keys), self._materialize_all(values), strict=True)
+            )
+        value = self._scalars[ref] = self._scalar(marker, position)
+        return value
+
+    def _materialize_all(self, refs: tuple[int, ...]) -> list[object]:
+        # 共有済みのスカラーは関数呼び出しなしでキャッシュから取り出す
+        scalars = self._scalars
+        return [
+            value if (value := scalars[ref]) is not _SKIPPED else self._materialize(ref)
+            for ref in refs
+        ]
+
+    def _scalar(self, marker: int, position: int) -> object:
+        buffer = self._buffer
+        kind = marker & 0xF0
+        if marker == 0x00:
+            return None
+        if marker == 0x08:
+            return False
+        if marker == 0x09:
+            return True
+        if marker == 0x0F:
+            return b""
+        if kind == 0x10:
+            width = 1 << (marker & 0x0F)
+            return int.from_bytes(buffer[position : position + width], "big", signed=width >= 8)
+        if marker == 0x22:
+            return struct.unpack_from(">f", buffer, position)[0]
+        if marker == 0x23:
+            return struct.unpack_from(">d", buffer, position)[0]
+        if marker == 0x33:
+            seconds = struct.unpack_from(">d", buffer, position)[0]
+            return BPLIST_EPOCH + timedelta(seconds=seconds)
+        if kind == 0x80:
+            width = (marker & 0x0F) + 1
+            return plistlib.UID(int.from_bytes(buffer[position : position + width], "big"))
+
+        count, start = self._size(marker, position)
+        if kind == 0x40:
+            return bytes(buffer[start : start + count])
+        if kind == 0x50:
+            return bytes(buffer[start : start + count]).decode("ascii")
+        if kind == 0x60:
+            return bytes(buffer[start : start + count * 2]).decode("utf-16-be")
+        raise plistlib.InvalidFileException()
+
+
+class _Frame:
+    """Open ``<dict>``/``<array>`` while streaming an XML plist."""
+
+    __slots__ = ("is_dict", "keys", "values", "found")
+
+    def __init__(self, is_dict: bool) -> None:
+        self.is_dict = is_dict
+        self.keys: list[str] = []
+        self.values: list[object] = []
+        self.found: list[PlistDict] = []
+
+
+def _read_xml_matching_dicts(
+    path: Path,
+    matches: KeyPredicate,
+) -> tuple[PlistDict, list[PlistDict]]:
+    frames: list[_Frame] = []
+    elements: list[Element] = []
+    record: PlistDict | None = None
+    found: list[PlistDict] = []
+    value: object = None
+    nested_dicts = 0
+    try:
+        # plistlib と同じく expat で読む (外部エンティティは展開されない)
+        for event, element in iterparse(path, events=("start", "end")):  # noqa: S314
+            tag = element.tag
+            if event == "start":
+                elements.append(element)
+                if tag in {"dict", "array"}:
+                    nested_dicts += tag == "dict" and bool(frames)
+                    frames.append(_Frame(tag == "dict"))
+                continue
+
+            elements.pop()
+            if tag == "key":
+                frames[-1].keys.append(element.text or "")
+            elif tag in {"dict", "array"}:
+                frame = frames.pop()
+                value = frame.values
+                if frame.is_dict:
+                    record = dict(zip(frame.keys, frame.values, strict=True))
+                    value = record
+                    if frames:
+                        nested_dicts -= 1
+                        if matches(frame.keys):
+                            frame.found = [record]
+                if frames and not nested_dicts:
+                    # 値が必要になるのは一致しうる祖先 dict がある場合だけ。
+                    # ルートが一致した場合は plistlib で読み直すので、ここでは捨てる
+                    value = _SKIPPED
+                if frames:
+                    frames[-1].values.append(value)
+                    frames[-1].found.extend(frame.found)
+                else:
+                    found = frame.found
+            elif frames:
+                frames[-1].values.append(_xml_scalar(tag, element.text or ""))
+
+            element.clear()
+            if elements:
+                elements[-1].remove(element)
+    except ParseError as exc:
+        raise plistlib.InvalidFileException() from exc
+
+    if frames or not isinstance(value, dict) or record is None:
+        msg = "plist root is not a dict"
+        raise ValueError(msg)
+    if matches(list(record)):
+        # ルート自体がトラックの場合は子コンテナも必要なので通常の読み込みに任せる
+        with path.open("rb") as fp:
+            record = plistlib.load(fp)
+        return _root_scalars(record), [record]
+    root = {key: item for key, item in record.items() if item is not _SKIPPED}
+    return root, found
+
+
+def _root_scalars(record: PlistDict) -> PlistDict:
+    return {key: value for key, value in record.items() if not isinstance(value, (list, dict))}
+
+
+def _xml_scalar(tag: str, text: str) -> object:
+    if tag == "string":
+        return text
+    if tag == "integer":
+        return int(text, 16) if text.startswith(("0x", "0X")) else int(text)
+    if tag == "real":
+        return float(text)
+    if tag == "true":
+        return True
+    if tag == "false":
+        return False
+    if tag == "date":
+        return _xml_date(text)
+    if tag == "data":
+        return binascii.a2b_base64(text.encode("utf-8"))
+    raise plistlib.InvalidFileException()
+
+
+def _xml_date(text: str) -> datetime:
+    match = _XML_DATE.match(text)
+    if match is None:
+        raise plistlib.InvalidFileException()
+    parts = [1, 1, 1, 0, 0, 0]
+    for index, name in enumerate(_XML_DATE_FIELDS):
+        value = match.group(name)
+        if value is None:
+            break
+        parts[index] = int(value)
+    year, month, day, hour, minute, second = parts
+    return datetime(year, month, day, hour, minute, second)
@@ -0,0 +1,190 @@
+"""Split extracted sessions on playback gaps and night cutoffs.
+
+Extractors define a session per source file, so one long crate or log can
+span several sets or nights. ``segment_session`` walks the events once in
+time order and cuts wherever a play starts more than ``session_gap_minutes``
+after the previous one ended, or a night cutoff is crossed.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from .models import (
+    EventBatch,
+    EventLike,
+    EventRow,
+    EventSequence,
+    NightSession,
+    PlayEvent,
+    PlaylogConfig,
+    floor_by_cutoff,
+    get_timezone,
+)
+
+SessionEvents = tuple[NightSession, EventSequence]
+_DAY = timedelta(days=1)
+
+
+class Segment(NamedTuple):
+    """Half-open event range ``[start, stop)`` that forms one session."""
+
+    start: int
+    stop: int
+    night_date: date
+    first_played: datetime
+    last_played: datetime
+
+
+def segment_sessions(
+    sessions: Iterable[SessionEvents],
+    config: PlaylogConfig,
+) -> Iterator[SessionEvents]:
+    """Apply ``segment_session`` to every session an extractor yields."""
+
+    tz = get_timezone(config.timezone)
+    for session, events in sessions:
+        yield from segment_session(session, events, config, tz)
+
+
+def segment_session(
+    session: NightSession,
+    events: EventSequence,
+    config: PlaylogConfig,
+    tz: ZoneInfo | None = None,
+) -> Iterator[SessionEvents]:
+    """Yield ``session`` split into gap/cutoff delimited sessions.
+
+    A session that needs no split is yielded unchanged. Otherwise the first
+    part keeps the original ``session_id`` and later parts get ``-2``, ``-3``
+    ... suffixes; their events carry the new ``session_id``/``night_date``.
+    """
+
+    events, segments = _segments(events, config, tz or get_timezone(config.timezone))
+    if len(segments) <= 1:
+        yield session, events
+        return
+
+    for number, segment in enumerate(segments, start=1):
+        session_id = session.session_id if number == 1 else f"{session.session_id}-{number}"
+        updates = {"session_id": session_id, "night_date": segment.night_date}
+        part = session.model_copy(
+            update={
+                **updates,
+                "session_start": segment.first_played,
+                "session_end": segment.last_played,
+            }
+        )
+        yield part, _relabel(events, segment.start, segment.stop, updates)
+
+
+def segment_nights(
+    session: NightSession,
+    events: EventSequence,
+    config: PlaylogConfig,
+    tz: ZoneInfo | None = None,
+) -> list[tuple[date, int]]:
+    """Night date and track count of each session ``segment_session`` yields.
+
+    The sessions themselves are not built.
+    """
+
+    _, segments = _segments(events, config, tz or get_timezone(config.timezone))
+    if len(segments) <= 1:
+        return [(session.night_date, len(events))]
+    return [(segment.night_date, segment.stop - segment.start) for segment in segments]
+
+
+def _segments(
+    events: EventSequence,
+    config: PlaylogConfig,
+    tz: ZoneInfo,
+) -> tuple[EventSequence, list[Segment]]:
+    gap = timedelta(minutes=config.session_gap_minutes).total_seconds()
+    segments = find_segments(events, gap, config.cutoff, tz)
+    if segments is None:
+        # 時刻順でない入力だけ並べ替える（played_at の無い曲は直前の曲に続ける）
+        events = _sorted_by_time(events)
+        segments = find_segments(events, gap, config.cutoff, tz) or []
+    return events, segments
+
+
+def find_segments(
+    events: Sequence[EventLike],
+    gap_seconds: float,
+    cutoff: time,
+    tz: ZoneInfo,
+) -> list[Segment] | None:
+    """Return the segments of time-ordered ``events`` in one pass.
+
+    Gaps are measured from the latest end (``played_at + duration_sec``) seen
+    so far. Events without ``played_at`` stay with the preceding event.
+    Returns ``None`` as soon as a timestamp goes backwards, so already-sorted
+    input is never re-sorted and out-of-order input can be sorted by the
+    caller.
+    """
+
+    segments: list[Segment] = []
+    start = 0
+    night = date.min
+    first = datetime.min
+    last: datetime | None = None
+    last_start = last_end = next_cutoff = 0.0
+    for index, event in enumerate(events):
+        played_at = event.played_at
+        if played_at is None:
+            continue
+        instant = played_at.timestamp()
+        if last is not None:
+            if instant < last_start:
+                return None
+            if instant - last_end <= gap_seconds and instant < next_cutoff:
+                last, last_start = played_at, instant
+                last_end = max(last_end, instant + event.duration_sec)
+                continue
+            segments.append(Segment(start, index, night, first, last))
+            start = index
+        first = played_at
+        night = floor_by_cutoff(played_at, cutoff, tz)
+        next_cutoff = datetime.combine(night + _DAY, cutoff, tzinfo=tz).timestamp()
+        last, last_start, last_end = played_at, instant, instant + event.duration_sec
+
+    if last is None:
+        return []
+    segments.append(Segment(start, len(events), night, first, last))
+    return segments
+
+
+def _sorted_by_time(events: EventSequence) -> EventSequence:
+    keys: list[float] = []
+    current = float("-inf")
+    for event in events:
+        if event.played_at is not None:
+            current = event.played_at.timestamp()
+        keys.append(current)
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    if isinstance(events, EventBatch):
+        return events.select(order)
+    return [events[index] for index in order]
+
+
+def _relabel(
+    events: EventSequence,
+    start: int,
+    stop: int,
+    updates: dict[str, object],
+) -> EventSequence:
+    if isinstance(events, EventBatch):
+        return events.select(range(start, stop), updates)
+    return [_as_event(event).model_copy(update=updates) for event in events[start:stop]]
+
+
+def _as_event(event: EventLike) -> PlayEvent:
+    if isinstance(event, PlayEvent):
+        return event
+    if isinstance(event, EventRow):
+        return event.to_event()
+    msg = f"unsupported event type: {type(event).__name__}"
+    raise TypeError(msg)
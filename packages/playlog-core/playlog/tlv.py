@@ -0,0 +1,129 @@
+"""Zero-copy reader for tag/length/value chunk streams (Serato crates)."""
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Container, Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+HEADER = struct.Struct(">II")
+HEADER_SIZE = HEADER.size
+
+# タグ名のデコード結果は数種類しかないので int -> str をキャッシュする
+_TAG_NAMES: dict[int, str] = {}
+
+
+def tag_code(tag: str) -> int:
+    """Return the big-endian integer form of a 4-character tag."""
+
+    encoded = tag.encode("ascii")
+    if len(encoded) != 4:
+        msg = f"TLV tags must be 4 ASCII characters, got {tag!r}"
+        raise ValueError(msg)
+    return int.from_bytes(encoded, "big")
+
+
+def tag_name(code: int) -> str:
+    """Return the decoded tag name for an integer tag code."""
+
+    name = _TAG_NAMES.get(code)
+    if name is None:
+        name = code.to_bytes(4, "big").decode("ascii", errors="ignore")
+        _TAG_NAMES[code] = name
+    return name
+
+
+class ChunkReader:
+    """Walk TLV chunks of a buffer by offset without copying payloads.
+
+    Payloads are exposed as ``memoryview`` slices of the underlying buffer, so
+    nested structures (``otrk`` -> ``ttxt``/``pdat`` ...) can be traversed and
+    only the requested fields are materialized by the caller.
+    """
+
+    __slots__ = ("_view",)
+
+    def __init__(self, buffer: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        self._view = memoryview(buffer)
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path) -> Iterator[ChunkReader]:
+        """Memory-map ``path`` and yield a reader over its contents."""
+
+        with path.open("rb") as fp:
+            try:
+                mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空ファイルは mmap できない
+                yield cls(b"")
+                return
+            reader = cls(mapped)
+            try:
+                yield reader
+            finally:
+                reader.release()
+                # 例外のトレースバック等が view を保持している場合は GC に任せる
+                with suppress(BufferError):
+                    mapped.close()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    @property
+    def view(self) -> memoryview:
+        return self._view
+
+    def release(self) -> None:
+        """Release the underlying buffer export."""
+
+        self._view.release()
+
+    def iter_chunks(self) -> Iterator[tuple[int, int, int]]:
+        """Yield ``(tag_code, start, end)`` for each top-level chunk.
+
+        A truncated trailing payload is clipped to the buffer size, matching
+        the behaviour of slicing past the end of ``bytes``.
+        """
+
+        view = self._view
+        size = len(view)
+        unpack_from = HEADER.unpack_from
+        offset = 0
+        while offset + HEADER_SIZE <= size:
+            code, length = unpack_from(view, offset)
+            start = offset + HEADER_SIZE
+            end = min(start + length, size)
+            yield code, start, end
+            offset = start + length
+
+    def payload(self, start: int, end: int) -> memoryview:
+        return self._view[start:end]
+
+    def children(self, start: int, end: int) -> ChunkReader:
+        """Return a reader over a nested chunk payload."""
+
+        return ChunkReader(self._view[start:end])
+
+    def fields(self, wanted: Container[str] | None = None) -> dict[str, memoryview]:
+        """Map tag names to payload views, optionally limited to ``wanted``.
+
+        Later duplicates of a tag win, as with a plain ``dict`` assignment.
+        """
+
+        view = self._view
+        size = len(view)
+        unpack_from = HEADER.unpack_from
+        names = _TAG_NAMES
+        result: dict[str, memoryview] = {}
+        offset = 0
+        while offset + HEADER_SIZE <= size:
+            code, length = unpack_from(view, offset)
+            start = offset + HEADER_SIZE
+            offset = start + length
+            name = names.get(code) or tag_name(code)
+            if wanted is not None and name not in wanted:
+                continue
+            result[name] = view[start:offset]
+        return result
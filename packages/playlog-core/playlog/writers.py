@@ -2,12 +2,37 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
-from collections.abc import Iterable, Sequence
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
 from datetime import date, datetime
+from functools import cache
+from math import isfinite
 from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple
 
-from .models import NightSession, PlayEvent, PlaylogConfig, SessionPaths, sanitize_path_component
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意依存
+    _HAS_ORJSON = False
+else:
+    _HAS_ORJSON = True
+
+from .models import (
+    EventLike,
+    EventSequence,
+    NightSession,
+    PlaylogConfig,
+    SessionPaths,
+    sanitize_path_component,
+)
 
 
 def _json_default(value: object) -> str:
@@ -18,40 +43,382 @@ def _json_default(value: object) -> str:
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
+_INDENT = "  "
+_CONTAINERS = (dict, list, tuple)
+
+
+@cache
+def _run_encoder(pad: str) -> Callable[[object], str]:
+    # エンコード済みの文字列に改行は現れないので、区切りに改行とインデントを入れても
+    # indent=2 と同じ並びになる（入れ子のコンテナは呼び出し側で別に扱う）
+    encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        default=_json_default,
+        separators=(",\n" + pad, ": "),
+    )
+    return encoder.encode
+
+
+def _dumps_indented(value: object, pad: str = "") -> str:
+    """Same text as ``json.dumps(value, ensure_ascii=False, indent=2, default=_json_default)``.
+
+    ``indent`` forces the pure-Python encoder; here each run of non-container
+    items is encoded in one ``JSONEncoder.encode`` call without ``indent``
+    (which uses the C encoder) and only nested containers recurse.
+    """
+
+    if not isinstance(value, _CONTAINERS):
+        return _run_encoder(pad)(value)
+    if not value:
+        return "{}" if isinstance(value, dict) else "[]"
+    inner = pad + _INDENT
+    separator = ",\n" + inner
+    encode = _run_encoder(inner)
+    parts: list[str] = []
+    if isinstance(value, dict):
+        pairs = list(value.items())
+        start = 0
+        for position, (key, item) in enumerate(pairs):
+            if isinstance(item, _CONTAINERS):
+                if position > start:
+                    parts.append(encode(dict(pairs[start:position]))[1:-1])
+                # キーの変換 (数値・None など) も json と同じにするため 1 要素の dict で書く
+                parts.append(encode({key: None})[1:-5] + _dumps_indented(item, inner))
+                start = position + 1
+        if start < len(pairs):
+            parts.append(encode(dict(pairs[start:]) if start else value)[1:-1])
+        return f"{{\n{inner}{separator.join(parts)}\n{pad}}}"
+
+    items: list[object] = []
+    for item in value:
+        if isinstance(item, _CONTAINERS):
+            if items:
+                parts.append(encode(items)[1:-1])
+                items = []
+            parts.append(_dumps_indented(item, inner))
+        else:
+            items.append(item)
+    if items:
+        parts.append(encode(items)[1:-1])
+    return f"[\n{inner}{separator.join(parts)}\n{pad}]"
+
+
+_EVENT_PAD = _INDENT * 2
+# ファイルへは 64 KiB 単位で書き出す
+_BUFFER_SIZE = 1 << 16
+# これを超える出力はメモリではなく一時ファイルに溜める
+_SPOOL_SIZE = 8 << 20
+MANIFEST_DIR = "outputs"
+MANIFEST_VERSION = 1
+_COMPACT_ENCODER = json.JSONEncoder(
+    ensure_ascii=False,
+    default=_json_default,
+    separators=(",", ":"),
+)
+
+
+def _dumps_compact(value: object) -> bytes:
+    """Compact JSON for machine consumers; uses orjson when it is installed."""
+
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # 64 bit を超える整数などは標準の json に任せる
+            pass
+    return _COMPACT_ENCODER.encode(value).encode()
+
+
+class OutputBuffer:
+    """Bytes bound for one output file, hashed as they are written.
+
+    Content is spooled (in memory up to ``_SPOOL_SIZE``) instead of going to
+    the target directly so an unchanged file is never touched. ``newline``
+    applies to ``write_text`` as it does to ``open``: ``None`` translates
+    ``"\n"`` to ``os.linesep`` and ``""`` writes text unchanged.
+    """
+
+    def __init__(self, newline: str | None = None) -> None:
+        self.hasher = hashlib.blake2b(digest_size=16)
+        self.spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+        self.pending = bytearray()
+        self.size = 0
+        newline = os.linesep if newline is None else newline
+        self.linesep = None if newline in {"", "\n"} else newline.encode()
+
+    def write(self, data: bytes) -> None:
+        self.pending += data
+        if len(self.pending) >= _BUFFER_SIZE:
+            self._drain()
+
+    def write_text(self, text: str) -> int:
+        self.write(self.encode_text(text))
+        return len(text)
+
+    def encode_text(self, text: str) -> bytes:
+        """UTF-8 bytes of ``text`` with newlines translated as ``write_text`` does."""
+
+        data = text.encode()
+        if self.linesep is not None:
+            data = data.replace(b"\n", self.linesep)
+        return data
+
+    def _drain(self) -> None:
+        if self.pending:
+            self.hasher.update(self.pending)
+            self.spool.write(self.pending)
+            self.size += len(self.pending)
+            self.pending.clear()
+
+    def digest(self) -> str:
+        self._drain()
+        return self.hasher.hexdigest()
+
+    def copy_to(self, path: Path) -> None:
+        """Write the content to ``path`` via a temp file and an atomic rename."""
+
+        self._drain()
+        self.spool.seek(0)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as fp:
+                shutil.copyfileobj(self.spool, fp, _BUFFER_SIZE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # 書きかけの一時ファイルを出力先に残さない
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def close(self) -> None:
+        self.spool.close()
+
+
+class _TextOutput:
+    """``write(str)`` adapter so ``csv.writer`` can feed an ``OutputBuffer``."""
+
+    def __init__(self, out: OutputBuffer) -> None:
+        self.write = out.write_text
+
+
+class OutputManifest:
+    """Digest, size and mtime of the files last rendered into one session directory.
+
+    Stored under ``<out_dir>/.playlog/outputs`` so checking for changes needs a
+    ``stat`` only; files edited or replaced outside PlayLog no longer match
+    their recorded size/mtime and are re-hashed instead.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, object]] = {}
+        self.dirty = False
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == MANIFEST_VERSION:
+            files = payload.get("files")
+            if isinstance(files, dict):
+                self.entries = files
+
+    @classmethod
+    def for_session(cls, config: PlaylogConfig, paths: SessionPaths) -> OutputManifest:
+        relative = paths.session_dir.relative_to(paths.root).as_posix()
+        key = hashlib.sha1(relative.encode("utf-8"), usedforsecurity=False).hexdigest()
+        return cls(config.state_dir / MANIFEST_DIR / f"{key}.json")
+
+    def matches(self, path: Path, digest: str, size: int) -> bool:
+        """Return True when ``path`` already holds content with ``digest``."""
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if stat.st_size != size:
+            return False
+        entry = self.entries.get(path.name)
+        if entry and entry.get("size") == size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry.get("digest") == digest
+        # 記録が無い・外部で触られたファイルは中身を読んで比べる
+        if _file_digest(path) != digest:
+            return False
+        self.record(path, digest)
+        return True
+
+    def record(self, path: Path, digest: str) -> None:
+        stat = path.stat()
+        self.entries[path.name] = {
+            "digest": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self.dirty = True
+
+    def commit(self, path: Path, out: OutputBuffer) -> bool:
+        """Move ``out`` into ``path`` unless it is unchanged; True if written."""
+
+        digest = out.digest()
+        if self.matches(path, digest, out.size):
+            return False
+        out.copy_to(path)
+        self.record(path, digest)
+        return True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "files": self.entries}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _file_digest(path: Path) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as fp:
+        while chunk := fp.read(_BUFFER_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class RenderedFile(NamedTuple):
+    path: Path
+    written: bool
+
+
+class Sink:
+    """One output being filled while ``render_per_night`` walks the events."""
+
+    # False の場合 played_at の整形を省略できる
+    uses_played_at = True
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __enter__(self) -> Sink:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        return None
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        """Consume the ``index``-th event (1-based); ``played_at`` is pre-formatted."""
+
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        """Write whatever follows the last event."""
+
+    def commit(self, manifest: OutputManifest) -> bool:
+        """Store the result; return False when the output was already up to date."""
+
+        raise NotImplementedError
+
+
+class FileSink(Sink):
+    """Sink whose content is buffered and then moved into ``path`` if it changed."""
+
+    def __init__(self, path: Path, newline: str | None = None) -> None:
+        super().__init__(path)
+        self.out = OutputBuffer(newline)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.out.close()
+
+    def commit(self, manifest: OutputManifest) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return manifest.commit(self.path, self.out)
+
+
+def session_paths(config: PlaylogConfig, session: NightSession) -> SessionPaths:
+    return SessionPaths(
+        root=config.out_dir,
+        app=session.app,
+        night_date=session.night_date,
+        session_id=sanitize_path_component(session.session_id),
+    )
+
+
 class Writer:
     """Base writer with shared helpers."""
 
+    format_name: str
+
     def __init__(self, config: PlaylogConfig) -> None:
         self.config = config
 
     def _paths_for(self, session: NightSession) -> SessionPaths:
-        safe_session = sanitize_path_component(session.session_id)
-        return SessionPaths(
-            root=self.config.out_dir,
-            app=session.app,
-            night_date=session.night_date,
-            session_id=safe_session,
-        )
+        return session_paths(self.config, session)
 
-    def write(self, session: NightSession, events: Sequence[PlayEvent]) -> Path:
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
         raise NotImplementedError
 
+    def write(self, session: NightSession, events: EventSequence) -> Path:
+        return _render(session, events, [self], self._paths_for(session))[0].path
+
 
 class JsonWriter(Writer):
+    format_name = "json"
     filename = "session.json"
 
-    def write(self, session: NightSession, events: Sequence[PlayEvent]) -> Path:
-        paths = self._paths_for(session)
-        paths.session_dir.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "session": session.model_dump(),
-            "events": [event.model_dump() for event in events],
-        }
-        paths.json_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2, default=_json_default),
-            encoding="utf-8",
-        )
-        return paths.json_path
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
+        return _JsonSink(paths.json_path, session, self.config.json_style == "compact")
+
+
+class _JsonSink(FileSink):
+    """Streams the session header and then one event at a time to the file."""
+
+    uses_played_at = False
+
+    def __init__(self, path: Path, session: NightSession, compact: bool) -> None:
+        # 整形出力は json.dumps の結果を write_text していた頃と同じ改行にする
+        super().__init__(path, newline="" if compact else None)
+        self.session = session
+        self.compact = compact
+        self.count = 0
+        if compact:
+            self.encode = _dumps_compact
+            self.open_events, self.separator, self.close_events = b"[", b",", b"]}"
+        else:
+            encode_text = self.out.encode_text
+            self.encode = lambda value: encode_text(_dumps_indented(value, _EVENT_PAD))
+            self.open_events = encode_text(f"[\n{_EVENT_PAD}")
+            self.separator = encode_text(f",\n{_EVENT_PAD}")
+            self.close_events = encode_text(f"\n{_INDENT}]\n}}")
+
+    def __enter__(self) -> Sink:
+        session = self.session.model_dump()
+        if self.compact:
+            self.out.write(b'{"session":' + _dumps_compact(session) + b',"events":')
+        else:
+            header = f'{{\n{_INDENT}"session": {_dumps_indented(session, _INDENT)},\n'
+            self.out.write_text(f'{header}{_INDENT}"events": ')
+        return self
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        self.out.write(self.separator if self.count else self.open_events)
+        self.out.write(self.encode(event.model_dump()))
+        self.count += 1
+
+    def finish(self) -> None:
+        if self.count:
+            self.out.write(self.close_events)
+        else:
+            self.out.write(b"[]}" if self.compact else self.out.encode_text("[]\n}"))
 
 
 TXT_TEMPLATE = (
@@ -69,11 +436,10 @@ TXT_TEMPLATE = (
 
 
 class TxtWriter(Writer):
+    format_name = "txt"
     filename = "session.txt"
 
-    def write(self, session: NightSession, events: Sequence[PlayEvent]) -> Path:
-        paths = self._paths_for(session)
-        paths.session_dir.mkdir(parents=True, exist_ok=True)
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
         header = TXT_TEMPLATE.format(
             app=f"{session.app} ({session.app_version or 'n/a'})",
             night_date=session.night_date.isoformat(),
@@ -82,21 +448,26 @@ class TxtWriter(Writer):
             session_id=session.session_id,
             session_start=_format_dt(session.session_start),
             session_end=_format_dt(session.session_end),
-            tracks=len(events),
+            tracks=tracks,
             timeline_mode=session.timeline_mode,
         )
-        body_lines = []
-        for idx, event in enumerate(events, start=1):
-            artist = event.artist or "Unknown Artist"
-            track_line = f"{idx}. [{_format_dt(event.played_at)}] {artist} - {event.title}"
-            meta_line = (
-                f"  (Album: {event.album or 'n/a'}, BPM: {event.bpm or 'n/a'}, "
-                f"Key: {event.key or 'n/a'}, DurationSec: {event.duration_sec})"
-            )
-            body_lines.append(track_line + meta_line)
-        content = header + "\n".join(body_lines)
-        paths.txt_path.write_text(content, encoding="utf-8")
-        return paths.txt_path
+        return _TxtSink(paths.txt_path, header)
+
+
+class _TxtSink(FileSink):
+    def __init__(self, path: Path, header: str) -> None:
+        super().__init__(path)
+        self.out.write_text(header)
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        artist = event.artist or "Unknown Artist"
+        # 行は改行で区切るだけで、最終行の後ろには付けない
+        separator = "" if index == 1 else "\n"
+        self.out.write_text(
+            f"{separator}{index}. [{played_at}] {artist} - {event.title}"
+            f"  (Album: {event.album or 'n/a'}, BPM: {event.bpm or 'n/a'}, "
+            f"Key: {event.key or 'n/a'}, DurationSec: {event.duration_sec})"
+        )
 
 
 def _format_dt(value: datetime | None) -> str:
@@ -106,6 +477,7 @@ def _format_dt(value: datetime | None) -> str:
 
 
 class CsvBatchWriter(Writer):
+    format_name = "csv"
     filename = "session.csv"
 
     header = [
@@ -122,38 +494,544 @@ class CsvBatchWriter(Writer):
         "source_track_id",
     ]
 
-    def write(self, session: NightSession, events: Sequence[PlayEvent]) -> Path:
-        paths = self._paths_for(session)
-        paths.session_dir.mkdir(parents=True, exist_ok=True)
-        with open(paths.csv_path, "w", newline="", encoding="utf-8") as fp:
-            writer = csv.writer(fp)
-            writer.writerow(self.header)
-            for idx, event in enumerate(events, start=1):
-                writer.writerow(
-                    [
-                        idx,
-                        _format_dt(event.played_at),
-                        event.title,
-                        event.artist,
-                        event.album,
-                        event.duration_sec,
-                        event.deck or "",
-                        event.bpm or "",
-                        event.key or "",
-                        event.source_path or "",
-                        event.source_track_id or "",
-                    ]
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
+        return _CsvSink(paths.csv_path, self.header)
+
+
+class _CsvSink(FileSink):
+    """Streams rows into the output buffer instead of collecting them."""
+
+    def __init__(self, path: Path, header: list[str]) -> None:
+        # csv.writer は自前で \r\n を書くので改行は変換しない
+        super().__init__(path, newline="")
+        self.writer = csv.writer(_TextOutput(self.out))
+        self.writer.writerow(header)
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        self.writer.writerow(
+            [
+                index,
+                played_at,
+                event.title,
+                event.artist,
+                event.album,
+                event.duration_sec,
+                event.deck or "",
+                event.bpm or "",
+                event.key or "",
+                event.source_path or "",
+                event.source_track_id or "",
+            ]
+        )
+
+
+ARCHIVE_DB_NAME = "playlog.db"
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    night_date TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    session_label TEXT,
+    app_version TEXT,
+    session_start TEXT,
+    session_end TEXT,
+    timeline_mode TEXT NOT NULL,
+    tracks INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    UNIQUE (app, night_date, session_id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    session INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    played_at TEXT,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    album TEXT NOT NULL,
+    duration_sec INTEGER NOT NULL,
+    deck TEXT,
+    bpm REAL,
+    key TEXT,
+    source_path TEXT,
+    source_track_id TEXT,
+    PRIMARY KEY (session, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_night_date ON sessions (night_date);
+CREATE INDEX IF NOT EXISTS sessions_app ON sessions (app, night_date);
+CREATE INDEX IF NOT EXISTS events_artist_title ON events (artist, title);
+CREATE INDEX IF NOT EXISTS events_source_track_id ON events (source_track_id);
+"""
+
+EventRecord = tuple[
+    int,
+    str | None,
+    str,
+    str,
+    str,
+    int,
+    str | None,
+    float | None,
+    str | None,
+    str | None,
+    str | None,
+]
+
+
+class ArchiveIndex:
+    """``playlog.db`` under ``out_dir``: every session and event across nights.
+
+    Used as a context manager: the whole run is one transaction, committed on
+    a clean exit and rolled back on an exception. Sessions are keyed by
+    ``(app, night_date, session_id)`` and replaced wholesale on re-render.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, config: PlaylogConfig) -> ArchiveIndex:
+        return cls(config.out_dir / ARCHIVE_DB_NAME)
+
+    def __enter__(self) -> ArchiveIndex:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 書き込みスレッドから呼ばれるので、接続の共有はロックで守る
+        self.connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(ARCHIVE_SCHEMA)
+        self.connection.execute("BEGIN")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.connection.close()
+
+    def replace_session(self, session: NightSession, events: list[EventRecord]) -> bool:
+        """Upsert ``session`` with ``events``; False if it was stored unchanged."""
+
+        digest = hashlib.blake2b(
+            repr((session.model_dump(), events)).encode(), digest_size=16
+        ).hexdigest()
+        key = (session.app, session.night_date.isoformat(), session.session_id)
+        with self._lock:
+            cursor = self.connection.cursor()
+            row = cursor.execute(
+                "SELECT id, digest FROM sessions"
+                " WHERE app = ? AND night_date = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row is not None and row[1] == digest:
+                return False
+            values = (
+                session.session_label,
+                session.app_version,
+                _isoformat(session.session_start),
+                _isoformat(session.session_end),
+                session.timeline_mode,
+                len(events),
+                digest,
+            )
+            if row is None:
+                cursor.execute(
+                    "INSERT INTO sessions (app, night_date, session_id, session_label,"
+                    " app_version, session_start, session_end, timeline_mode, tracks,"
+                    " digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + values,
                 )
-        return paths.csv_path
+                session_row = cursor.lastrowid
+            else:
+                session_row = row[0]
+                cursor.execute(
+                    "UPDATE sessions SET session_label = ?, app_version = ?,"
+                    " session_start = ?, session_end = ?, timeline_mode = ?, tracks = ?,"
+                    " digest = ? WHERE id = ?",
+                    (*values, session_row),
+                )
+                cursor.execute("DELETE FROM events WHERE session = ?", (session_row,))
+            cursor.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(session_row, *event) for event in events],
+            )
+        return True
 
 
-def render_per_night(
+def _isoformat(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+class SqliteWriter(Writer):
+    format_name = "sqlite"
+    filename = ARCHIVE_DB_NAME
+
+    def __init__(self, config: PlaylogConfig, index: ArchiveIndex) -> None:
+        super().__init__(config)
+        self.index = index
+
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
+        return _SqliteSink(self.index, session)
+
+
+class _SqliteSink(Sink):
+    """Collects event rows and hands them to the archive index in one batch."""
+
+    uses_played_at = False
+
+    def __init__(self, index: ArchiveIndex, session: NightSession) -> None:
+        super().__init__(index.path)
+        self.index = index
+        self.session = session
+        self.events: list[EventRecord] = []
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        self.events.append(
+            (
+                index,
+                _isoformat(event.played_at),
+                event.title,
+                event.artist,
+                event.album,
+                event.duration_sec,
+                event.deck,
+                event.bpm,
+                event.key,
+                event.source_path,
+                event.source_track_id,
+            )
+        )
+
+    def commit(self, manifest: OutputManifest) -> bool:
+        return self.index.replace_session(self.session, self.events)
+
+
+EVENT_LOG_DIR = "events"
+EVENT_LOG_VERSION = 1
+# 行は追記したら書き換えないので、orjson の有無で数値の書き方が変わらないよう
+# ログの行は常に標準の json で書く
+_EVENT_LOG_ENCODER = json.JSONEncoder(
+    ensure_ascii=False,
+    default=_json_default,
+    separators=(",", ":"),
+    allow_nan=False,
+)
+# 実行全体で 1 つの出力先を共有する形式
+SHARED_FORMATS = frozenset({"sqlite", "ndjson"})
+
+
+class _Partition:
+    """One month of the event log and its index.
+
+    The index (``<month>.index.json``) records the byte spans of every night,
+    how many events of each session are already in the file and the file
+    size it describes. Bytes past that size are leftovers of an interrupted
+    run and are cut off when the partition is opened.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = path.with_name(f"{path.stem}.index.json")
+        self.nights: dict[str, list[list[int]]] = {}
+        self.sessions: dict[str, int] = {}
+        self.dirty = False
+        size = -1
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = None
+        if isinstance(payload, dict) and payload.get("version") == EVENT_LOG_VERSION:
+            try:
+                self.nights = dict(payload["nights"])
+                self.sessions = dict(payload["sessions"])
+                size = int(payload["size"])
+            except (KeyError, TypeError, ValueError):
+                self.nights, self.sessions, size = {}, {}, -1
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fp = open(path, "ab")
+        actual = self.fp.tell()
+        if size < 0 or size > actual:
+            # 索引が無い・ファイルの方が短い場合は中身から作り直す
+            size = self._rebuild()
+        if actual > size:
+            self.fp.truncate(size)
+            self.dirty = True
+        self.size = size
+
+    def _rebuild(self) -> int:
+        self.nights, self.sessions = {}, {}
+        self.dirty = True
+        offset = 0
+        with self.path.open("rb") as fp:
+            for line in fp:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                    night = str(record["night_date"])
+                    key = _session_key(str(record["app"]), str(record["session_id"]))
+                    position = int(record["index"])
+                except (KeyError, TypeError, ValueError):
+                    break
+                self._record(night, key, position, offset, offset + len(line))
+                offset += len(line)
+        return offset
+
+    def _record(self, night: str, key: str, count: int, start: int, end: int) -> None:
+        spans = self.nights.setdefault(night, [])
+        if spans and spans[-1][1] == start:
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+        self.sessions[key] = max(count, self.sessions.get(key, 0))
+
+    def append(self, night: str, key: str, lines: list[tuple[int, bytes]]) -> bool:
+        done = self.sessions.get(key, 0)
+        data = b"".join(line for position, line in lines if position > done)
+        if not data:
+            return False
+        self.fp.write(data)
+        self._record(night, key, lines[-1][0], self.size, self.size + len(data))
+        self.size += len(data)
+        self.dirty = True
+        return True
+
+    def close(self) -> None:
+        self.fp.close()
+        if not self.dirty:
+            return
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "version": EVENT_LOG_VERSION,
+                    "size": self.size,
+                    "nights": self.nights,
+                    "sessions": self.sessions,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.index_path)
+
+
+def _session_key(app: str, session_id: str) -> str:
+    return f"{app}/{session_id}"
+
+
+def _event_log_line(record: dict[str, object]) -> bytes:
+    """One NDJSON line; NaN and infinities are written as ``null``."""
+
+    try:
+        text = _EVENT_LOG_ENCODER.encode(record)
+    except ValueError:
+        text = _EVENT_LOG_ENCODER.encode(_finite(record))
+    return text.encode() + b"\n"
+
+
+def _finite(value: object) -> object:
+    if isinstance(value, float):
+        return value if isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+class EventLog:
+    """Append-only NDJSON of every event, one file per month of night dates.
+
+    Lines are the event's JSON plus its 1-based ``index`` within the session
+    and are never rewritten: an ``(app, session_id, index)`` that is already
+    in the log is skipped, so re-runs only add events that are new (e.g. the
+    tail of a growing log). ``<out_dir>/events/YYYY-MM.index.json`` maps each
+    night to the byte spans holding its events.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._partitions: dict[str, _Partition] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, config: PlaylogConfig) -> EventLog:
+        return cls(config.out_dir / EVENT_LOG_DIR)
+
+    def __enter__(self) -> EventLog:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        # 例外時も書き終えたセッションは残す（書きかけの行は次に開くときに切り捨てる）
+        with self._lock:
+            partitions, self._partitions = self._partitions, {}
+        for partition in partitions.values():
+            partition.close()
+
+    def path_for(self, night_date: date) -> Path:
+        return self.directory / f"{night_date:%Y-%m}.ndjson"
+
+    def _partition(self, night_date: date) -> _Partition:
+        month = f"{night_date:%Y-%m}"
+        partition = self._partitions.get(month)
+        if partition is None:
+            partition = self._partitions[month] = _Partition(self.path_for(night_date))
+        return partition
+
+    def logged(self, session: NightSession) -> int:
+        """Number of events of ``session`` already in the log."""
+
+        with self._lock:
+            partition = self._partition(session.night_date)
+            return partition.sessions.get(_session_key(session.app, session.session_id), 0)
+
+    def append(self, session: NightSession, lines: list[tuple[int, bytes]]) -> bool:
+        """Append ``(index, line)`` pairs not yet logged; True if anything was added."""
+
+        if not lines:
+            return False
+        with self._lock:
+            partition = self._partition(session.night_date)
+            key = _session_key(session.app, session.session_id)
+            return partition.append(session.night_date.isoformat(), key, lines)
+
+
+class NdjsonWriter(Writer):
+    format_name = "ndjson"
+
+    def __init__(self, config: PlaylogConfig, log: EventLog) -> None:
+        super().__init__(config)
+        self.log = log
+
+    def sink(self, session: NightSession, paths: SessionPaths, tracks: int) -> Sink:
+        return _NdjsonSink(self.log, session)
+
+
+class _NdjsonSink(Sink):
+    uses_played_at = False
+
+    def __init__(self, log: EventLog, session: NightSession) -> None:
+        super().__init__(log.path_for(session.night_date))
+        self.log = log
+        self.session = session
+        self.logged = log.logged(session)
+        self.lines: list[tuple[int, bytes]] = []
+
+    def add(self, index: int, event: EventLike, played_at: str) -> None:
+        if index <= self.logged:
+            return
+        record = event.model_dump()
+        record["session_id"] = self.session.session_id
+        record["night_date"] = self.session.night_date
+        record["index"] = index
+        self.lines.append((index, _event_log_line(record)))
+
+    def commit(self, manifest: OutputManifest) -> bool:
+        return self.log.append(self.session, self.lines)
+
+
+class SharedOutputs:
+    """Outputs that collect every session of a run (``sqlite`` and ``ndjson``).
+
+    Entering opens the ``ArchiveIndex`` transaction and the ``EventLog`` for
+    the requested formats; both are safe to use from writer threads.
+    """
+
+    def __init__(self, config: PlaylogConfig, formats: Iterable[str] | None = None) -> None:
+        self.config = config
+        self.formats = set(formats or config.formats)
+        self.index: ArchiveIndex | None = None
+        self.event_log: EventLog | None = None
+
+    def __enter__(self) -> SharedOutputs:
+        with ExitStack() as stack:
+            if "sqlite" in self.formats:
+                self.index = stack.enter_context(ArchiveIndex.for_config(self.config))
+            if "ndjson" in self.formats:
+                self.event_log = stack.enter_context(EventLog.for_config(self.config))
+            self._stack = stack.pop_all()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.index = self.event_log = None
+        self._stack.__exit__(exc_type, exc, traceback)
+
+    def writers(self) -> list[Writer]:
+        writers: list[Writer] = []
+        if self.index is not None:
+            writers.append(SqliteWriter(self.config, self.index))
+        if self.event_log is not None:
+            writers.append(NdjsonWriter(self.config, self.event_log))
+        return writers
+
+
+def _render(
+    session: NightSession,
+    events: EventSequence,
+    writers: list[Writer],
+    paths: SessionPaths,
+) -> list[RenderedFile]:
+    """Feed ``events`` once through the sinks of all ``writers``.
+
+    Each file is replaced only when its content changed; ``written`` tells
+    which ones were.
+    """
+
+    with ExitStack() as stack:
+        sinks = [
+            stack.enter_context(writer.sink(session, paths, len(events))) for writer in writers
+        ]
+        if any(sink.uses_played_at for sink in sinks):
+            for index, event in enumerate(events, start=1):
+                played_at = _format_dt(event.played_at)
+                for sink in sinks:
+                    sink.add(index, event, played_at)
+        else:
+            for index, event in enumerate(events, start=1):
+                for sink in sinks:
+                    sink.add(index, event, "")
+
+        manifest = OutputManifest.for_session(writers[0].config, paths)
+        rendered = []
+        for sink in sinks:
+            sink.finish()
+            rendered.append(RenderedFile(sink.path, sink.commit(manifest)))
+        manifest.save()
+        return rendered
+
+
+def render_session(
     session: NightSession,
-    events: Sequence[PlayEvent],
+    events: EventSequence,
     config: PlaylogConfig,
     formats: Iterable[str] | None = None,
-) -> list[Path]:
-    """Render selected formats for a session."""
+    shared: SharedOutputs | None = None,
+) -> list[RenderedFile]:
+    """Render selected formats for a session in a single pass over its events.
+
+    Outputs whose content is unchanged are left untouched (``written`` is
+    False); the others are replaced atomically. ``sqlite`` and ``ndjson``
+    go through ``shared`` when given, otherwise through ``SharedOutputs``
+    opened for this session alone.
+    """
 
     requested = set(formats or config.formats)
     writers: list[Writer] = []
@@ -164,7 +1042,24 @@ def render_per_night(
     if "csv" in requested:
         writers.append(CsvBatchWriter(config))
 
-    outputs: list[Path] = []
-    for writer in writers:
-        outputs.append(writer.write(session, events))
-    return outputs
+    with ExitStack() as stack:
+        if shared is None and requested & SHARED_FORMATS:
+            shared = stack.enter_context(SharedOutputs(config, requested))
+        if shared is not None:
+            writers += [
+                writer for writer in shared.writers() if writer.format_name in requested
+            ]
+        if not writers:
+            return []
+        return _render(session, events, writers, writers[0]._paths_for(session))
+
+
+def render_per_night(
+    session: NightSession,
+    events: EventSequence,
+    config: PlaylogConfig,
+    formats: Iterable[str] | None = None,
+) -> list[Path]:
+    """Like ``render_session`` but return only the output paths."""
+
+    return [rendered.path for rendered in render_session(session, events, config, formats)]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import plistlib
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+from playlog import NightSession, PlaylogConfig, build_events
+from playlog.cache import CACHE_DIRNAME, ParseCache, iter_cached_sessions
+from playlog.extractors import serato
+from playlog.sessions import SessionEvents
+
+FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures" / "serato" / "_Serato_"
+
+
+def _build(path: Path, title: str) -> SessionEvents:
+    session = NightSession(app="djay", session_id=path.stem, night_date=date(2025, 5, 2))
+    events = build_events(
+        [
+            {
+                "app": "djay",
+                "session_id": path.stem,
+                "played_at": datetime(2025, 5, 2, 23, tzinfo=timezone.utc),
+                "title": title,
+                "raw": {"Title": title},
+            }
+        ],
+        trusted=True,
+    )
+    return session, events
+
+
+def _sources(tmp_path: Path, count: int) -> list[Path]:
+    paths = []
+    for number in range(count):
+        path = tmp_path / "sources" / f"set-{number}.plist"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"track {number}")
+        paths.append(path)
+    return paths
+
+
+def _run(config: PlaylogConfig, paths: list[Path], parsed: list[Path]) -> list[SessionEvents]:
+    def parse(batch: Sequence[Path]) -> list[str]:
+        parsed.extend(batch)
+        return [path.read_text() for path in batch]
+
+    return list(iter_cached_sessions("test", paths, parse, _build, config))
+
+
+def test_unchanged_files_load_from_cache(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path)
+    paths = _sources(tmp_path, 3)
+    parsed: list[Path] = []
+    first = _run(config, paths, parsed)
+    assert parsed == paths
+
+    paths[1].write_text("edited track")
+    parsed.clear()
+    second = _run(config, paths, parsed)
+    assert parsed == [paths[1]]
+    assert [events[0].title for _, events in second] == ["track 0", "edited track", "track 2"]
+    assert second[0][0] == first[0][0]
+    assert [event.model_dump() for event in second[2][1]] == [
+        event.model_dump() for event in first[2][1]
+    ]
+
+    # 設定が変わると別のエントリになり、--no-cache では一切使わない
+    parsed.clear()
+    _run(PlaylogConfig(out_dir=tmp_path, timezone="Asia/Tokyo"), paths, parsed)
+    assert parsed == paths
+    parsed.clear()
+    _run(PlaylogConfig(out_dir=tmp_path, parse_cache=False), paths, parsed)
+    assert parsed == paths
+
+
+def test_corrupt_entries_are_reparsed(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path)
+    paths = _sources(tmp_path, 2)
+    _run(config, paths, [])
+    for entry in (config.state_dir / CACHE_DIRNAME).iterdir():
+        entry.write_bytes(b"not a cache entry")
+
+    parsed: list[Path] = []
+    sessions = _run(config, paths, parsed)
+    assert parsed == paths
+    assert [events[0].title for _, events in sessions] == ["track 0", "track 1"]
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path)
+    paths = _sources(tmp_path, 6)
+    cache = ParseCache(config.state_dir / CACHE_DIRNAME, config, max_bytes=1 << 20)
+    entries = [cache.entry_for("test", path) for path in paths]
+    for number, (path, entry) in enumerate(zip(paths, entries, strict=True)):
+        cache.store(entry, [_build(path, path.read_text())])
+        os.utime(entry, ns=(number * 10**9, number * 10**9))
+    # 読んだエントリは最近使ったものとして残る
+    assert cache.load(entries[0]) is not None
+
+    cache.max_bytes = sum(entry.stat().st_size for entry in entries[:2])
+    cache.evict()
+    assert [entry.exists() for entry in entries] == [True, False, False, False, False, True]
+
+
+@pytest.mark.parametrize("mode", ["crate", "logs"])
+def test_serato_sessions_match_cached_run(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mode: str,
+) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC", raw_retention="lazy")
+    expected = serato.extract(config, root=FIXTURES, mode=mode)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("cached source was parsed again")
+
+    monkeypatch.setattr(serato, "_parse_crate", fail)
+    monkeypatch.setattr(serato, "_load_log_rows", fail)
+    cached = serato.extract(config, root=FIXTURES, mode=mode)
+    assert [session for session, _ in cached] == [session for session, _ in expected]
+    assert [[event.model_dump() for event in events] for _, events in cached] == [
+        [event.model_dump() for event in events] for _, events in expected
+    ]
+
+
+def test_entries_are_json_and_round_trip_raw_values(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path)
+    cache = ParseCache(config.state_dir / CACHE_DIRNAME, config, max_bytes=1 << 20)
+    tokyo = ZoneInfo("Asia/Tokyo")
+    new_york = ZoneInfo("America/New_York")
+    raw = {
+        "Start Time": datetime(2025, 5, 2, 1, 15),
+        "Day": date(2025, 5, 2),
+        "Artwork": b"\x00\xff",
+        "Ref": plistlib.UID(7),
+        "Flags": [True, None, 1.5, {"$date": "not a date"}],
+        "$date": "2025-05-02",
+    }
+    session = NightSession(
+        app="djay",
+        session_id="set",
+        night_date=date(2025, 5, 1),
+        session_start=datetime(2025, 5, 2, 1, tzinfo=tokyo),
+    )
+    events = build_events(
+        [
+            {
+                "app": "djay",
+                "title": "Loft Intro",
+                "played_at": datetime(2025, 11, 2, 1, 30, fold=1, tzinfo=new_york),
+                "raw": raw,
+            },
+            {
+                "app": "djay",
+                "title": "After Dark",
+                "played_at": datetime(2025, 5, 2, 1, tzinfo=timezone(timedelta(hours=9))),
+                "raw": {"nested": {"$bytes": "AP8="}},
+            },
+        ]
+    )
+    entry = cache.entry_for("test", _sources(tmp_path, 1)[0])
+    cache.store(entry, [(session, events)])
+
+    summary, body = entry.read_bytes().split(b"\n")
+    nights = [{"$date": "2025-05-01"}, {"$date": "2025-11-01"}]
+    assert json.loads(summary) == [nights, [1, 1]]
+    assert cache.summary(entry) == ((date(2025, 5, 1), date(2025, 11, 1)), (1, 1))
+    json.loads(body)
+    [(loaded_session, loaded)] = cache.load(entry) or []
+    assert loaded_session == session
+    assert [event.raw for event in loaded] == [raw, {"nested": {"$bytes": "AP8="}}]
+    assert [event.played_at for event in loaded] == [event.played_at for event in events]
+    assert loaded[0].played_at.tzinfo is new_york and loaded[0].played_at.fold == 1
+    assert loaded[1].played_at.utcoffset() == timedelta(hours=9)
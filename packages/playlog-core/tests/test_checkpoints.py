@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from playlog.checkpoints import CheckpointStore, LogCheckpoint, tail_digest
+
+
+def _checkpoint(log_path: Path) -> LogCheckpoint:
+    stat = log_path.stat()
+    return LogCheckpoint(
+        inode=stat.st_ino,
+        size=stat.st_size,
+        offset=stat.st_size,
+        tail_digest=tail_digest(log_path, stat.st_size),
+        timezone="UTC",
+        current_date=date(2025, 5, 3),
+        last_played_at=datetime(2025, 5, 3, 23, 0, tzinfo=timezone.utc),
+        rows=[("2025-05-03T23:00:00", "23:00:00  Deck 1  A - B")],
+    )
+
+
+def test_store_round_trips_checkpoint(tmp_path: Path) -> None:
+    log_path = tmp_path / "session.log"
+    log_path.write_text("23:00:00  Deck 1  A - B\n", encoding="utf-8")
+    store = CheckpointStore(tmp_path / "state")
+    checkpoint = _checkpoint(log_path)
+
+    store.save(log_path, checkpoint)
+
+    assert store.load(log_path) == checkpoint
+    assert store.load(tmp_path / "other.log") is None
+
+
+def test_checkpoint_is_resumable_only_for_appended_file(tmp_path: Path) -> None:
+    log_path = tmp_path / "session.log"
+    log_path.write_text("23:00:00  Deck 1  A - B\n", encoding="utf-8")
+    checkpoint = _checkpoint(log_path)
+
+    with log_path.open("a", encoding="utf-8") as fp:
+        fp.write("23:05:00  Deck 2  C - D\n")
+    assert checkpoint.is_resumable(log_path, log_path.stat(), "UTC")
+    assert not checkpoint.is_resumable(log_path, log_path.stat(), "Asia/Tokyo")
+
+    log_path.write_text("23:00:00  Deck 1  X - Y\n23:05:00  Deck 2  C - D\n", encoding="utf-8")
+    assert not checkpoint.is_resumable(log_path, log_path.stat(), "UTC")
+
+
+def test_save_appends_rows_of_resumed_checkpoint(tmp_path: Path) -> None:
+    log_path = tmp_path / "session.log"
+    log_path.write_text("23:00:00  Deck 1  A - B\n", encoding="utf-8")
+    store = CheckpointStore(tmp_path / "state")
+    store.save(log_path, _checkpoint(log_path))
+    previous = store.load(log_path)
+    assert previous is not None
+    [rows_path] = (tmp_path / "state").glob("*.rows")
+    first = rows_path.read_bytes()
+    # 前回の保存が行の追記後に中断した残骸は切り捨てる
+    with rows_path.open("ab") as fp:
+        fp.write(b'["2025-05-03T23:01:00", "partial')
+
+    with log_path.open("a", encoding="utf-8") as fp:
+        fp.write("23:05:00  Deck 2  C - D\n")
+    grown = replace(
+        _checkpoint(log_path),
+        rows=[*previous.rows, ("2025-05-03T23:05:00", "23:05:00  Deck 2  C - D")],
+    )
+    store.save(log_path, grown, previous=previous)
+
+    assert rows_path.read_bytes().startswith(first)
+    assert rows_path.read_bytes().count(b"\n") == 2
+    assert store.load(log_path) == grown
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+from playlog import PlaylogConfig
+from playlog.discovery import NightWindow, list_sources
+from playlog.extractors import djay, serato
+
+FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures"
+SERATO_ROOT = FIXTURES / "serato" / "_Serato_"
+
+
+def test_list_sources_matches_glob_order(tmp_path: Path) -> None:
+    for name in ["b.log", "a.txt", "c.log", ".hidden.log", "notes.md"]:
+        (tmp_path / name).write_text("x")
+    (tmp_path / "dir.log").mkdir()
+
+    sources = list_sources("serato-log", tmp_path, [".log", ".txt"])
+
+    expected = [
+        path
+        for suffix in (".log", ".txt")
+        for path in sorted(tmp_path.glob(f"*{suffix}"))
+        if path.is_file()
+    ]
+    assert [source.path for source in sources] == expected
+    assert [path.name for path in expected] == [".hidden.log", "b.log", "c.log", "a.txt"]
+    assert all(source.stat.st_size == 1 for source in sources)
+    assert list_sources("serato-log", tmp_path / "missing", [".log"]) == []
+
+
+def test_serato_scan_counts_without_parsing(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+
+    crates = serato.scan(config, root=SERATO_ROOT)
+    logs = serato.scan(config, root=SERATO_ROOT, mode="logs")
+
+    assert crates.mode == "crate"
+    assert crates.nights == [date(2025, 5, 1), date(2025, 5, 5)]
+    assert crates.details()["tracks"] == 4
+    assert crates.details()["cached"] == 0
+    assert logs.mode == "logs"
+    assert logs.details()["files"] == 1
+    assert logs.details()["tracks"] == 3
+
+
+def test_scan_uses_parse_cache_summaries(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    before = djay.scan(config, [FIXTURES / "djay"])
+    assert before.details()["uncounted"] == before.details()["files"] == 2
+
+    sessions = djay.extract(config, [FIXTURES / "djay"])
+    after = djay.scan(config, [FIXTURES / "djay"])
+
+    details = after.details()
+    assert details["cached"] == 2
+    assert details["uncounted"] == 0
+    assert details["tracks"] == sum(len(events) for _, events in sessions)
+    assert after.nights == sorted({session.night_date for session, _ in sessions})
+
+
+def _write_log_past_cutoff(root: Path) -> None:
+    log_path = root / "Logs" / "2025-05-03@Loft.log"
+    log_path.parent.mkdir(parents=True)
+    log_path.write_text(
+        "Session Start @ 2025-05-03 22:45:00\n"
+        "23:00:00  Deck 1  Artist One - Opening Track\n"
+        "02:00:00  Deck 2  Artist Two - Peak Time\n"
+        "09:00:00  Deck 1  Artist Three - Morning\n",
+        encoding="utf-8",
+    )
+
+
+def test_cached_scan_reports_nights_after_segmentation(tmp_path: Path) -> None:
+    root = tmp_path / "_Serato_"
+    _write_log_past_cutoff(root)
+    config = PlaylogConfig(out_dir=tmp_path / "out", timezone="UTC")
+
+    sessions = serato.extract(config, root=root, mode="logs")
+    scan = serato.scan(config, root=root, mode="logs")
+
+    assert scan.details()["cached"] == 1
+    assert scan.nights == sorted({session.night_date for session, _ in sessions})
+    assert scan.nights == [date(2025, 5, 3), date(2025, 5, 4)]
+
+
+def test_scan_counts_only_tracks_of_nights_in_window(tmp_path: Path) -> None:
+    root = tmp_path / "_Serato_"
+    _write_log_past_cutoff(root)
+    config = PlaylogConfig(out_dir=tmp_path / "out", timezone="UTC", since=date(2025, 5, 4))
+
+    uncached = serato.scan(config, root=SERATO_ROOT, mode="logs").details()
+    assert (uncached["files"], uncached["nights"], uncached["tracks"]) == (1, 0, 0)
+    assert uncached["uncounted"] == 0
+
+    serato.extract(config.model_copy(update={"since": None}), root=root, mode="logs")
+    cached = serato.scan(config, root=root, mode="logs")
+    assert cached.details()["cached"] == 1
+    assert cached.nights == [date(2025, 5, 4)]
+    assert cached.details()["tracks"] == 1
+    until = config.model_copy(update={"since": None, "until": date(2025, 5, 3)})
+    assert serato.scan(until, root=root, mode="logs").details()["tracks"] == 2
+
+
+def _touch(path: Path, when: datetime) -> None:
+    path.write_text("x")
+    os.utime(path, (when.timestamp(), when.timestamp()))
+
+
+def test_night_window_uses_name_and_mtime_bounds(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, since=date(2025, 5, 3), until=date(2025, 5, 4))
+    window = NightWindow.for_config(config)
+    assert window is not None
+    _touch(tmp_path / "old.log", datetime(2025, 5, 2, 6, tzinfo=timezone.utc))
+    _touch(tmp_path / "recent.log", datetime(2025, 6, 1, tzinfo=timezone.utc))
+    [old, recent] = list_sources("serato-log", tmp_path, [".log"])
+
+    # 最後の書き込みが 5/1 の夜なので、中身を見なくても範囲外
+    assert not window.may_contain(old, None)
+    assert window.may_contain(recent, None)
+    # 名前の日付から前後 1 日までの夜しか含まない
+    assert not window.may_contain(recent, date(2025, 5, 1))
+    assert window.may_contain(recent, date(2025, 5, 2))
+    assert window.may_contain(recent, date(2025, 5, 5))
+    assert not window.may_contain(recent, date(2025, 5, 6))
+    assert NightWindow.for_config(PlaylogConfig(out_dir=tmp_path)) is None
+
+
+def test_since_skips_crates_before_opening(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[str] = []
+    parse_crate = serato._parse_crate
+
+    def recording_parse(crate_path: Path, *args: object, **kwargs: object) -> object:
+        opened.append(crate_path.name)
+        return parse_crate(crate_path, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(serato, "_parse_crate", recording_parse)
+    config = PlaylogConfig(
+        out_dir=tmp_path / "out",
+        timeline_estimate=True,
+        parse_cache=False,
+        since=date(2025, 5, 4),
+    )
+
+    sessions = serato.extract(config, root=SERATO_ROOT, mode="auto")
+
+    assert opened == ["History-2025-05-05-Estimate.crate"]
+    assert [session.session_id for session, _ in sessions] == ["History-2025-05-05-Estimate"]
+
+
+def test_until_filters_sessions_of_borderline_files(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timeline_estimate=True, until=date(2025, 5, 1))
+    sessions = serato.extract(config, root=SERATO_ROOT, mode="crate")
+    assert [session.night_date for session, _ in sessions] == [date(2025, 5, 1)]
+
+    # crate を全て飛ばしても auto は logs に切り替えない
+    config = config.model_copy(update={"until": date(2025, 4, 1)})
+    assert serato.extract(config, root=SERATO_ROOT, mode="auto") == []
+    assert serato.scan(config, root=SERATO_ROOT).details()["files"] == 0
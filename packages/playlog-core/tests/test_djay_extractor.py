@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import plistlib
+from datetime import datetime, timezone
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
+import pytest
 from playlog import PlaylogConfig
 from playlog.extractors import djay
 
@@ -42,3 +46,90 @@ def test_load_session_handles_missing_fields(tmp_path: Path) -> None:
     assert events[0].played_at is not None
     assert events[1].played_at is None
     assert events[0].title == "Late Groove"
+
+
+def test_load_session_respects_raw_retention(tmp_path: Path) -> None:
+    plist = FIXTURES / "20251112_ClubNight.plist"
+
+    _, full = djay.load_session(plist, PlaylogConfig(out_dir=tmp_path, raw_retention="full"))
+    _, lazy = djay.load_session(plist, PlaylogConfig(out_dir=tmp_path, raw_retention="lazy"))
+    _, none = djay.load_session(plist, PlaylogConfig(out_dir=tmp_path, raw_retention="none"))
+
+    assert isinstance(full[0].raw, dict)
+    assert lazy[0].model_dump()["raw"] == full[0].raw
+    assert none[0].raw is None
+
+
+def test_parallel_jobs_match_sequential_output(tmp_path: Path) -> None:
+    sets = tmp_path / "Sets"
+    sets.mkdir()
+    for copy in range(2):
+        for plist in FIXTURES.glob("*.plist"):
+            (sets / f"{copy}-{plist.name}").write_bytes(plist.read_bytes())
+
+    def dump(jobs: int) -> list[object]:
+        config = PlaylogConfig(out_dir=tmp_path, jobs=jobs)
+        return [
+            (session.model_dump(), [event.model_dump() for event in events])
+            for session, events in djay.iter_sessions(config, [sets])
+        ]
+
+    assert dump(2) == dump(1)
+
+
+def test_binary_and_xml_plists_load_identically(tmp_path: Path) -> None:
+    source = FIXTURES / "20251112_ClubNight.plist"
+    binary = tmp_path / source.name
+    binary.write_bytes(
+        plistlib.dumps(plistlib.loads(source.read_bytes()), fmt=plistlib.FMT_BINARY)
+    )
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+
+    xml_session, xml_events = djay.load_session(source, config)
+    bin_session, bin_events = djay.load_session(binary, config)
+    assert bin_session == xml_session
+    assert bin_events == xml_events
+
+
+@pytest.mark.parametrize("fmt", [plistlib.FMT_BINARY, plistlib.FMT_XML])
+def test_single_track_root_keeps_set_metadata(
+    tmp_path: Path, fmt: plistlib.PlistFormat
+) -> None:
+    plist = tmp_path / "Encore.plist"
+    plist.write_bytes(
+        plistlib.dumps(
+            {
+                "Title": "Encore Song",
+                "Artist": "DJ Late",
+                "Start Time": datetime(2025, 11, 13, 3, 30),
+                "Software Version": "5.2",
+            },
+            fmt=fmt,
+        )
+    )
+
+    session, events = djay.load_session(plist, PlaylogConfig(out_dir=tmp_path, timezone="UTC"))
+
+    assert session.session_id == "Encore Song"
+    assert session.app_version == "5.2"
+    assert session.session_start == datetime(2025, 11, 13, 3, 30, tzinfo=timezone.utc)
+    assert [event.title for event in events] == ["Encore Song"]
+
+
+def test_shape_resolver_matches_full_probing() -> None:
+    tz = ZoneInfo("UTC")
+    tracks = [
+        {"Title": "A", "Artist": "X", "Start Time": "2025/11/12 22:00", "Duration": 200},
+        {"Title": "B", "Artist": "Y", "Start Time": "2025/11/12 22:04", "Duration": 180},
+        {"Name": "C", "Song Artist": "Z", "Played At": "2025-11-12T22:08:00Z", "BPM": "124"},
+        {"Title": "", "Name": "D", "Artist": "W", "Start Time": "2025/11/12 22:12:30"},
+    ]
+    resolver = djay.TrackShapeResolver()
+
+    resolved = [djay._build_event_payload(track, tz, resolver=resolver) for track in tracks]
+    probed = [djay._build_event_payload(track, tz) for track in tracks]
+
+    assert resolved == probed
+    assert [payload.title for payload in resolved] == ["A", "B", "C", "D"]
+    assert resolver.shape_for(tracks[1]) is resolver.shape_for(tracks[0])
+    assert resolver.timestamps.order[0] == "%Y/%m/%d %H:%M:%S"
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from playlog.linescan import iter_candidate_lines, iter_lines_containing, mapped_file
+
+PREFILTER = re.compile(rb"\d\d:\d\d:\d\d\s+Deck\s")
+
+
+def test_candidate_lines_yield_each_matching_line_once() -> None:
+    buffer = b"noise\n01:00:00 Deck 1 A - B 02:00:00 Deck 2 dup\nnoise\n03:00:00 Deck 1 C"
+    lines = list(iter_candidate_lines(buffer, PREFILTER))
+    assert lines == [
+        b"01:00:00 Deck 1 A - B 02:00:00 Deck 2 dup",
+        b"03:00:00 Deck 1 C",
+    ]
+
+
+def test_candidate_lines_respect_bounds() -> None:
+    buffer = b"01:00:00 Deck 1 A\n02:00:00 Deck 2 B\n03:00:00 Deck 1 C\n"
+    start = buffer.index(b"02:")
+    end = buffer.index(b"03:")
+    assert list(iter_candidate_lines(buffer, PREFILTER, start, end)) == [b"02:00:00 Deck 2 B"]
+
+
+def test_mapped_file_handles_empty_and_marker_lines(tmp_path: Path) -> None:
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+    with mapped_file(empty) as buffer:
+        assert list(iter_candidate_lines(buffer, PREFILTER)) == []
+
+    log = tmp_path / "session.log"
+    log.write_bytes(b"x\nSession Start @ 2025-05-03 22:00:00\ny\n")
+    with mapped_file(log) as buffer:
+        assert list(iter_lines_containing(buffer, b"Session Start @")) == [
+            b"Session Start @ 2025-05-03 22:00:00"
+        ]
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, time, timedelta, timezone
 from pathlib import Path
 
 import pytest
 from playlog import (
+    EventBatch,
     NightSession,
     PlayEvent,
     PlaylogConfig,
+    RawMappingView,
+    TimestampParser,
+    build_play_events,
     floor_by_cutoff,
+    floor_by_cutoff_batch,
     get_timezone,
     sanitize_path_component,
 )
+from playlog.models import played_at_range
 from pydantic import ValidationError
 
 FIXTURE = Path(__file__).parents[3] / "assets" / "fixtures" / "sample_play_events.json"
@@ -61,3 +67,177 @@ def test_playlog_config_normalizes_serato_mode(tmp_path: Path) -> None:
 def test_playlog_config_rejects_invalid_serato_mode(tmp_path: Path) -> None:
     with pytest.raises(ValidationError):
         PlaylogConfig(out_dir=tmp_path, serato_mode="invalid-mode")
+
+
+def test_play_event_keeps_lazy_raw_until_dump() -> None:
+    source = {"Title": "Song A", "BPM": 124}
+    view = RawMappingView(source)
+    event = PlayEvent(app="djay", title="Song A", raw=view)
+
+    assert event.raw is view
+    assert event.model_dump()["raw"] == source
+    assert json.loads(event.model_dump_json())["raw"] == source
+
+
+def test_playlog_config_rejects_unknown_raw_retention(tmp_path: Path) -> None:
+    with pytest.raises(ValidationError):
+        PlaylogConfig(out_dir=tmp_path, raw_retention="partial")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "2025-05-02T01:15:00+09:00",
+        "2025-05-02T01:15:00+0000",
+        "2025-05-02T01:15:00+09",
+        "2025-05-02T01:15:00-0930",
+        "2025-05-02T01:15:00Z",
+        "2025-05-02T01:15:00+09:0",
+        "2025-05-02 01:15:00",
+        "2025/05/02 01:15:00",
+        "2025/5/2 1:15:00",
+        "2025-05-02 01:15",
+        "2025-05-02 01:15+09",
+        "2025/05/02 01:15+09",
+        "2025-05-02T01:15:00.5+00:00",
+        "not a timestamp",
+    ],
+)
+def test_timestamp_parser_matches_strptime(text: str) -> None:
+    formats = ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S")
+    tz = get_timezone("Asia/Tokyo")
+    expected = None
+    for fmt in formats:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        expected = parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+        break
+
+    parser = TimestampParser(formats)
+    assert parser.parse(text, tz) == expected
+    assert parser.parse(text, tz) == expected
+
+
+@pytest.mark.parametrize("text", ["2025-05-02 0115Z", "2025-05-02 01:15-03"])
+def test_timestamp_parser_rejects_offsets_in_naive_layouts(text: str) -> None:
+    parser = TimestampParser(("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"))
+    assert parser.parse(text) is None
+
+
+def test_timestamp_parser_tries_last_successful_format_first() -> None:
+    parser = TimestampParser(("%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S"))
+    assert parser.parse("2025/05/02 01:15:00") == datetime(2025, 5, 2, 1, 15)
+    assert parser.order[0] == "%Y/%m/%d %H:%M:%S"
+    assert parser.parse("2025-05-02 01:15:00") == datetime(2025, 5, 2, 1, 15)
+    assert parser.order[0] == "%Y-%m-%d %H:%M:%S"
+
+
+def _record(index: int, **overrides: object) -> dict[str, object]:
+    record: dict[str, object] = {
+        "app": "serato",
+        "session_id": "History-2025-05-01",
+        "played_at": datetime(2025, 5, 2, 1, index, tzinfo=timezone.utc),
+        "title": f"Track {index}",
+        "artist": "DJ",
+        "duration_sec": 180,
+        "bpm": 124.0,
+        "raw": {"ttxt": f"Track {index}"},
+    }
+    record.update(overrides)
+    return record
+
+
+def test_trusted_batch_matches_validated_events() -> None:
+    records = [_record(index) for index in range(3)]
+    records.append(_record(3, played_at=datetime(2025, 5, 2, 1, 3)))
+
+    trusted = build_play_events([dict(record) for record in records], trusted=True)
+    validated = [PlayEvent(**record) for record in records]
+
+    assert trusted == validated
+    assert [event.model_dump() for event in trusted] == [
+        event.model_dump() for event in validated
+    ]
+    assert trusted[3].played_at is not None and trusted[3].played_at.tzinfo is not None
+    # 設定済みフィールドの set はイベント間で共有しない
+    assert [event.model_fields_set for event in trusted] == [
+        event.model_fields_set for event in validated
+    ]
+    assert [event.model_dump(exclude_unset=True) for event in trusted] == [
+        event.model_dump(exclude_unset=True) for event in validated
+    ]
+    trusted[0].model_fields_set.clear()
+    assert trusted[1].model_fields_set == set(records[1])
+
+
+def test_trusted_batch_falls_back_to_validation() -> None:
+    padded = build_play_events([_record(0), _record(1, artist=" DJ ")], trusted=True)
+    assert padded[1].artist == "DJ"
+
+    with pytest.raises(ValidationError):
+        build_play_events([_record(0), _record(1, duration_sec=-5)], trusted=True)
+    with pytest.raises(ValidationError):
+        build_play_events([_record(0, title="")], trusted=True)
+
+
+def test_event_batch_rows_match_play_events() -> None:
+    tz = get_timezone("America/New_York")
+    records = [
+        _record(0, played_at=datetime(2025, 11, 2, 1, 30, fold=1, tzinfo=tz)),
+        _record(1, played_at=None, bpm=None, deck="A"),
+        _record(2, app="djay", played_at=datetime(2025, 11, 2, 1, 30, tzinfo=tz)),
+    ]
+    validated = [PlayEvent(**record) for record in records]
+
+    for batch in (
+        EventBatch.from_records(records, trusted=True),
+        EventBatch.from_events(validated),
+    ):
+        assert len(batch) == 3
+        assert [row.model_dump() for row in batch] == [
+            event.model_dump() for event in validated
+        ]
+        assert batch.to_events() == validated
+        assert batch[-1].title == "Track 2"
+        assert batch[0].played_at is not None and batch[0].played_at.fold == 1
+
+
+def test_event_batch_played_at_range_compares_instants() -> None:
+    tz = get_timezone("America/New_York")
+    later = datetime(2025, 11, 2, 1, 30, fold=1, tzinfo=tz)
+    earlier = datetime(2025, 11, 2, 1, 30, tzinfo=tz)
+    batch = EventBatch.from_records(
+        [_record(0, played_at=later), _record(1, played_at=None), _record(2, played_at=earlier)],
+        trusted=True,
+    )
+
+    start, end = batch.played_at_range()
+    assert start is not None and start.fold == 0
+    assert end is not None and end.fold == 1
+    assert played_at_range(batch) == played_at_range(batch.to_events()) == (start, end)
+    assert EventBatch.from_records([_record(0, played_at=None)]).played_at_range() == (None, None)
+    assert played_at_range([]) == (None, None)
+
+
+@pytest.mark.parametrize(
+    ("tz_name", "cutoff"),
+    [
+        ("Asia/Tokyo", time(8, 0)),
+        ("America/New_York", time(8, 0)),
+        # 夏時間の重複 (01:30) と欠落 (02:30) に落ちるカットオフ
+        ("America/New_York", time(1, 30)),
+        ("America/New_York", time(2, 30)),
+    ],
+)
+def test_floor_by_cutoff_batch_matches_per_event(tz_name: str, cutoff: time) -> None:
+    tz = get_timezone(tz_name)
+    start = datetime(2024, 3, 9, tzinfo=timezone.utc)
+    stamps = [start + timedelta(minutes=13 * step) for step in range(3000)]
+    stamps += [stamp.astimezone(tz) for stamp in stamps[::5]]
+    stamps.append(datetime(2026, 1, 1, 7, 59, tzinfo=tz))
+
+    expected = [floor_by_cutoff(stamp, cutoff, tz) for stamp in stamps]
+    assert floor_by_cutoff_batch(stamps, cutoff, tz) == expected
+    assert floor_by_cutoff_batch(reversed(stamps), cutoff, tz) == expected[::-1]
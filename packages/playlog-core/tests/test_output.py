@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+
+import pytest
+from playlog import NightSession, PlayEvent, PlaylogConfig, output
+from playlog.models import EventSequence
+from playlog.output import OutputStage, WrittenSession
+from playlog.parallel import PREFETCH_FACTOR
+from playlog.sessions import SessionEvents
+
+
+def _sessions(count: int, pulled: list[int] | None = None) -> Iterator[SessionEvents]:
+    for number in range(count):
+        if pulled is not None:
+            pulled.append(number)
+        session = NightSession(app="djay", session_id=f"S{number}", night_date=date(2025, 5, 2))
+        event = PlayEvent(app="djay", session_id=f"S{number}", title=f"Track {number}")
+        yield session, [event] * (number % 3)
+
+
+def test_output_stage_yields_in_input_order(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"json", "csv"})
+    threaded = list(OutputStage(config, threads=4).run(_sessions(20)))
+    serial = list(OutputStage(config, threads=0).run(_sessions(20)))
+
+    assert [written.session.session_id for written in threaded] == [
+        f"S{number}" for number in range(20)
+    ]
+    assert [written.tracks for written in threaded] == [number % 3 for number in range(20)]
+    assert all(output.written for written in threaded for output in written.files)
+    # 2 回目は同じ内容なので書き込まない
+    assert not any(output.written for written in serial for output in written.files)
+
+
+def test_output_stage_bounds_sessions_in_flight(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    release = threading.Event()
+
+    def blocked_render(
+        session: NightSession,
+        events: EventSequence,
+        config: PlaylogConfig,
+        formats: object,
+        index: object,
+    ) -> list[object]:
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(output, "render_session", blocked_render)
+    pulled: list[int] = []
+    results: list[WrittenSession] = []
+    stage = OutputStage(PlaylogConfig(out_dir=tmp_path), threads=1)
+    consumer = threading.Thread(target=lambda: results.extend(stage.run(_sessions(10, pulled))))
+    consumer.start()
+    time.sleep(0.2)
+    assert len(pulled) == PREFETCH_FACTOR
+
+    release.set()
+    consumer.join(5)
+    assert len(results) == 10
+
+
+def test_output_stage_propagates_render_errors(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def failing_render(
+        session: NightSession,
+        events: EventSequence,
+        config: PlaylogConfig,
+        formats: object,
+        index: object,
+    ) -> list[object]:
+        if session.session_id == "S3":
+            raise OSError("disk full")
+        return []
+
+    monkeypatch.setattr(output, "render_session", failing_render)
+    seen: list[str] = []
+    with pytest.raises(OSError, match="disk full"):
+        for written in OutputStage(PlaylogConfig(out_dir=tmp_path), threads=2).run(
+            _sessions(10)
+        ):
+            seen.append(written.session.session_id)
+    assert seen == ["S0", "S1", "S2"]
+
+
+def test_output_stage_shares_one_archive_transaction(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"sqlite"})
+    with OutputStage(config, threads=3) as stage:
+        written = list(stage.run(_sessions(12)))
+        assert stage.shared is not None and stage.shared.index is not None
+    assert {output.path.name for item in written for output in item.files} == {"playlog.db"}
+    with sqlite3.connect(tmp_path / "playlog.db") as connection:
+        assert connection.execute("SELECT COUNT(*), SUM(tracks) FROM sessions").fetchone() == (
+            12,
+            sum(number % 3 for number in range(12)),
+        )
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from playlog.parallel import ordered_map, resolve_jobs
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def test_resolve_jobs_keeps_small_runs_in_process() -> None:
+    assert resolve_jobs(8, 1) == 1
+    assert resolve_jobs(8, 3) == 1
+    assert resolve_jobs(2, 100) == 2
+    assert resolve_jobs(0, 100) >= 1
+
+
+def test_ordered_map_preserves_input_order() -> None:
+    items = list(range(20))
+    assert list(ordered_map(_square, items, jobs=3)) == [_square(item) for item in items]
+    assert list(ordered_map(_square, items[:1], jobs=3)) == [0]
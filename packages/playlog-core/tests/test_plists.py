@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import plistlib
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from playlog.plists import read_matching_dicts
+
+
+def _is_track(keys: object) -> bool:
+    names = set(keys)  # type: ignore[call-overload]
+    return "Title" in names and "Artist" in names
+
+
+def _track(index: int) -> dict[str, object]:
+    return {
+        "Title": f"Track {index}",
+        "Artist": "DJ ✦",
+        "Start Time": datetime(2025, 11, 12, 22, index % 60),
+        "Duration": 180.5 + index,
+        "Play Count": index * 1_000_003,
+        "Artwork": b"\x00\x01" * (index % 4),
+        "Flags": [True, False, {"Nested": index}],
+    }
+
+
+DOCUMENT: dict[str, object] = {
+    "History Name": "Club Night",
+    "Software Version": "5.1",
+    "Date Started": datetime(2025, 11, 12, 21, 0),
+    "Waveforms": [{"Peak": i} for i in range(50)],
+    "History Tracks": [_track(i) for i in range(300)],
+    "Root": {"Crates": [{"Title": "not a track"}, _track(999)]},
+}
+
+
+@pytest.mark.parametrize("fmt", [plistlib.FMT_BINARY, plistlib.FMT_XML])
+def test_reads_root_scalars_and_matching_dicts(tmp_path: Path, fmt: plistlib.PlistFormat) -> None:
+    path = tmp_path / "set.plist"
+    path.write_bytes(plistlib.dumps(DOCUMENT, fmt=fmt))
+
+    root, tracks = read_matching_dicts(path, _is_track)
+
+    assert root == {
+        "History Name": "Club Night",
+        "Software Version": "5.1",
+        "Date Started": datetime(2025, 11, 12, 21, 0),
+    }
+    expected = [*DOCUMENT["History Tracks"], _track(999)]  # type: ignore[misc]
+    assert tracks == expected
+
+
+@pytest.mark.parametrize("fmt", [plistlib.FMT_BINARY, plistlib.FMT_XML])
+def test_root_track_and_non_dict_root(tmp_path: Path, fmt: plistlib.PlistFormat) -> None:
+    path = tmp_path / "track.plist"
+    path.write_bytes(plistlib.dumps(_track(1), fmt=fmt))
+    root = {key: value for key, value in _track(1).items() if key != "Flags"}
+    assert read_matching_dicts(path, _is_track) == (root, [_track(1)])
+
+    path.write_bytes(plistlib.dumps([_track(1)], fmt=fmt))
+    with pytest.raises(ValueError):
+        read_matching_dicts(path, _is_track)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["2025-05-02T01:15:30Z", "2025-05-02T01:15Z", "2025-05-02T01Z", "2025-05-02Z"],
+)
+def test_xml_truncated_dates_match_plistlib(tmp_path: Path, text: str) -> None:
+    path = tmp_path / "set.plist"
+    path.write_bytes(
+        b'<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0"><dict>'
+        b"<key>Title</key><string>Loft Intro</string>"
+        b"<key>Artist</key><string>DJ Sample</string>"
+        b"<key>Start Time</key><date>" + text.encode("ascii") + b"</date>"
+        b"</dict></plist>"
+    )
+
+    root, [track] = read_matching_dicts(path, _is_track)
+
+    assert track == plistlib.loads(path.read_bytes())
+    assert root["Start Time"] == track["Start Time"]
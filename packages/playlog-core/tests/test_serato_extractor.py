@@ -4,6 +4,7 @@ from pathlib import Path
 
 from playlog import PlaylogConfig
 from playlog.extractors import serato
+from playlog.tlv import ChunkReader
 
 FIXTURES = Path(__file__).parents[3] / "assets" / "fixtures" / "serato" / "_Serato_"
 
@@ -32,7 +33,7 @@ def test_crate_mode_parses_tracks(tmp_path: Path) -> None:
 
 
 def test_logs_mode_generates_play_events(tmp_path: Path) -> None:
-    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC", session_gap_minutes=90)
     sessions = serato.extract(config, root=FIXTURES, mode="logs")
 
     session, events = _session_by_id(sessions, "2025-05-03@Loft")
@@ -63,3 +64,202 @@ def test_timeline_estimate_populates_missing_times(tmp_path: Path) -> None:
     session, events = _session_by_id(sessions, "History-2025-05-05-Estimate")
     assert session.timeline_mode == "estimated"
     assert all(event.played_at is not None for event in events)
+
+
+def test_iter_sessions_is_lazy_and_matches_extract(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    stream = serato.iter_sessions(config, root=FIXTURES, mode="crate")
+
+    assert not isinstance(stream, list)
+    first_session, first_events = next(stream)
+    assert first_session.session_id == "History-2025-05-01"
+    assert len(first_events) == 2
+
+    remaining = [session.session_id for session, _ in stream]
+    sessions = serato.extract(config, root=FIXTURES, mode="crate")
+    expected = [session.session_id for session, _ in sessions]
+    assert [first_session.session_id, *remaining] == expected
+
+
+def test_iter_sessions_auto_prefers_crates_over_logs(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    session_ids = [session.session_id for session, _ in serato.iter_sessions(config, root=FIXTURES)]
+
+    assert "History-2025-05-01" in session_ids
+    assert "2025-05-03@Loft" not in session_ids
+
+
+def _chunk(tag: str, payload: bytes) -> bytes:
+    return tag.encode("ascii") + len(payload).to_bytes(4, "big") + payload
+
+
+def test_crate_decodes_utf16_text_fields(tmp_path: Path) -> None:
+    track = (
+        _chunk("ttxt", "夜明け Mix".encode("utf-16-be"))
+        + _chunk("aART", "Beyoncé".encode("utf-16-be"))
+        + _chunk("bpmf", b"124.0")
+        + _chunk("pdat", b"2025-05-02T01:15:00+00:00")
+    )
+    history = tmp_path / "_Serato_" / "History"
+    history.mkdir(parents=True)
+    (history / "History-2025-05-01.crate").write_bytes(_chunk("otrk", track))
+
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    (_, events), = serato.extract(config, root=tmp_path / "_Serato_", mode="crate")
+
+    assert events[0].title == "夜明け Mix"
+    assert events[0].artist == "Beyoncé"
+    assert events[0].bpm == 124.0
+    assert events[0].raw is not None
+    assert events[0].raw["ttxt"] == "夜明け Mix"
+
+
+def test_cjk_only_utf16_text_follows_crate_codec(tmp_path: Path) -> None:
+    # 上位バイトが全て非 0 なので NUL の位置では UTF-16 と判定できず、
+    # "あいう" や "水" は ASCII/UTF-8 としても読めてしまう
+    texts = ["夜明け", "坂本龍", "よあけ", "あいう", "あ", "水", "カナ", "山田"]
+    for text in texts:
+        payload = text.encode("utf-16-be")
+        assert b"\x00" not in payload
+        assert serato._decode_text(payload, serato.CODEC_UTF16_BE) == text
+    assert "あいう".encode("utf-16-be").decode("utf-8") == "0B0D0F"
+
+    vrsn = _chunk("vrsn", "1.0/Serato ScratchLive Crate".encode("utf-16-be"))
+    tracks = b"".join(
+        _chunk("otrk", _chunk("ttxt", title.encode("utf-16-be")) + _chunk(
+            "aART", "坂本龍".encode("utf-16-be")
+        ))
+        for title in texts
+    )
+    history = tmp_path / "_Serato_" / "History"
+    history.mkdir(parents=True)
+    (history / "History-2025-05-01.crate").write_bytes(vrsn + tracks)
+
+    for raw_retention in ("full", "lazy"):
+        config = PlaylogConfig(
+            out_dir=tmp_path, timezone="UTC", timeline_estimate=True, raw_retention=raw_retention
+        )
+        (_, events), = serato.extract(config, root=tmp_path / "_Serato_", mode="crate")
+        assert [event.title for event in events] == texts
+        assert {event.artist for event in events} == {"坂本龍"}
+        assert [event.raw["ttxt"] for event in events] == texts
+
+
+def test_crate_codec_comes_from_header_or_nul_bytes() -> None:
+    def codec(data: bytes) -> str:
+        return serato._crate_codec(ChunkReader(data))
+
+    title = _chunk("otrk", _chunk("ttxt", "水".encode("utf-16-be")))
+    assert codec(_chunk("vrsn", "1.0".encode("utf-16-be")) + title) == serato.CODEC_UTF16_BE
+    assert codec(_chunk("vrsn", "1.0".encode("utf-16-le")) + title) == serato.CODEC_UTF16_LE
+    assert codec(_chunk("vrsn", b"1.0") + title) == serato.CODEC_UTF8
+    # ヘッダが無ければ NUL を含むテキストフィールドで決める
+    mixed = _chunk("otrk", _chunk("ttxt", "水 Mix".encode("utf-16-be")))
+    assert codec(title + mixed) == serato.CODEC_UTF16_BE
+    assert codec(_chunk("otrk", _chunk("ttxt", b"Loft Intro"))) == serato.CODEC_UTF8
+    # 数値タグの NUL は判定に使わない
+    assert codec(_chunk("otrk", _chunk("dura", b"\x00\x00\x01\x00"))) == serato.CODEC_UTF8
+
+
+def test_raw_retention_lazy_matches_full_and_none_drops(tmp_path: Path) -> None:
+    def first_event(raw_retention: str) -> object:
+        config = PlaylogConfig(out_dir=tmp_path, timezone="UTC", raw_retention=raw_retention)
+        _, events = _session_by_id(
+            serato.extract(config, root=FIXTURES, mode="crate"),
+            "History-2025-05-01",
+        )
+        return events[0]
+
+    full = first_event("full")
+    lazy = first_event("lazy")
+    none = first_event("none")
+
+    assert not isinstance(lazy.raw, dict)
+    assert lazy.model_dump() == full.model_dump()
+    assert none.raw is None
+    assert none.title == full.title
+    assert none.played_at == full.played_at
+
+
+def _log_sessions(root: Path, out_dir: Path, **overrides: object) -> list[tuple[object, object]]:
+    config = PlaylogConfig(out_dir=out_dir, timezone="UTC", **overrides)
+    return serato.extract(config, root=root, mode="logs")
+
+
+def test_log_checkpoint_resumes_across_day_rollover(tmp_path: Path) -> None:
+    root = tmp_path / "_Serato_"
+    log_path = root / "Logs" / "2025-05-03@Loft.log"
+    log_path.parent.mkdir(parents=True)
+    log_path.write_text(
+        "Session Start @ 2025-05-03 22:00:00\n"
+        "23:50:00  Deck 1  Artist One - Late Track\n",
+        encoding="utf-8",
+    )
+    out_dir = tmp_path / "out"
+    (_, first_events), = _log_sessions(root, out_dir)
+    assert len(first_events) == 1
+
+    with log_path.open("a", encoding="utf-8") as fp:
+        fp.write("00:10:00  Deck 2  Artist Two - After Midnight\n")
+        fp.write("00:20:00  Deck 1  Partial Line")
+
+    (session, events), = _log_sessions(root, out_dir)
+    (_, expected), = _log_sessions(root, tmp_path / "fresh", log_checkpoints=False)
+
+    assert [event.model_dump() for event in events] == [event.model_dump() for event in expected]
+    assert events[1].played_at.isoformat() == "2025-05-04T00:10:00+00:00"
+    assert events[2].title == "Partial Line"
+    assert session.night_date.isoformat() == "2025-05-03"
+
+
+def test_log_checkpoint_reparses_rewritten_file(tmp_path: Path) -> None:
+    root = tmp_path / "_Serato_"
+    log_path = root / "Logs" / "session.log"
+    log_path.parent.mkdir(parents=True)
+    log_path.write_text("22:00:00  Deck 1  Artist - First\n", encoding="utf-8")
+    _log_sessions(root, tmp_path)
+
+    log_path.write_text("22:00:00  Deck 1  Artist - Replaced\n", encoding="utf-8")
+    (_, events), = _log_sessions(root, tmp_path)
+
+    assert [event.title for event in events] == ["Replaced"]
+
+
+def test_parallel_jobs_match_sequential_output(tmp_path: Path) -> None:
+    root = tmp_path / "_Serato_"
+    history = root / "History"
+    history.mkdir(parents=True)
+    for copy in range(3):
+        for crate in (FIXTURES / "History").glob("*.crate"):
+            shutil.copy(crate, history / f"{crate.stem}-{copy}.crate")
+
+    def dump(jobs: int) -> list[object]:
+        config = PlaylogConfig(out_dir=tmp_path, raw_retention="lazy", jobs=jobs)
+        return [
+            (session.model_dump(), [event.model_dump() for event in events])
+            for session, events in serato.iter_sessions(config, root=root, mode="crate")
+        ]
+
+    assert dump(2) == dump(1)
+
+
+def test_columnar_events_match_row_events(tmp_path: Path) -> None:
+    def dump(columnar: bool, mode: str) -> list[object]:
+        config = PlaylogConfig(out_dir=tmp_path, columnar_events=columnar)
+        return [
+            [event.model_dump() for event in events]
+            for _, events in serato.iter_sessions(config, root=FIXTURES, mode=mode)
+        ]
+
+    for mode in ("crate", "logs"):
+        assert dump(True, mode) == dump(False, mode)
+
+
+def test_logs_split_on_session_gap(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    sessions = serato.extract(config, root=FIXTURES, mode="logs")
+
+    _, opening = _session_by_id(sessions, "2025-05-03@Loft")
+    _, rest = _session_by_id(sessions, "2025-05-03@Loft-2")
+    assert [event.title for event in opening] == ["Opening Track"]
+    assert [event.title for event in rest] == ["Peak Time", "Closing Song"]
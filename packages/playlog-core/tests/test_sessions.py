@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from playlog import EventBatch, NightSession, PlayEvent, PlaylogConfig
+from playlog.sessions import segment_session
+
+START = datetime(2025, 5, 2, 22, 0, tzinfo=timezone.utc)
+
+
+def _event(minutes: int | None, title: str, duration_sec: int = 0) -> PlayEvent:
+    return PlayEvent(
+        app="serato",
+        session_id="History",
+        night_date=date(2025, 5, 2),
+        played_at=None if minutes is None else START + timedelta(minutes=minutes),
+        title=title,
+        duration_sec=duration_sec,
+    )
+
+
+def _session() -> NightSession:
+    return NightSession(app="serato", session_id="History", night_date=date(2025, 5, 2))
+
+
+def _split(events: list[PlayEvent], tmp_path: Path) -> list[tuple[str, date, list[str]]]:
+    config = PlaylogConfig(out_dir=tmp_path, session_gap_minutes=30)
+    return [
+        (session.session_id, session.night_date, [event.title for event in part])
+        for session, part in segment_session(_session(), events, config)
+    ]
+
+
+def test_splits_on_gap_and_cutoff(tmp_path: Path) -> None:
+    events = [
+        _event(0, "a", duration_sec=600),
+        _event(35, "b"),  # a の終了から 25 分
+        _event(None, "c"),
+        _event(70, "d"),  # b から 35 分空く
+        _event(595, "e"),  # 07:55
+        _event(605, "f"),  # 08:05 で夜が変わる
+    ]
+    config = PlaylogConfig(out_dir=tmp_path, session_gap_minutes=30)
+
+    parts = list(segment_session(_session(), events, config))
+
+    assert _split(events, tmp_path) == [
+        ("History", date(2025, 5, 2), ["a", "b", "c"]),
+        ("History-2", date(2025, 5, 2), ["d"]),
+        ("History-3", date(2025, 5, 2), ["e"]),
+        ("History-4", date(2025, 5, 3), ["f"]),
+    ]
+    first = parts[0][0]
+    assert first.session_start == events[0].played_at
+    assert first.session_end == events[1].played_at
+    assert {event.session_id for event in parts[3][1]} == {"History-4"}
+    assert parts[3][1][0].night_date == date(2025, 5, 3)
+
+
+def test_unsplit_session_is_passed_through(tmp_path: Path) -> None:
+    session = _session()
+    events = [_event(0, "a"), _event(10, "b")]
+    config = PlaylogConfig(out_dir=tmp_path, session_gap_minutes=30)
+
+    [(same_session, same_events)] = segment_session(session, events, config)
+    assert same_session is session
+    assert same_events is events
+
+
+def test_out_of_order_events_are_sorted(tmp_path: Path) -> None:
+    events = [_event(60, "c"), _event(None, "c2"), _event(0, "a"), _event(10, "b")]
+    assert _split(events, tmp_path) == [
+        ("History", date(2025, 5, 2), ["a", "b"]),
+        ("History-2", date(2025, 5, 2), ["c", "c2"]),
+    ]
+
+
+def test_event_batch_splits_like_rows(tmp_path: Path) -> None:
+    events = [_event(0, "a"), _event(45, "b"), _event(50, "c")]
+    config = PlaylogConfig(out_dir=tmp_path, session_gap_minutes=30)
+
+    rows = list(segment_session(_session(), events, config))
+    batches = list(segment_session(_session(), EventBatch.from_events(events), config))
+
+    assert [session for session, _ in batches] == [session for session, _ in rows]
+    assert [[event.model_dump() for event in part] for _, part in batches] == [
+        [event.model_dump() for event in part] for _, part in rows
+    ]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from playlog.tlv import ChunkReader, tag_code, tag_name
+
+
+def _chunk(tag: str, payload: bytes) -> bytes:
+    return tag.encode("ascii") + len(payload).to_bytes(4, "big") + payload
+
+
+def test_reader_walks_nested_chunks_by_offset() -> None:
+    track = _chunk("ttxt", b"Intro") + _chunk("pdat", b"2025-05-02 01:15:00")
+    data = _chunk("vrsn", b"1.0") + _chunk("otrk", track)
+    reader = ChunkReader(data)
+
+    chunks = list(reader.iter_chunks())
+    assert [tag_name(code) for code, _, _ in chunks] == ["vrsn", "otrk"]
+
+    code, start, end = chunks[1]
+    assert code == tag_code("otrk")
+    fields = reader.children(start, end).fields()
+    assert bytes(fields["ttxt"]) == b"Intro"
+    assert bytes(fields["pdat"]) == b"2025-05-02 01:15:00"
+
+
+def test_fields_only_materializes_wanted_tags() -> None:
+    data = _chunk("ttxt", b"Intro") + _chunk("aART", b"DJ") + _chunk("albm", b"LP")
+    fields = ChunkReader(data).fields({"aART"})
+    assert list(fields) == ["aART"]
+
+
+def test_truncated_payload_is_clipped() -> None:
+    data = _chunk("ttxt", b"Intro")[:-2]
+    (code, start, end), = ChunkReader(data).iter_chunks()
+    assert tag_name(code) == "ttxt"
+    assert end - start == 3
+
+
+def test_open_maps_file_and_handles_empty(tmp_path: Path) -> None:
+    crate = tmp_path / "History.crate"
+    crate.write_bytes(_chunk("otrk", _chunk("ttxt", b"Intro")))
+    with ChunkReader.open(crate) as reader:
+        assert len(list(reader.iter_chunks())) == 1
+
+    empty = tmp_path / "empty.crate"
+    empty.write_bytes(b"")
+    with ChunkReader.open(empty) as reader:
+        assert list(reader.iter_chunks()) == []
+
+
+def test_tag_code_requires_four_characters() -> None:
+    with pytest.raises(ValueError):
+        tag_code("key")
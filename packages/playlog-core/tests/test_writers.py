@@ -1,11 +1,21 @@
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 
-from playlog import NightSession, PlayEvent, PlaylogConfig
-from playlog.writers import CsvBatchWriter, JsonWriter, TxtWriter, render_per_night
+import pytest
+from playlog import EventBatch, NightSession, PlayEvent, PlaylogConfig, writers
+from playlog.writers import (
+    CsvBatchWriter,
+    JsonWriter,
+    SharedOutputs,
+    TxtWriter,
+    render_per_night,
+    render_session,
+)
 
 FIXTURE = Path(__file__).parents[3] / "assets" / "fixtures" / "sample_play_events.json"
 
@@ -58,6 +68,37 @@ def test_csv_writer_has_all_rows(tmp_path: Path) -> None:
     assert len(lines) == 3
 
 
+def test_text_outputs_use_platform_line_endings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    session = build_session()
+    events = load_events()
+    formats = {"json", "txt", "csv"}
+    unix = render_per_night(session, events, PlaylogConfig(out_dir=tmp_path / "lf"), formats)
+    monkeypatch.setattr(os, "linesep", "\r\n")
+    windows = render_per_night(session, events, PlaylogConfig(out_dir=tmp_path / "crlf"), formats)
+
+    lf = {path.name: path.read_bytes() for path in unix}
+    crlf = {path.name: path.read_bytes() for path in windows}
+    # json / txt は write_text と同じく改行を変換し、csv は csv.writer の \r\n をそのまま書く
+    assert crlf["session.json"] == lf["session.json"].replace(b"\n", b"\r\n")
+    assert crlf["session.txt"] == lf["session.txt"].replace(b"\n", b"\r\n")
+    assert crlf["session.csv"] == lf["session.csv"]
+    assert b"\r\r" not in crlf["session.csv"]
+
+
+def test_failed_copy_removes_temp_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def interrupted(*args: object) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(writers.shutil, "copyfileobj", interrupted)
+    config = PlaylogConfig(out_dir=tmp_path)
+    with pytest.raises(KeyboardInterrupt):
+        JsonWriter(config).write(build_session(), load_events())
+
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
 def test_render_per_night_creates_selected_formats(tmp_path: Path) -> None:
     config = PlaylogConfig(out_dir=tmp_path, formats={"json", "txt"}, timezone="UTC")
     session = build_session()
@@ -66,3 +107,221 @@ def test_render_per_night_creates_selected_formats(tmp_path: Path) -> None:
     assert len(outputs) == 2
     assert outputs[0].exists()
     assert outputs[1].exists()
+
+
+def test_render_per_night_accepts_event_batch(tmp_path: Path) -> None:
+    events = load_events()
+    session = build_session()
+    rows_config = PlaylogConfig(out_dir=tmp_path / "rows", timezone="UTC")
+    batch_config = PlaylogConfig(out_dir=tmp_path / "batch", timezone="UTC")
+
+    expected = render_per_night(session, events, rows_config)
+    actual = render_per_night(session, EventBatch.from_events(events), batch_config)
+    assert [path.read_bytes() for path in actual] == [path.read_bytes() for path in expected]
+
+
+def test_json_writer_matches_json_dumps(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    session = build_session()
+    events = load_events()
+    events[0] = events[0].model_copy(
+        update={"raw": {"nested": {"list": [1, 2.5, None, True, {}], "é": "\n\""}, "empty": []}}
+    )
+
+    out_path = JsonWriter(config).write(session, events)
+    expected = json.dumps(
+        {
+            "session": session.model_dump(),
+            "events": [event.model_dump() for event in events],
+        },
+        ensure_ascii=False,
+        indent=2,
+        default=lambda value: value.isoformat(),
+    )
+    assert out_path.read_text(encoding="utf-8") == expected
+
+
+def test_render_per_night_matches_individual_writers(tmp_path: Path) -> None:
+    session = build_session()
+    events = load_events()
+    combined = render_per_night(session, events, PlaylogConfig(out_dir=tmp_path / "combined"))
+    config = PlaylogConfig(out_dir=tmp_path / "single")
+    single = [
+        writer(config).write(session, events)
+        for writer in (JsonWriter, TxtWriter, CsvBatchWriter)
+    ]
+    assert [path.read_bytes() for path in combined] == [path.read_bytes() for path in single]
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_compact_json_matches_pretty_content(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    use_orjson: bool,
+) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(writers, "_HAS_ORJSON", use_orjson)
+    session = build_session()
+    events = load_events()
+    pretty = JsonWriter(PlaylogConfig(out_dir=tmp_path / "pretty")).write(session, events)
+    compact_config = PlaylogConfig(out_dir=tmp_path / "compact", json_style="compact")
+    compact = JsonWriter(compact_config).write(session, events)
+
+    text = compact.read_text(encoding="utf-8")
+    assert "\n" not in text
+    assert json.loads(text) == json.loads(pretty.read_text(encoding="utf-8"))
+    empty = JsonWriter(compact_config).write(session, [])
+    assert json.loads(empty.read_text(encoding="utf-8"))["events"] == []
+
+
+def test_render_session_skips_unchanged_outputs(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    session = build_session()
+    events = load_events()
+
+    first = render_session(session, events, config)
+    assert [output.written for output in first] == [True, True, True]
+    mtimes = [output.path.stat().st_mtime_ns for output in first]
+
+    second = render_session(session, events, config)
+    assert [output.written for output in second] == [False, False, False]
+    assert [output.path.stat().st_mtime_ns for output in second] == mtimes
+
+    # 外から書き換えられたファイルだけを書き直す
+    first[1].path.write_text("edited", encoding="utf-8")
+    third = render_session(session, events[:1], config, formats=["json", "txt"])
+    assert [output.written for output in third] == [True, True]
+    assert len(json.loads(first[0].path.read_text())["events"]) == 1
+    assert not list(first[0].path.parent.glob(".*.tmp"))
+
+
+def test_render_session_hashes_files_missing_from_manifest(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, timezone="UTC")
+    session = build_session()
+    events = load_events()
+    [output] = render_session(session, events, config, formats=["csv"])
+    for manifest in (config.state_dir / writers.MANIFEST_DIR).iterdir():
+        manifest.unlink()
+
+    [again] = render_session(session, events, config, formats=["csv"])
+    assert not again.written
+    assert render_per_night(session, events, config, formats=["csv"]) == [output.path]
+
+
+def test_sqlite_archive_upserts_sessions(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"sqlite"}, timezone="UTC")
+    session = build_session()
+    events = load_events()
+
+    [first] = render_session(session, events, config)
+    assert first.path == tmp_path / "playlog.db" and first.written
+    with SharedOutputs(config) as shared:
+        [again] = render_session(session, events, config, shared=shared)
+        [other] = render_session(
+            session.model_copy(update={"session_id": "HISTORY-002"}),
+            events[:1],
+            config,
+            shared=shared,
+        )
+    assert not again.written and other.written
+    [changed] = render_session(session, events[1:], config, formats=["sqlite"])
+    assert changed.written
+
+    with sqlite3.connect(first.path) as connection:
+        nights = connection.execute(
+            "SELECT s.session_id, s.night_date, s.tracks, e.position FROM events e"
+            " JOIN sessions s ON s.id = e.session WHERE e.artist = ? AND e.title = ?"
+            " ORDER BY s.session_id",
+            (events[1].artist, events[1].title),
+        ).fetchall()
+    assert nights == [("HISTORY-001", "2025-11-12", 1, 1)]
+
+
+def test_sqlite_archive_rolls_back_failed_runs(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"sqlite"})
+    with pytest.raises(RuntimeError), SharedOutputs(config) as shared:
+        render_session(build_session(), load_events(), config, shared=shared)
+        raise RuntimeError
+    with sqlite3.connect(tmp_path / "playlog.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM sessions").fetchone() == (0,)
+
+
+def _night_lines(log_dir: Path, month: str, night: str) -> list[dict[str, object]]:
+    index = json.loads((log_dir / f"{month}.index.json").read_text(encoding="utf-8"))
+    lines = []
+    with (log_dir / f"{month}.ndjson").open("rb") as fp:
+        for start, end in index["nights"][night]:
+            fp.seek(start)
+            lines += [json.loads(line) for line in fp.read(end - start).splitlines()]
+    return lines
+
+
+def test_ndjson_log_appends_each_event_once(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"ndjson"}, timezone="UTC")
+    session = build_session()
+    events = load_events()
+    log_dir = tmp_path / writers.EVENT_LOG_DIR
+
+    [first] = render_session(session, events[:1], config)
+    assert first.path == log_dir / "2025-11.ndjson" and first.written
+    other = session.model_copy(update={"session_id": "HISTORY-002"})
+    with SharedOutputs(config) as shared:
+        render_session(other, events, config, shared=shared)
+        [grown] = render_session(session, events, config, shared=shared)
+    [again] = render_session(session, events, config)
+    assert grown.written and not again.written
+
+    lines = _night_lines(log_dir, "2025-11", "2025-11-12")
+    assert [(line["session_id"], line["index"]) for line in lines] == [
+        ("HISTORY-001", 1),
+        ("HISTORY-002", 1),
+        ("HISTORY-002", 2),
+        ("HISTORY-001", 2),
+    ]
+    assert lines[-1]["title"] == events[1].title
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_ndjson_lines_do_not_depend_on_orjson(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    use_orjson: bool,
+) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(writers, "_HAS_ORJSON", use_orjson)
+    config = PlaylogConfig(out_dir=tmp_path, formats={"ndjson"}, timezone="UTC")
+    events = [
+        event.model_copy(update={"bpm": 1e16, "raw": {"gain": float("nan"), "peak": [1e-7]}})
+        for event in load_events()
+    ]
+
+    [output] = render_session(build_session(), events, config)
+
+    lines = output.path.read_bytes().splitlines()
+    first = json.loads(lines[0])
+    assert (first["bpm"], first["raw"]) == (1e16, {"gain": None, "peak": [1e-7]})
+    assert lines[0] == json.dumps(
+        first, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode()
+
+
+def test_ndjson_log_recovers_from_interrupted_runs(tmp_path: Path) -> None:
+    config = PlaylogConfig(out_dir=tmp_path, formats={"ndjson"}, timezone="UTC")
+    session = build_session()
+    events = load_events()
+    [output] = render_session(session, events, config)
+    expected = output.path.read_bytes()
+
+    # 索引に載っていない書きかけの行は捨てる
+    with output.path.open("ab") as fp:
+        fp.write(b'{"app": "rekordbox", "ses')
+    assert not render_session(session, events, config)[0].written
+    assert output.path.read_bytes() == expected
+
+    # 索引が無くなっても中身から作り直して重複させない
+    output.path.with_name("2025-11.index.json").unlink()
+    assert not render_session(session, events, config)[0].written
+    assert output.path.read_bytes() == expected
+    assert len(_night_lines(output.path.parent, "2025-11", "2025-11-12")) == 2
@@ -0,0 +1,59 @@
+"""Load modules of ``playlog`` as they were at an earlier revision, for benchmarks.
+
+Benchmarks compare the current code with the original implementation. Instead
+of keeping copies of the old code in the tree, the source is read with
+``git show <rev>:<path>`` and executed as a sibling of the current module, so
+its relative imports resolve to the current package.
+
+    serato = baseline.load("playlog.extractors.serato")
+"""
+from __future__ import annotations
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+
+REPO = Path(__file__).resolve().parents[1]
+CORE = "packages/playlog-core"
+
+
+def root_revision() -> str:
+    result = subprocess.run(  # noqa: S603
+        ["git", "rev-list", "--max-parents=0", "HEAD"],  # noqa: S607
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.split()[-1]
+
+
+def load(module: str, rev: str | None = None) -> ModuleType:
+    """Return ``module`` (e.g. ``playlog.writers``) as of ``rev``.
+
+    ``rev`` defaults to the first commit of the repository, which holds the
+    implementation before any of the optimizations.
+    """
+
+    if rev is None:
+        rev = root_revision()
+    path = f"{CORE}/{module.replace('.', '/')}.py"
+    source = subprocess.run(  # noqa: S603
+        ["git", "show", f"{rev}:{path}"],  # noqa: S607
+        cwd=REPO,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    package, _, name = module.rpartition(".")
+    importlib.import_module(package)
+    qualified = f"{package}._baseline_{name}"
+    loaded = ModuleType(qualified)
+    loaded.__package__ = package
+    loaded.__file__ = f"{rev}:{path}"
+    # dataclass などがモジュールを引けるよう、実行前に登録する
+    sys.modules[qualified] = loaded
+    exec(compile(source, loaded.__file__, "exec"), loaded.__dict__)  # noqa: S102
+    return loaded
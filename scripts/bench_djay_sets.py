@@ -0,0 +1,107 @@
+"""Benchmark djay Set loading on large synthetic binary and XML plists.
+
+Compares ``plistlib.load`` + recursive track walk with the selective reader in
+``playlog.plists`` and reports tracks/sec plus the ``tracemalloc`` peak.
+
+    python scripts/bench_djay_sets.py --tracks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import plistlib
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import baseline
+from playlog.extractors import djay
+from playlog.plists import read_matching_dicts
+
+Reader = Callable[[Path], tuple[object, list[dict[str, object]]]]
+
+
+def synthetic_set(tracks: int) -> dict[str, object]:
+    start = datetime(2025, 11, 12, 22, 0)
+    return {
+        "History Name": "Bench Night",
+        "Software Version": "5.1.2",
+        "Date Started": start,
+        "History Tracks": [
+            {
+                "Title": f"Track {index}",
+                "Artist": f"Artist {index % 97}",
+                "Album": f"Album {index % 31}",
+                "Start Time": start + timedelta(minutes=3 * index),
+                "Duration": 180.0 + index % 240,
+                "Deck": f"Deck {index % 2 + 1}",
+                "BPM": 118.0 + index % 12,
+                "Location": f"/Music/{index}.aiff",
+            }
+            for index in range(tracks)
+        ],
+        # トラック以外の大きなノード（波形キャッシュ・ライブラリのスナップショット）
+        "Waveform Cache": [
+            {
+                "Location": f"/Music/{index}.aiff",
+                "Peaks": [float(index % 251 + peak) for peak in range(64)],
+            }
+            for index in range(tracks)
+        ],
+        "Library Snapshot": [
+            {"Path": f"/Music/{index}.aiff", "Added": start - timedelta(days=index)}
+            for index in range(tracks)
+        ],
+    }
+
+
+def _measure(name: str, read: Reader, path: Path) -> None:
+    start = time.perf_counter()
+    _, tracks = read(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    read(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:>14}: {len(tracks)} tracks in {elapsed:.3f}s "
+        f"({len(tracks) / elapsed:,.0f} tracks/sec), peak={peak / 2**20:,.1f} MiB"
+    )
+
+
+def _legacy_reader() -> Reader:
+    legacy = baseline.load("playlog.extractors.djay")
+
+    def read(path: Path) -> tuple[object, list[dict[str, object]]]:
+        data = legacy._read_plist(path)
+        return data, list(legacy._iter_track_dicts(data))
+
+    return read
+
+
+def _current(path: Path) -> tuple[object, list[dict[str, object]]]:
+    return read_matching_dicts(path, djay._looks_like_track)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=20000)
+    args = parser.parse_args()
+
+    document = synthetic_set(args.tracks)
+    legacy = _legacy_reader()
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fmt in (("binary", plistlib.FMT_BINARY), ("xml", plistlib.FMT_XML)):
+            path = Path(tmp) / f"bench-{label}.plist"
+            path.write_bytes(plistlib.dumps(document, fmt=fmt))
+            print(f"{label}: {path.stat().st_size / 2**20:,.1f} MiB")
+            _measure(f"legacy {label}", legacy, path)
+            _measure(f"current {label}", _current, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark memory and column scans: list[PlayEvent] vs EventBatch.
+
+    python scripts/bench_event_batch.py --events 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from typing import TypeVar
+
+from bench_events import synthetic_records
+from playlog import EventBatch, EventSequence, build_play_events
+
+S = TypeVar("S", bound=EventSequence)
+
+
+def measure(build: Callable[[], S]) -> tuple[S, int]:
+    tracemalloc.start()
+    events = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return events, current
+
+
+def row_range(events: EventSequence) -> tuple[datetime | None, datetime | None]:
+    played = [event.played_at for event in events if event.played_at is not None]
+    return min(played), max(played)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.events)
+    # raw は両者とも同じ dict を共有するので、列化の効果だけを見るため外す
+    for record in records:
+        record["raw"] = None
+
+    rows, row_bytes = measure(lambda: build_play_events(map(dict, records), trusted=True))
+    batch, batch_bytes = measure(lambda: EventBatch.from_records(map(dict, records), trusted=True))
+
+    start = time.perf_counter()
+    expected = row_range(rows)
+    row_scan = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = batch.played_at_range()
+    batch_scan = time.perf_counter() - start
+
+    if actual != expected or batch[-1].model_dump() != rows[-1].model_dump():
+        raise SystemExit("EventBatch differs from PlayEvent rows")
+    print(f"     rows: {row_bytes / 2**20:,.1f} MiB, min/max played_at {row_scan * 1e3:,.1f} ms")
+    print(
+        f"    batch: {batch_bytes / 2**20:,.1f} MiB ({row_bytes / batch_bytes:.1f}x smaller), "
+        f"min/max played_at {batch_scan * 1e3:,.1f} ms ({row_scan / batch_scan:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark PlayEvent construction: per-event validation vs trusted batches.
+
+    python scripts/bench_events.py --events 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from playlog import PlayEvent, build_play_events
+
+
+def synthetic_records(count: int) -> list[dict[str, object]]:
+    start = datetime(2025, 5, 2, 22, 0, tzinfo=timezone.utc)
+    return [
+        {
+            "app": "serato",
+            "app_version": None,
+            "session_id": "History-2025-05-02",
+            "session_date": start.date(),
+            "night_date": start.date(),
+            "played_at": start + timedelta(seconds=210 * index),
+            "title": f"Track Title {index}",
+            "artist": f"Artist {index % 97}",
+            "album": f"Album {index % 31}",
+            "duration_sec": 180 + index % 240,
+            "deck": "A" if index % 2 else "B",
+            "bpm": 118.0 + index % 12,
+            "key": "8A",
+            "source_path": f"/Volumes/Music/track_{index:06d}.aiff",
+            "source_track_id": f"track-{index}",
+            "raw": {"ttxt": f"Track Title {index}"},
+        }
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.events)
+
+    start = time.perf_counter()
+    validated = [PlayEvent(**record) for record in records]
+    before = time.perf_counter() - start
+
+    batch = [dict(record) for record in records]
+    start = time.perf_counter()
+    trusted = build_play_events(batch, trusted=True)
+    after = time.perf_counter() - start
+
+    if trusted != validated:
+        raise SystemExit("trusted batch differs from validated events")
+    print(f"validated: {args.events / before:,.0f} events/sec")
+    print(f"  trusted: {args.events / after:,.0f} events/sec ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark session.json writing: whole-document dump vs streaming sinks.
+
+Reports wall time and the ``tracemalloc`` peak for the original ``JsonWriter``
+(loaded from the first commit by ``baseline``), the streaming pretty writer
+and the compact writer (orjson when installed).
+
+    python scripts/bench_json_writer.py --events 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+
+import baseline
+from bench_events import synthetic_records
+from playlog import NightSession, PlaylogConfig, build_play_events
+from playlog.writers import JsonWriter
+
+
+def _measure(name: str, write: Callable[[], Path]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    path = write()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = path.stat().st_size
+    print(
+        f"{name:>8}: {elapsed:6.2f} s, peak {peak / 2**20:7.1f} MiB, "
+        f"file {size / 2**20:6.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    events = build_play_events(synthetic_records(args.events), trusted=True)
+    session = NightSession(app="serato", session_id="bench", night_date=date(2025, 5, 2))
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        legacy = baseline.load("playlog.writers").JsonWriter(PlaylogConfig(out_dir=root / "legacy"))
+        pretty = JsonWriter(PlaylogConfig(out_dir=root / "pretty"))
+        compact = JsonWriter(PlaylogConfig(out_dir=root / "compact", json_style="compact"))
+        _measure("legacy", lambda: legacy.write(session, events))
+        _measure("pretty", lambda: pretty.write(session, events))
+        _measure("compact", lambda: compact.write(session, events))
+
+        legacy_bytes = next((root / "legacy").rglob("session.json")).read_bytes()
+        pretty_bytes = next((root / "pretty").rglob("session.json")).read_bytes()
+        if legacy_bytes != pretty_bytes:
+            raise SystemExit("streaming pretty output differs from the legacy writer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark night-date bucketing: per-event floor_by_cutoff vs batched boundaries.
+
+    python scripts/bench_night_dates.py --events 500000 --tz America/New_York
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from playlog import floor_by_cutoff, floor_by_cutoff_batch, get_timezone
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--tz", default="America/New_York")
+    args = parser.parse_args()
+
+    tz = get_timezone(args.tz)
+    start = datetime(2022, 1, 1, 20, 0, tzinfo=timezone.utc)
+    # 3 年分のアーカイブに相当する範囲へ散らした時刻。ローカル時刻と UTC の両方を測る
+    step = timedelta(days=3 * 365) / args.events
+    utc = [start + step * index for index in range(args.events)]
+    for label, stamps in (("local", [stamp.astimezone(tz) for stamp in utc]), ("utc", utc)):
+        begin = time.perf_counter()
+        expected = [floor_by_cutoff(stamp, tz=tz) for stamp in stamps]
+        before = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        actual = floor_by_cutoff_batch(stamps, tz=tz)
+        after = time.perf_counter() - begin
+
+        if actual != expected:
+            raise SystemExit(f"batched night dates differ from floor_by_cutoff ({label})")
+        print(
+            f"{label:>5}: per-event {args.events / before:,.0f} events/sec, "
+            f"batched {args.events / after:,.0f} events/sec ({before / after:.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
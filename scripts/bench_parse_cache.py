@@ -0,0 +1,48 @@
+"""Benchmark ``playlog run`` extraction with and without the parse cache.
+
+Builds a synthetic Serato History folder, then times a cold extraction
+(which fills ``.playlog/cache``), a warm extraction served from the cache
+and an extraction with the cache disabled.
+
+    python scripts/bench_parse_cache.py --crates 200 --tracks 100
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_serato_crate import build_history
+from playlog import PlaylogConfig
+from playlog.extractors import serato
+
+
+def _measure(name: str, config: PlaylogConfig, root: Path, crates: int) -> None:
+    start = time.perf_counter()
+    sessions = serato.extract(config, root=root, mode="crate")
+    elapsed = time.perf_counter() - start
+    tracks = sum(len(events) for _, events in sessions)
+    print(
+        f"{name:>9}: {tracks} tracks in {elapsed:.3f}s "
+        f"({elapsed / crates * 1e6:,.0f} us/crate)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crates", type=int, default=200)
+    parser.add_argument("--tracks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "_Serato_"
+        build_history(root, args.crates, args.tracks)
+        config = PlaylogConfig(out_dir=Path(tmp) / "out", timezone="UTC")
+        _measure("cold", config, root, args.crates)
+        _measure("cached", config, root, args.crates)
+        _measure("no-cache", config.model_copy(update={"parse_cache": False}), root, args.crates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark per-night rendering: one writer pass per format vs a single pass.
+
+Renders a synthetic archive of sessions in json, txt and csv with the original
+writers (loaded from the first commit by ``baseline``) and with
+``playlog.writers`` and reports sessions/sec. Both outputs are compared byte
+for byte.
+
+    python scripts/bench_render.py --sessions 200 --tracks 500
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+import baseline
+from bench_events import synthetic_records
+from playlog import (
+    EventSequence,
+    NightSession,
+    PlaylogConfig,
+    build_play_events,
+)
+from playlog.writers import render_per_night
+
+Render = Callable[[NightSession, EventSequence, PlaylogConfig], list[Path]]
+
+
+def synthetic_archive(sessions: int, tracks: int) -> list[tuple[NightSession, EventSequence]]:
+    events = build_play_events(synthetic_records(tracks), trusted=True)
+    archive = []
+    for index in range(sessions):
+        start = events[0].played_at
+        assert start is not None  # noqa: S101
+        night = start + timedelta(days=index)
+        archive.append(
+            (
+                NightSession(
+                    app="serato",
+                    session_id=f"History-{index:04d}",
+                    night_date=night.date(),
+                    session_start=night,
+                    session_end=night + timedelta(hours=6),
+                ),
+                events,
+            )
+        )
+    return archive
+
+
+def _measure(
+    render: Render,
+    archive: list[tuple[NightSession, EventSequence]],
+    out_dir: Path,
+) -> float:
+    config = PlaylogConfig(out_dir=out_dir)
+    start = time.perf_counter()
+    for session, events in archive:
+        render(session, events, config)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--tracks", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    archive = synthetic_archive(args.sessions, args.tracks)
+    renderers: dict[str, Render] = {
+        "legacy": baseline.load("playlog.writers").render_per_night,
+        "combined": render_per_night,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        # 交互に数回走らせて最小値を取る（ディスクキャッシュの影響をならす）
+        best = {name: float("inf") for name in renderers}
+        for _ in range(args.rounds):
+            for name, render in renderers.items():
+                best[name] = min(best[name], _measure(render, archive, root / name))
+        for name, elapsed in best.items():
+            print(f"{name:>8}: {len(archive) / elapsed:,.1f} sessions/sec")
+        print(f" speedup: {best['legacy'] / best['combined']:.1f}x")
+
+        legacy = sorted(
+            path.relative_to(root / "legacy") for path in (root / "legacy").rglob("session.*")
+        )
+        combined = sorted(
+            path.relative_to(root / "combined") for path in (root / "combined").rglob("session.*")
+        )
+        if legacy != combined or any(
+            (root / "legacy" / path).read_bytes() != (root / "combined" / path).read_bytes()
+            for path in legacy
+        ):
+            raise SystemExit("combined renderer output differs from the legacy writers")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark ``playlog scan`` discovery against a full extraction.
+
+Builds a synthetic Serato History folder and times ``serato.scan`` with an
+empty parse cache (name dates + ``otrk`` header counts), the full
+``serato.extract`` (which fills the cache) and ``serato.scan`` again, now
+answered from the cache summaries.
+
+    python scripts/bench_scan.py --crates 2000 --tracks 100
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bench_serato_crate import build_history
+from playlog import PlaylogConfig
+from playlog.extractors import serato
+
+
+def _measure(name: str, run: Callable[[], str], crates: int) -> None:
+    start = time.perf_counter()
+    summary = run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>11}: {elapsed:.3f}s ({elapsed / crates * 1e6:,.0f} us/crate) {summary}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crates", type=int, default=2000)
+    parser.add_argument("--tracks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "_Serato_"
+        build_history(root, args.crates, args.tracks)
+        config = PlaylogConfig(out_dir=Path(tmp) / "out", timezone="UTC")
+
+        def scan() -> str:
+            details = serato.scan(config, root=root, mode="crate").details()
+            return f"{details['nights']} nights, {details['tracks']} tracks"
+
+        def extract() -> str:
+            sessions = serato.extract(config, root=root, mode="crate")
+            nights = {session.night_date for session, _ in sessions}
+            return f"{len(nights)} nights, {sum(len(events) for _, events in sessions)} tracks"
+
+        _measure("scan", scan, args.crates)
+        _measure("extract", extract, args.crates)
+        _measure("scan cached", scan, args.crates)
+
+
+if __name__ == "__main__":
+    main()
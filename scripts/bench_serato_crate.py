@@ -0,0 +1,101 @@
+"""Benchmark Serato crate parsing on large synthetic History folders.
+
+Compares the previous slice-based TLV walk with the zero-copy ``ChunkReader``
+path used by ``playlog.extractors.serato`` and reports tracks/sec plus the
+peak bytes allocated per crate as traced by ``tracemalloc``.
+
+    python scripts/bench_serato_crate.py --crates 50 --tracks 500
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import baseline
+from playlog.extractors import serato
+
+TZ = ZoneInfo("UTC")
+TEXT_TAGS = {
+    tag for tag, codec in serato.TAG_CODECS.items() if codec == serato.CODEC_UTF16_BE
+}
+
+
+def _chunk(tag: str, payload: bytes) -> bytes:
+    return tag.encode("ascii") + len(payload).to_bytes(4, "big") + payload
+
+
+def synthetic_track(index: int, encoding: str = "utf-16-be") -> bytes:
+    fields = [
+        ("ttxt", f"Track Title {index}" + (" (夜明け Mix)" if index % 5 == 0 else "")),
+        ("aART", f"Artist {index % 97}" + (" & Beyoncé" if index % 3 == 0 else "")),
+        ("albm", f"Album {index % 31}"),
+        ("bpmf", f"{118 + index % 12}.0"),
+        ("dura", str(180 + index % 240)),
+        ("deck", "A" if index % 2 else "B"),
+        ("path", f"/Volumes/Music/library/track_{index:06d}.aiff"),
+        ("pidx", f"track-{index}"),
+        ("pdat", f"2025-05-02T01:{index % 60:02d}:00+00:00"),
+    ]
+    return _chunk(
+        "otrk",
+        b"".join(
+            _chunk(tag, value.encode(encoding if tag in TEXT_TAGS else "ascii"))
+            for tag, value in fields
+        ),
+    )
+
+
+def build_history(root: Path, crates: int, tracks: int) -> list[Path]:
+    history = root / "History"
+    history.mkdir(parents=True)
+    paths: list[Path] = []
+    for crate_index in range(crates):
+        body = _chunk("vrsn", "1.0/Serato ScratchLive Crate".encode("utf-16-be"))
+        body += b"".join(synthetic_track(crate_index * tracks + i) for i in range(tracks))
+        path = history / f"History-2025-05-{crate_index % 28 + 1:02d}-{crate_index}.crate"
+        path.write_bytes(body)
+        paths.append(path)
+    return paths
+
+
+def _measure(
+    name: str,
+    parse: Callable[[Path, ZoneInfo], list[serato.TrackPayload]],
+    paths: list[Path],
+) -> None:
+    start = time.perf_counter()
+    total = sum(len(parse(path, TZ)) for path in paths)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(max(paths, key=lambda path: path.stat().st_size), TZ)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:>8}: {total} tracks in {elapsed:.3f}s "
+        f"({total / elapsed:,.0f} tracks/sec), "
+        f"peak allocations per crate={peak / 1024:,.0f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crates", type=int, default=50)
+    parser.add_argument("--tracks", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = build_history(Path(tmp), args.crates, args.tracks)
+        legacy = baseline.load("playlog.extractors.serato")
+        _measure("legacy", legacy._parse_crate, paths)
+        _measure("current", serato._parse_crate, paths)
+
+
+if __name__ == "__main__":
+    main()
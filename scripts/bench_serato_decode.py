@@ -0,0 +1,76 @@
+"""Micro-benchmark Serato TLV text decoding on realistic crate payloads.
+
+The legacy path probes utf-8/utf-16/latin-1 with exceptions and decodes every
+field twice (``raw`` plus the typed fields); the current path picks the codec
+once per crate (``_crate_codec``) and decodes each field once.
+Timestamp parsing is excluded so only text decoding is measured.
+
+    python scripts/bench_serato_decode.py --tracks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+import baseline
+from bench_serato_crate import synthetic_track
+from playlog.extractors import serato
+from playlog.tlv import ChunkReader
+
+TYPED_TEXT_TAGS = ("ttxt", "aART", "albm", "deck", "key", "path", "pidx", "bpmf", "dura")
+
+Track = dict[str, bytes]
+
+
+def _load_tracks(count: int, encoding: str) -> tuple[str, list[Track]]:
+    data = b"".join(synthetic_track(index, encoding) for index in range(count))
+    reader = ChunkReader(data)
+    tracks = [
+        {tag: payload.tobytes() for tag, payload in reader.children(start, end).fields().items()}
+        for _, start, end in reader.iter_chunks()
+    ]
+    return serato._crate_codec(reader), tracks
+
+
+def legacy_decode(tracks: list[Track], text_codec: str) -> None:
+    decode = baseline.load("playlog.extractors.serato")._decode_text
+    for fields in tracks:
+        {tag: decode(payload) for tag, payload in fields.items()}
+        for tag in TYPED_TEXT_TAGS:
+            decode(fields.get(tag))
+
+
+def current_decode(tracks: list[Track], text_codec: str) -> None:
+    decode = serato._decode_text
+    codecs = serato.CRATE_TAG_CODECS[text_codec]
+    for fields in tracks:
+        {tag: decode(payload, codecs.get(tag, text_codec)) for tag, payload in fields.items()}
+
+
+def _best(
+    decode: Callable[[list[Track], str], None],
+    tracks: list[Track],
+    text_codec: str,
+) -> float:
+    return min(timeit.repeat(lambda: decode(tracks, text_codec), number=1, repeat=15))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=20000)
+    args = parser.parse_args()
+
+    for encoding in ("utf-16-be", "utf-8"):
+        text_codec, tracks = _load_tracks(args.tracks, encoding)
+        legacy = _best(legacy_decode, tracks, text_codec)
+        current = _best(current_decode, tracks, text_codec)
+        print(
+            f"{encoding:>9}: legacy {args.tracks / legacy:,.0f} tracks/sec, "
+            f"current {args.tracks / current:,.0f} tracks/sec "
+            f"({legacy / current:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
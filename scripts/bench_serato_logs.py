@@ -0,0 +1,116 @@
+"""Benchmark Serato log ingestion on a generated multi-gigabyte log.
+
+Compares the previous ``read_text().splitlines()`` + per-line regex parser with
+the mmap-backed prefilter scanner in ``playlog.extractors.serato``. Each parser
+runs in its own subprocess so peak RSS is reported separately.
+
+    python scripts/bench_serato_logs.py --size-mb 2048
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+NOISE_LINES = [
+    "INFO  [audio] buffer size 512 samples, latency 11.6ms\n",
+    "DEBUG [library] rescanning crate Loft Classics\n",
+    "INFO  [controller] jog wheel calibrated\n",
+    "WARN  [audio] dropout detected on output 1/2\n",
+]
+PLAYS_EVERY = 20
+
+
+def generate_log(path: Path, size_mb: int) -> int:
+    """Write ``size_mb`` MiB of mixed noise/play lines and return the line count."""
+
+    target = size_mb * 1024 * 1024
+    block: list[str] = ["Session Start @ 2025-05-03 22:00:00\n"]
+    seconds = 22 * 3600
+    for index in range(2000):
+        if index % PLAYS_EVERY == 0:
+            seconds = (seconds + 185) % 86400
+            stamp = f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+            block.append(f"{stamp}  Deck {index % 2 + 1}  Artist {index} - Track {index}\n")
+        else:
+            block.append(NOISE_LINES[index % len(NOISE_LINES)])
+    chunk = "".join(block[1:]).encode("utf-8")
+    lines_per_chunk = len(block) - 1
+
+    written = 0
+    lines = 1
+    with path.open("wb") as fp:
+        fp.write(block[0].encode("utf-8"))
+        while written < target:
+            fp.write(chunk)
+            written += len(chunk)
+            lines += lines_per_chunk
+    return lines
+
+
+def _run(kind: str, log_path: Path, lines: int) -> None:
+    import resource
+    from zoneinfo import ZoneInfo
+
+    from playlog import PlaylogConfig
+
+    tz = ZoneInfo("UTC")
+    config = PlaylogConfig(out_dir=log_path.parent, log_checkpoints=False)
+    if kind == "legacy":
+        import baseline
+
+        parse_log = baseline.load("playlog.extractors.serato")._parse_log
+    else:
+        from playlog.extractors import serato
+
+        parse_log = serato._parse_log
+    start = time.perf_counter()
+    result = parse_log(log_path, config, tz)
+    events = len(result[1]) if result else 0
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{kind:>8}: {lines / elapsed:,.0f} lines/sec, {events} events, "
+        f"{elapsed:.1f}s, peak RSS {peak_mb:,.0f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--run", choices=["legacy", "current"])
+    parser.add_argument("--log", type=Path)
+    parser.add_argument("--lines", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.run:
+        _run(args.run, args.log, args.lines)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "2025-05-03@Bench.log"
+        lines = generate_log(log_path, args.size_mb)
+        print(f"generated {log_path.stat().st_size / 2**20:,.0f} MiB, {lines:,} lines")
+        kinds = ["current"] if args.skip_legacy else ["legacy", "current"]
+        for kind in kinds:
+            subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    __file__,
+                    "--run",
+                    kind,
+                    "--log",
+                    str(log_path),
+                    "--lines",
+                    str(lines),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
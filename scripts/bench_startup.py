@@ -0,0 +1,90 @@
+"""Benchmark CLI cold start and fail when it regresses past a threshold.
+
+Runs each command in a fresh interpreter, reports the median wall time next
+to a bare ``python -c pass`` and the cumulative ``-X importtime`` of the
+heaviest top-level imports, and exits non-zero when a command exceeds
+``--max-ms`` or imports one of the modules that must stay lazy.
+
+    python scripts/bench_startup.py --runs 9 --max-ms 200
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "version": ["-m", "playlog_cli", "version"],
+    "help": ["-m", "playlog_cli", "--help"],
+}
+# version / help で読み込まれてはいけないモジュール
+LAZY_MODULES = ("pydantic", "playlog.models", "playlog.extractors.", "playlog.writers")
+
+
+def _wall_ms(args: list[str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, capture_output=True)  # noqa: S603
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _imports(args: list[str]) -> list[tuple[int, str]]:
+    """Cumulative microseconds per imported module, from ``-X importtime``."""
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((int(cumulative), name.rstrip()))
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--max-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    failures = []
+    for name, command in COMMANDS.items():
+        wall = _wall_ms(command, args.runs)
+        print(f"{name:>8}: {wall:6.1f} ms")
+        if name == "python":
+            continue
+        modules = _imports(command)
+        top = sorted(
+            (entry for entry in modules if not entry[1].startswith("  ")),
+            reverse=True,
+        )[:3]
+        for cumulative, module in top:
+            print(f"{'':>10}{cumulative / 1000:6.1f} ms  {module.strip()}")
+        eager = sorted(
+            {
+                module.strip()
+                for _, module in modules
+                if module.strip().startswith(LAZY_MODULES)
+            }
+        )
+        if eager:
+            failures.append(f"{name} imports {', '.join(eager)}")
+        if wall > args.max_ms:
+            failures.append(f"{name} took {wall:.1f} ms (> {args.max_ms:.0f} ms)")
+
+    if failures:
+        raise SystemExit("startup regression: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
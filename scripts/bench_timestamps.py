@@ -0,0 +1,67 @@
+"""Benchmark timestamp parsing on a million values per source layout.
+
+Compares the previous per-value ``strptime`` loop (as used by the Serato and
+djay extractors) with ``playlog.TimestampParser``.
+
+    python scripts/bench_timestamps.py --count 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+from functools import partial
+from zoneinfo import ZoneInfo
+
+from playlog import TimestampParser
+from playlog.extractors import djay, serato
+
+TZ = ZoneInfo("Asia/Tokyo")
+SOURCES: dict[str, tuple[str, Sequence[str]]] = {
+    "crate iso+offset": ("%Y-%m-%dT%H:%M:%S+09:00", serato.CRATE_DATETIME_FORMATS),
+    "crate dashed": ("%Y-%m-%d %H:%M:%S", serato.CRATE_DATETIME_FORMATS),
+    "crate slashed": ("%Y/%m/%d %H:%M:%S", serato.CRATE_DATETIME_FORMATS),
+    "djay slashed": ("%Y/%m/%d %H:%M", djay.DATETIME_FORMATS),
+}
+
+
+def legacy_parse(text: str, formats: Sequence[str]) -> datetime | None:
+    for fmt in formats:
+        try:
+            parsed = datetime.strptime(text, fmt)
+            if parsed.tzinfo is None:
+                return parsed.replace(tzinfo=TZ)
+            return parsed
+        except ValueError:
+            continue
+    return None
+
+
+def _measure(parse: Callable[[str], datetime | None], values: list[str]) -> float:
+    start = time.perf_counter()
+    for value in values:
+        parse(value)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    base = datetime(2025, 5, 2, 22, 0)
+    for name, (layout, formats) in SOURCES.items():
+        values = [
+            (base + timedelta(seconds=37 * index)).strftime(layout) for index in range(args.count)
+        ]
+        legacy = _measure(partial(legacy_parse, formats=formats), values)
+        current = _measure(partial(TimestampParser(formats).parse, tz=TZ), values)
+        print(
+            f"{name:>17}: legacy {args.count / legacy:,.0f}/s, "
+            f"current {args.count / current:,.0f}/s ({legacy / current:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()